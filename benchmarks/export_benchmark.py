@@ -0,0 +1,109 @@
+"""
+Benchmark Excel export time and peak memory.
+
+Builds a synthetic sheet (half numeric, half categorical columns), analyzes
+it grouped by a group column and exports the results, e.g.:
+
+    python benchmarks/export_benchmark.py --columns 300 --groups 5
+    python benchmarks/export_benchmark.py --columns 300 --groups 5 --write-only
+    python benchmarks/export_benchmark.py --columns 300 --groups 5 --workers 8
+
+Peak memory is measured with tracemalloc in a second, separate export run,
+so the reported time is not slowed down by tracing.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from analyzer import ExcelAnalyzer
+from column_stats import DEFAULT_HISTOGRAM_BINS
+from excel_exporter import ExcelExporter
+
+
+def make_data(rows: int, columns: int, groups: int, distinct: int, seed: int = 0) -> pd.DataFrame:
+    """Synthetic sheet with a group column and alternating numeric/text columns."""
+    rng = np.random.default_rng(seed)
+    data = {'Group': rng.choice([f"G{i}" for i in range(groups)], rows)}
+    labels = np.array([f"label_{i}" for i in range(distinct)], dtype=object)
+    for i in range(columns):
+        if i % 2 == 0:
+            data[f"num_{i}"] = rng.integers(0, distinct, rows)
+        else:
+            data[f"text_{i}"] = labels[rng.integers(0, distinct, rows)]
+    return pd.DataFrame(data)
+
+
+def export(results, group_column, output_path, write_only, workers=1):
+    """Export the results the way the GUI does."""
+    kwargs = {'write_only': True} if write_only else {}
+    exporter = ExcelExporter(results, group_column, **kwargs)
+    if group_column:
+        exporter.export_grouped(output_path, workers=workers)
+    else:
+        exporter.export_ungrouped(output_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Excel export time and peak memory.")
+    parser.add_argument('--rows', type=int, default=20000, help="rows in the synthetic sheet")
+    parser.add_argument('--columns', type=int, default=300, help="analyzed columns")
+    parser.add_argument('--groups', type=int, default=5, help="groups (0 for an ungrouped export)")
+    parser.add_argument('--distinct', type=int, default=40, help="distinct values per column")
+    parser.add_argument('--write-only', action='store_true', help="use the streaming write-only exporter")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="worker processes for grouped exports (0 for one per CPU)")
+    parser.add_argument('--no-memory', action='store_true', help="skip the traced peak-memory run")
+    args = parser.parse_args()
+
+    df = make_data(args.rows, args.columns, max(args.groups, 1), args.distinct)
+    analyzer = ExcelAnalyzer.__new__(ExcelAnalyzer)
+    analyzer.quantile_error = None
+    analyzer.histogram_bins = DEFAULT_HISTOGRAM_BINS
+    analyzer.streaming = False
+    analyzer.df = df
+
+    group_column = 'Group' if args.groups else None
+    if group_column:
+        results = analyzer.analyze_by_group(group_column)
+        sheets = sum(len(group['columns']) for group in results.values())
+    else:
+        results = analyzer.analyze_all_columns()
+        sheets = len(results)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_path = os.path.join(temp_dir, 'benchmark.xlsx')
+
+        start = time.perf_counter()
+        workers = args.workers or None
+        export(results, group_column, output_path, args.write_only, workers)
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(output_path)
+
+        peak = None
+        if not args.no_memory:
+            tracemalloc.start()
+            export(results, group_column, output_path, args.write_only, workers)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    mode = "write-only" if args.write_only else "standard"
+    if group_column and args.workers != 1:
+        mode += f", {args.workers or 'one per CPU'} workers"
+    print(f"Export ({mode}): {sheets} column sheets, {args.rows} rows, {args.distinct} distinct values")
+    print(f"  Time:        {elapsed:.2f} s")
+    print(f"  File size:   {size / 1024 / 1024:.1f} MB")
+    if peak is not None:
+        print(f"  Peak memory: {peak / 1024 / 1024:.1f} MB (tracemalloc)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark GUI startup: import time of the modules on the startup path
+(from -X importtime) and the time until the first window is painted, e.g.:
+
+    python benchmarks/startup_benchmark.py
+    python benchmarks/startup_benchmark.py --exe dist/DataLens.exe --runs 10
+    python benchmarks/startup_benchmark.py --label 1.1.0 --history benchmarks/startup_history.jsonl
+
+Time to first window starts the app with DATALENS_STARTUP_PROBE set, which
+makes it write a marker file once the window is painted and exit. It needs
+a display; without one only the import times are reported. --history
+appends one JSON line per run, so startup can be tracked across releases.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# Modules reported from the import-time breakdown
+REPORTED_MODULES = ('main', 'tkinter', 'analyzer', 'excel_exporter', 'sheet_cache',
+                    'pandas', 'numpy', 'openpyxl')
+
+PROBE_ENV = 'DATALENS_STARTUP_PROBE'
+WINDOW_TIMEOUT = 120
+
+
+def import_times(statement: str) -> dict:
+    """Cumulative import time in ms of every top-level import made by statement."""
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                               cwd=SRC_DIR, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nested imports are only indented; a module is imported once
+        times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+def time_to_window(command: list) -> float:
+    """Seconds from starting command until the app reports its first painted window."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        probe_path = os.path.join(temp_dir, 'window')
+        env = dict(os.environ, **{PROBE_ENV: probe_path})
+        start = time.perf_counter()
+        process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        while not os.path.exists(probe_path):
+            if process.poll() is not None and not os.path.exists(probe_path):
+                error = process.stderr.read().decode(errors='replace').strip().splitlines()
+                raise RuntimeError(error[-1] if error else f"exited with code {process.returncode}")
+            if time.perf_counter() - start > WINDOW_TIMEOUT:
+                process.kill()
+                raise RuntimeError("no window within the timeout")
+            time.sleep(0.005)
+        elapsed = time.perf_counter() - start
+        process.wait()
+        process.stderr.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GUI import time and time to first window.")
+    parser.add_argument('--runs', type=int, default=5, help="app starts to time (the median is reported)")
+    parser.add_argument('--exe', help="time a packaged executable instead of src/main.py")
+    parser.add_argument('--label', default='dev', help="release or build label stored with the results")
+    parser.add_argument('--json', help="write the results as JSON to this path")
+    parser.add_argument('--history', help="append the results as one JSON line to this path")
+    args = parser.parse_args()
+
+    results = {
+        'label': args.label,
+        'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+    }
+
+    # What the window waits for, and what is warmed in the background afterwards
+    startup = import_times("import main")
+    deferred = import_times("import main; [__import__(m) for m in main.WARM_UP_MODULES]")
+    results['startup_imports_ms'] = {name: startup.get(name) for name in REPORTED_MODULES}
+    results['deferred_imports_ms'] = {
+        name: deferred.get(name) for name in REPORTED_MODULES if name not in startup
+    }
+
+    command = [args.exe] if args.exe else [sys.executable, os.path.join(SRC_DIR, 'main.py')]
+    try:
+        samples = [time_to_window(command) for _ in range(args.runs)]
+        results['first_window_s'] = {
+            'median': round(statistics.median(samples), 3),
+            'min': round(min(samples), 3),
+            'max': round(max(samples), 3),
+            'runs': len(samples),
+        }
+    except RuntimeError as e:
+        results['first_window_s'] = None
+        results['first_window_error'] = str(e)
+
+    print(f"Startup ({args.exe or 'src/main.py'}, {results['label']})")
+    print("  Imports before the window (cumulative ms):")
+    for name, ms in results['startup_imports_ms'].items():
+        if ms is not None:
+            print(f"    {name:<16} {ms:8.1f}")
+    print("  Imported in the background after the window (cumulative ms):")
+    for name, ms in results['deferred_imports_ms'].items():
+        if ms is not None:
+            print(f"    {name:<16} {ms:8.1f}")
+    window = results['first_window_s']
+    if window:
+        print(f"  First window:  {window['median']:.3f} s median ({window['min']:.3f}-{window['max']:.3f} s, "
+              f"{window['runs']} runs)")
+    else:
+        print(f"  First window:  not measured ({results['first_window_error']})")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.history:
+        with open(args.history, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(results) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""
+Benchmark suite: load, analysis and export of synthetic employee workbooks.
+
+Workbooks follow the schema of examples/create_test_data.py at the sizes of
+the named scenarios (or of --rows/--columns/...). Each stage is timed on its
+own and its peak resident memory recorded, e.g.:
+
+    python benchmarks/suite_benchmark.py --json before.json
+    python benchmarks/suite_benchmark.py --scenario wide --rows 20000 --repeat 5
+    python benchmarks/suite_benchmark.py --json after.json --compare before.json
+    python benchmarks/suite_benchmark.py --compare before.json after.json
+
+Stages: load (read the workbook), analyze_all_columns, analyze_by_group
+(by Department), export_ungrouped and export_grouped. Each repetition runs
+in a fresh process and the cached column profiles are dropped between the
+two analyses, so no stage reuses another one's work. On Linux the peak RSS
+is reset before every stage; elsewhere it is the process peak up to the end
+of the stage ('peak_rss_scope' in the results).
+
+Generated workbooks are kept in --data-dir and reused by later runs, since
+writing large workbooks takes longer than analyzing them. --compare prints
+the change of every stage against a baseline JSON and exits with code 1 when
+one is slower or larger than --threshold allows.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import get_context
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, '..', 'src'))
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, '..', 'examples'))
+
+from create_test_data import make_employee_data
+
+STAGES = ('load', 'analyze_all_columns', 'analyze_by_group', 'export_ungrouped', 'export_grouped')
+GROUP_COLUMN = 'Department'
+
+# Arguments of make_employee_data; None keeps the schema's own value
+SCENARIOS = {
+    'small': {'rows': 1000, 'columns': None, 'groups': 5, 'distinct': None, 'null_rate': 0.0},
+    'tall': {'rows': 100000, 'columns': None, 'groups': 5, 'distinct': None, 'null_rate': 0.0},
+    'wide': {'rows': 5000, 'columns': 200, 'groups': 5, 'distinct': None, 'null_rate': 0.0},
+    'many-groups': {'rows': 20000, 'columns': None, 'groups': 100, 'distinct': None, 'null_rate': 0.0},
+    'high-cardinality': {'rows': 50000, 'columns': 20, 'groups': 10, 'distinct': 20000, 'null_rate': 0.0},
+    'sparse': {'rows': 20000, 'columns': 20, 'groups': 5, 'distinct': None, 'null_rate': 0.3},
+}
+DEFAULT_SCENARIOS = ('small', 'tall', 'wide', 'many-groups')
+
+DEFAULT_THRESHOLD = 0.10
+# Stages faster than this are too noisy to flag as regressions
+MIN_COMPARED_SECONDS = 0.05
+
+
+def workbook_path(data_dir: str, params: dict, seed: int) -> str:
+    """Path of the generated workbook for params, creating it if needed."""
+    name = "employees_r{rows}_c{columns}_g{groups}_d{distinct}_n{null_rate}_s{seed}.xlsx".format(
+        seed=seed, **params)
+    path = os.path.join(data_dir, name)
+    if not os.path.exists(path):
+        os.makedirs(data_dir, exist_ok=True)
+        df = make_employee_data(seed=seed, **params)
+        # Write under a temporary name so an interrupted run leaves no partial file
+        partial = path + '.partial.xlsx'
+        df.to_excel(partial, index=False)
+        os.replace(partial, path)
+    return path
+
+
+def reset_peak_rss() -> bool:
+    """Reset the peak RSS of this process (Linux only); False when it cannot be reset."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss() -> int:
+    """Peak resident set size of this process in bytes."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                        ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                        ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                        ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(),
+                                                 ctypes.byref(counters), counters.cb)
+        return counters.PeakWorkingSetSize
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes, except on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def run_stages(path: str, stages: tuple) -> dict:
+    """Run the stages once on the workbook at path; seconds and peak RSS of each."""
+    from analyzer import ExcelAnalyzer
+    from excel_exporter import ExcelExporter
+
+    measured = {}
+
+    def measure(stage, func):
+        gc.collect()
+        scoped = reset_peak_rss()
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        if stage in stages:
+            measured[stage] = {'seconds': elapsed, 'peak_rss': peak_rss(),
+                               'peak_rss_scope': 'stage' if scoped else 'process'}
+        return result
+
+    analyzer = measure('load', lambda: ExcelAnalyzer(path))
+
+    ungrouped = grouped = None
+    if 'analyze_all_columns' in stages or 'export_ungrouped' in stages:
+        ungrouped = measure('analyze_all_columns', analyzer.analyze_all_columns)
+        analyzer.df = analyzer.df  # drop the cached column profiles
+    if 'analyze_by_group' in stages or 'export_grouped' in stages:
+        grouped = measure('analyze_by_group', lambda: analyzer.analyze_by_group(GROUP_COLUMN))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_path = os.path.join(temp_dir, 'export.xlsx')
+        if 'export_ungrouped' in stages:
+            measure('export_ungrouped', lambda: ExcelExporter(ungrouped).export_ungrouped(output_path))
+            measured['export_ungrouped']['output_bytes'] = os.path.getsize(output_path)
+        if 'export_grouped' in stages:
+            measure('export_grouped',
+                    lambda: ExcelExporter(grouped, GROUP_COLUMN).export_grouped(output_path))
+            measured['export_grouped']['output_bytes'] = os.path.getsize(output_path)
+
+    return measured
+
+
+def run_scenario(path: str, stages: tuple, repeat: int) -> dict:
+    """Median, min and max seconds and the highest peak RSS of each stage over repeat fresh processes."""
+    runs = []
+    for _ in range(repeat):
+        # A fresh process per run: nothing is warm and the peak RSS starts low
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+            runs.append(pool.submit(run_stages, path, stages).result())
+
+    results = {}
+    for stage in STAGES:
+        if stage not in stages:
+            continue
+        seconds = [run[stage]['seconds'] for run in runs]
+        results[stage] = {
+            'median_s': round(statistics.median(seconds), 4),
+            'min_s': round(min(seconds), 4),
+            'max_s': round(max(seconds), 4),
+            'peak_rss_mb': round(max(run[stage]['peak_rss'] for run in runs) / 1024 / 1024, 1),
+            'peak_rss_scope': runs[0][stage]['peak_rss_scope'],
+        }
+        if 'output_bytes' in runs[0][stage]:
+            results[stage]['output_mb'] = round(runs[0][stage]['output_bytes'] / 1024 / 1024, 2)
+    return results
+
+
+def git_commit() -> str:
+    """Commit of the checked-out tree, or None outside a git checkout."""
+    try:
+        completed = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCHMARKS_DIR,
+                                   capture_output=True, text=True)
+    except OSError:
+        return None
+    return completed.stdout.strip() or None
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    """Print the change of every stage found in both results; the regressed (scenario, stage) pairs."""
+    regressions = []
+    print(f"Compared with {baseline.get('label')} ({baseline.get('commit') or 'unknown commit'})")
+    for name, scenario in current['scenarios'].items():
+        old_scenario = baseline['scenarios'].get(name)
+        if old_scenario is None:
+            continue
+        if old_scenario['params'] != scenario['params']:
+            print(f"  {name}: skipped, the scenario sizes differ")
+            continue
+        print(f"  {name}")
+        for stage, new in scenario['stages'].items():
+            old = old_scenario['stages'].get(stage)
+            if old is None:
+                continue
+            time_change = new['median_s'] / old['median_s'] - 1 if old['median_s'] else 0.0
+            rss_change = new['peak_rss_mb'] / old['peak_rss_mb'] - 1 if old['peak_rss_mb'] else 0.0
+            slower = (time_change > threshold
+                      and new['median_s'] - old['median_s'] > MIN_COMPARED_SECONDS)
+            larger = rss_change > threshold
+            flag = "  REGRESSION" if slower or larger else ""
+            print(f"    {stage:<20} {old['median_s']:8.3f} -> {new['median_s']:8.3f} s ({time_change:+6.1%})"
+                  f"  {old['peak_rss_mb']:7.1f} -> {new['peak_rss_mb']:7.1f} MB ({rss_change:+6.1%}){flag}")
+            if flag:
+                regressions.append((name, stage))
+    return regressions
+
+
+def load_json(path: str) -> dict:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark load, analysis and export of synthetic workbooks.")
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help=f"scenario to run, repeatable (default: {', '.join(DEFAULT_SCENARIOS)})")
+    parser.add_argument('--rows', type=int, help="override the scenario's rows")
+    parser.add_argument('--columns', type=int, help="override the scenario's total columns")
+    parser.add_argument('--groups', type=int, help="override the scenario's Department count")
+    parser.add_argument('--distinct', type=int, help="override the scenario's distinct values per column")
+    parser.add_argument('--null-rate', type=float, help="override the scenario's fraction of empty cells")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES), help="stages to time")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per scenario (the median time is reported)")
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'datalens-benchmark'),
+                        help="where generated workbooks are kept between runs")
+    parser.add_argument('--label', default='dev', help="version label stored with the results")
+    parser.add_argument('--json', help="write the results as JSON to this path")
+    parser.add_argument('--compare', nargs='+', metavar='JSON',
+                        help="baseline results to compare this run with, or two result files to compare "
+                             "without running")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown or memory growth reported as a regression (default: 0.10)")
+    args = parser.parse_args()
+
+    if args.compare and len(args.compare) > 2:
+        parser.error("--compare takes one baseline, or a baseline and a second result file")
+    if args.compare and len(args.compare) == 2:
+        regressions = compare(load_json(args.compare[0]), load_json(args.compare[1]), args.threshold)
+        sys.exit(1 if regressions else 0)
+    baseline = load_json(args.compare[0]) if args.compare else None
+
+    import numpy
+    import openpyxl
+    import pandas
+
+    overrides = {key: value for key, value in (('rows', args.rows), ('columns', args.columns),
+                                               ('groups', args.groups), ('distinct', args.distinct),
+                                               ('null_rate', args.null_rate)) if value is not None}
+    results = {
+        'label': args.label,
+        'commit': git_commit(),
+        'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'versions': {'pandas': pandas.__version__, 'numpy': numpy.__version__,
+                     'openpyxl': openpyxl.__version__},
+        'repeat': args.repeat,
+        'seed': args.seed,
+        'scenarios': {},
+    }
+    stages = tuple(stage for stage in STAGES if stage in args.stages)
+
+    for name in args.scenario or DEFAULT_SCENARIOS:
+        params = dict(SCENARIOS[name], **overrides)
+        path = workbook_path(args.data_dir, params, args.seed)
+        print(f"{name}: {params['rows']} rows, {params['columns'] or 11} columns, {params['groups']} groups, "
+              f"{params['distinct'] or 'schema'} distinct values, {params['null_rate']:.0%} empty")
+        timings = run_scenario(path, stages, args.repeat)
+        results['scenarios'][name] = {
+            'params': params,
+            'workbook_mb': round(os.path.getsize(path) / 1024 / 1024, 2),
+            'stages': timings,
+        }
+        for stage, timing in timings.items():
+            print(f"  {stage:<20} {timing['median_s']:8.3f} s  ({timing['min_s']:.3f}-{timing['max_s']:.3f})"
+                  f"  peak RSS {timing['peak_rss_mb']:7.1f} MB")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if baseline is not None:
+        regressions = compare(baseline, results, args.threshold)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,14 @@ a = Analysis(
     binaries=[],
     datas=[],
     hiddenimports=[
+        # Imported lazily by main.py once the window is up
+        'analyzer',
+        'excel_exporter',
+        'sheet_cache',
+        'profiling',
+        'table_files',
+        'column_types',
+        'column_picker',
         'pandas',
         'openpyxl',
         'numpy',
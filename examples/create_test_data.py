@@ -1,47 +1,122 @@
+import argparse
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-
-# Set random seed for reproducibility
-np.random.seed(42)
-
-# Generate sample data
-n_rows = 100
-
-# Create dummy data
-data = {
-    'Department': np.random.choice(['Sales', 'Marketing', 'Engineering', 'HR', 'Finance'], n_rows),
-    'Employee_Name': [f'Employee_{i}' for i in range(1, n_rows + 1)],
-    'Age': np.random.randint(22, 65, n_rows),
-    'Salary': np.random.randint(30000, 150000, n_rows),
-    'Years_Experience': np.random.randint(0, 25, n_rows),
-    'Performance_Score': np.random.choice([1, 2, 3, 4, 5], n_rows, p=[0.05, 0.15, 0.40, 0.30, 0.10]),
-    'Location': np.random.choice(['New York', 'San Francisco', 'Chicago', 'Austin', 'Seattle'], n_rows),
-    'Education': np.random.choice(['High School', 'Bachelor', 'Master', 'PhD'], n_rows, p=[0.10, 0.50, 0.30, 0.10]),
-    'Bonus': np.random.randint(0, 20000, n_rows),
-    'Projects_Completed': np.random.randint(0, 30, n_rows),
-}
-
-# Create DataFrame
-df = pd.DataFrame(data)
-
-# Add some calculated fields
-df['Total_Compensation'] = df['Salary'] + df['Bonus']
-
-# Save to Excel
-output_file = 'test_employee_data.xlsx'
-df.to_excel(output_file, index=False)
-
-print(f"Test Excel file created successfully: {output_file}")
-print(f"\nFile contains {len(df)} rows and {len(df.columns)} columns")
-print(f"\nColumns:")
-for col in df.columns:
-    print(f"  - {col}")
-
-print("\n\nSample data (first 5 rows):")
-print(df.head())
-
-print("\n\nColumn types:")
-print(df.dtypes)
-
-print("\n\nSuggested grouping columns: Department, Location, Education, Performance_Score")
+
+# Employee schema of the sample workbook. Every generated sheet follows it;
+# the size options only scale it up (the defaults give the sample file).
+DEPARTMENTS = ['Sales', 'Marketing', 'Engineering', 'HR', 'Finance']
+LOCATIONS = ['New York', 'San Francisco', 'Chicago', 'Austin', 'Seattle']
+EDUCATION = ['High School', 'Bachelor', 'Master', 'PhD']
+EDUCATION_P = [0.10, 0.50, 0.30, 0.10]
+PERFORMANCE_P = [0.05, 0.15, 0.40, 0.30, 0.10]
+
+# Columns repeated (with a numeric suffix) when more columns are asked for
+REPEATED_COLUMNS = ['Age', 'Salary', 'Years_Experience', 'Performance_Score',
+                    'Location', 'Education', 'Bonus', 'Projects_Completed']
+
+
+def make_employee_data(rows: int = 100, columns: int = None, groups: int = len(DEPARTMENTS),
+                       distinct: int = None, null_rate: float = 0.0, seed: int = 42) -> pd.DataFrame:
+    """
+    Synthetic employee sheet.
+
+    rows: number of rows
+    columns: total number of columns (default: the 11 schema columns);
+        extra ones repeat the schema's value columns as Age_2, Salary_2, ...
+    groups: distinct Department values (the natural group-by column)
+    distinct: distinct values per value column (default: the schema's own
+        ranges and labels)
+    null_rate: fraction of cells left empty in every column but Department
+    seed: random seed; the same arguments always give the same sheet
+    """
+    rng = np.random.RandomState(seed)
+
+    departments = _labels(DEPARTMENTS, groups, 'Department')
+    locations = _labels(LOCATIONS, distinct or len(LOCATIONS), 'City')
+    education = _labels(EDUCATION, distinct or len(EDUCATION), 'Education')
+    education_p = EDUCATION_P if distinct is None else None
+    performance = [1, 2, 3, 4, 5] if distinct is None else list(range(1, distinct + 1))
+    performance_p = PERFORMANCE_P if distinct is None else None
+
+    def integers(low, high):
+        # distinct caps how many values a numeric column can take
+        return rng.randint(low, high if distinct is None else low + distinct, rows)
+
+    generators = {
+        'Age': lambda: integers(22, 65),
+        'Salary': lambda: integers(30000, 150000),
+        'Years_Experience': lambda: integers(0, 25),
+        'Performance_Score': lambda: rng.choice(performance, rows, p=performance_p),
+        'Location': lambda: rng.choice(locations, rows),
+        'Education': lambda: rng.choice(education, rows, p=education_p),
+        'Bonus': lambda: integers(0, 20000),
+        'Projects_Completed': lambda: integers(0, 30),
+    }
+
+    # Same draws, in the same order, as the original sample file
+    data = {
+        'Department': rng.choice(departments, rows),
+        'Employee_Name': [f'Employee_{i}' for i in range(1, rows + 1)],
+    }
+    for name in REPEATED_COLUMNS:
+        data[name] = generators[name]()
+    df = pd.DataFrame(data)
+
+    # Add some calculated fields
+    df['Total_Compensation'] = df['Salary'] + df['Bonus']
+
+    if columns is not None:
+        extra = []
+        for i in range(max(columns - len(df.columns), 0)):
+            name = REPEATED_COLUMNS[i % len(REPEATED_COLUMNS)]
+            extra.append(pd.Series(generators[name](), name=f"{name}_{i // len(REPEATED_COLUMNS) + 2}"))
+        df = pd.concat([df] + extra, axis=1).iloc[:, :max(columns, 1)]
+
+    if null_rate > 0:
+        for column in df.columns[1:]:
+            mask = rng.random_sample(rows) < null_rate
+            if mask.any():
+                df[column] = df[column].where(~mask)
+
+    return df
+
+
+def _labels(base: list, count: int, prefix: str) -> list:
+    """The first count labels of base, extended with numbered ones if needed."""
+    return base[:count] + [f"{prefix}_{i}" for i in range(len(base) + 1, count + 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create a synthetic employee workbook.")
+    parser.add_argument('--rows', type=int, default=100)
+    parser.add_argument('--columns', type=int, help="total columns (default: the 11 schema columns)")
+    parser.add_argument('--groups', type=int, default=len(DEPARTMENTS), help="distinct Department values")
+    parser.add_argument('--distinct', type=int, help="distinct values per value column")
+    parser.add_argument('--null-rate', type=float, default=0.0, help="fraction of empty cells")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='test_employee_data.xlsx')
+    args = parser.parse_args()
+
+    df = make_employee_data(args.rows, args.columns, args.groups, args.distinct, args.null_rate, args.seed)
+
+    # Save to Excel
+    output_file = args.output
+    df.to_excel(output_file, index=False)
+
+    print(f"Test Excel file created successfully: {output_file}")
+    print(f"\nFile contains {len(df)} rows and {len(df.columns)} columns")
+    print("\nColumns:")
+    for col in df.columns:
+        print(f"  - {col}")
+
+    print("\n\nSample data (first 5 rows):")
+    print(df.head())
+
+    print("\n\nColumn types:")
+    print(df.dtypes)
+
+    print("\n\nSuggested grouping columns: Department, Location, Education, Performance_Score")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,162 +1,789 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import cached_property
+from multiprocessing import shared_memory
+from typing import Dict, List, Any, Callable, Tuple
+from column_stats import (summarize_quantitative, summarize_qualitative, summarize_label_codes,
+                          encode_labels, first_occurrences, grouped_linear_quantile,
+                          histogram_bin_counts, grouped_histograms, HISTOGRAM_STRATEGIES,
+                          DEFAULT_HISTOGRAM_BINS)
+from column_types import apply_column_types, select_columns, DEFAULT_CATEGORY_RATIO
+from frequency_table import FrequencyTable
+from profiling import Profiler, profiled, stage, timed, is_active, merge_records
+from sheet_cache import SheetCache
+from streaming import StreamingAnalysis, iter_excel_chunks, read_excel_header
+from table_files import TableFile, table_format, read_table_header, iter_table_chunks
+
+
+# Called as progress(done, total, column, result) after every analyzed
+# column. result is the column's {'type', 'data'} entry (None if it had no
+# data) or, for grouped analysis, a {group_name: entry} dict.
+ProgressCallback = Callable[[int, int, str, Any], None]
+
+# Grouped label counts use a dense (group, label) table of counts while it
+# has at most this many cells per row; sparser combinations are sorted
+DENSE_COUNT_CELLS_PER_ROW = 4
+
+
+class AnalysisCancelled(Exception):
+    """Raised when an analysis is stopped through its cancel_event."""
+
+
+class ColumnProfile:
+    """
+    Per-column facts shared by every analysis entry point.
+    The dtype classification is taken when the sheet loads; the coerced
+    values, masks and grand total are computed on first use and then reused.
+    """
+
+    def __init__(self, series: pd.Series):
+        self.series = series
+        self.is_numeric = pd.api.types.is_numeric_dtype(series)
+
+    @cached_property
+    def numeric(self) -> pd.Series:
+        """Column coerced to numbers, non-numeric values as NaN."""
+        with stage('numeric_coercion', rows=len(self.series)):
+            return pd.to_numeric(self.series, errors='coerce')
+
+    @cached_property
+    def numeric_mask(self) -> np.ndarray:
+        """True where the coerced value is a number."""
+        return self.numeric.notna().to_numpy()
+
+    @cached_property
+    def grand_total(self):
+        """Sum of the whole coerced column, used for '% of Total'."""
+        return self.numeric.sum()
+
+    @cached_property
+    def label_codes(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The column dictionary-encoded once (see encode_labels): integer
+        codes per row and the label of each code. Category columns reuse
+        their own codes.
+        """
+        with stage('encode_labels', rows=len(self.series)):
+            return encode_labels(self.series)
+
+
+class ExcelWorkbook:
+    """
+    An Excel file opened once and shared by every analyzer built from it.
+    The ZIP container and workbook XML are parsed when it is first needed;
+    each sheet is read on first use and cached, so switching sheets (or
+    coming back to one) does not go back to the file. With a SheetCache,
+    sheets parsed in an earlier session are loaded from the cache and the
+    workbook itself is not opened at all.
+    """
+
+    def __init__(self, file_path: str, cache: SheetCache = None):
+        self.file_path = file_path
+        self.cache = cache
+        self._excel_file = None
+        self._sheet_names = cache.get_sheet_names(file_path) if cache else None
+        self._sheets = {}
+        self._headers = {}
+
+    @property
+    def excel_file(self) -> pd.ExcelFile:
+        """The underlying pd.ExcelFile, opened on first use."""
+        if self._excel_file is None:
+            self._excel_file = pd.ExcelFile(self.file_path)
+        return self._excel_file
+
+    @property
+    def sheet_names(self) -> List[str]:
+        """Names of the sheets in the workbook."""
+        if self._sheet_names is None:
+            self._sheet_names = self.excel_file.sheet_names
+            if self.cache:
+                self.cache.put_sheet_names(self.file_path, self._sheet_names)
+        return self._sheet_names
+
+    def read_header(self, sheet_name=0) -> List[str]:
+        """Column names of a sheet, read without parsing its rows."""
+        if isinstance(sheet_name, int):
+            sheet_name = self.sheet_names[sheet_name]
+        if sheet_name in self._sheets:
+            return list(self._sheets[sheet_name].columns)
+        if sheet_name not in self._headers:
+            header = self.cache.get_columns(self.file_path, sheet_name) if self.cache else None
+            if header is None:
+                header = list(self.excel_file.parse(sheet_name, nrows=0).columns)
+            self._headers[sheet_name] = header
+        return self._headers[sheet_name]
+
+    def read_sheet(self, sheet_name=0, columns: List[str] = None) -> pd.DataFrame:
+        """
+        Get a sheet (by name or position) as a DataFrame, parsing it only once.
+        With columns, only those columns are parsed (in sheet order); a sheet
+        already loaded in full is projected instead. Such partial reads are
+        not kept.
+        """
+        if isinstance(sheet_name, int):
+            sheet_name = self.sheet_names[sheet_name]
+        if columns is not None:
+            return self._read_columns(sheet_name, columns)
+        if sheet_name not in self._sheets:
+            df = self.cache.get(self.file_path, sheet_name) if self.cache else None
+            if df is None:
+                df = self.excel_file.parse(sheet_name)
+                if self.cache:
+                    self.cache.put(self.file_path, sheet_name, df)
+            self._sheets[sheet_name] = df
+        return self._sheets[sheet_name]
+
+    def _read_columns(self, sheet_name: str, columns: List[str]) -> pd.DataFrame:
+        """Read only some columns of a sheet (see read_sheet)."""
+        if sheet_name in self._sheets:
+            df = self._sheets[sheet_name]
+            return df[select_columns(columns, list(df.columns))]
+        df = self.cache.get(self.file_path, sheet_name, columns) if self.cache else None
+        if df is not None:
+            return df
+        # Positions rather than names, so renamed duplicates ('x.1') match too
+        header = self.read_header(sheet_name)
+        selected = set(select_columns(columns, header))
+        positions = [position for position, column in enumerate(header) if column in selected]
+        return self.excel_file.parse(sheet_name, usecols=positions)
+
+    def close(self):
+        """Release the file handle and the cached sheets."""
+        self._sheets.clear()
+        self._headers.clear()
+        if self._excel_file is not None:
+            self._excel_file.close()
+            self._excel_file = None
+
+
+def open_workbook(file_path: str, cache: SheetCache = None):
+    """
+    Open a file for sheet-by-sheet reading: a TableFile for CSV, Parquet and
+    Feather files, an ExcelWorkbook otherwise.
+    """
+    if table_format(file_path):
+        return TableFile(file_path, cache)
+    return ExcelWorkbook(file_path, cache)
 
 
 class ExcelAnalyzer:
     """Handles Excel file analysis with grouping capabilities."""
 
-    def __init__(self, file_path: str, sheet_name: str = 0):
+    def __init__(self, file_path, sheet_name: str = 0, quantile_error: float = None,
+                 streaming: bool = False, chunk_size: int = 50000,
+                 cache: SheetCache = None, histogram_bins=DEFAULT_HISTOGRAM_BINS,
+                 profiler: Profiler = None, columns: List[str] = None,
+                 column_types: Dict[str, str] = None, category_ratio: float = DEFAULT_CATEGORY_RATIO):
+        # file_path may also be an open ExcelWorkbook, TableFile or
+        # pd.ExcelFile, which avoids parsing the file again for every sheet.
+        # CSV, Parquet and Feather paths are read natively (see table_files)
         self.file_path = file_path
         self.sheet_name = sheet_name
+        # Streaming mode only: None keeps exact percentiles, otherwise they
+        # come from KLL sketches with this normalized rank error (e.g. 0.01).
+        # A sheet held in memory is sorted anyway, so its percentiles are
+        # always exact and this is ignored
+        self.quantile_error = quantile_error
+        # Histogram bins of numeric columns: a strategy from
+        # HISTOGRAM_STRATEGIES ('sturges', 'fd') or a fixed number of bins
+        if isinstance(histogram_bins, str) and histogram_bins not in HISTOGRAM_STRATEGIES:
+            raise ValueError(f"histogram_bins must be one of {HISTOGRAM_STRATEGIES} or a number of bins")
+        self.histogram_bins = histogram_bins
+        # Streaming mode never holds the sheet in memory: only the header is
+        # read on load and every analysis makes one chunked pass over the file
+        self.streaming = streaming
+        self.chunk_size = chunk_size
+        # Optional SheetCache used when file_path is a plain path
+        self.cache = cache
+        # Optional Profiler recording the stages of loading and analysis
+        self.profiler = profiler
+        # Only load these columns (see get_header); the others are not parsed
+        self.columns = list(columns) if columns is not None else None
+        # Per-column load types ('number', 'text', 'category', 'auto') and the
+        # distinct-value share below which text columns become category
+        # (None keeps them as object); see column_types.apply_column_types
+        self.column_types = dict(column_types or {})
+        self.category_ratio = category_ratio
+        self.stream_columns = []
         self.df = None
         self.load_file()
 
+    @property
+    def df(self) -> pd.DataFrame:
+        """Loaded sheet. Assigning a new DataFrame resets the column profiles."""
+        return self._df
+
+    @df.setter
+    def df(self, value: pd.DataFrame):
+        self._df = value
+        self._column_profiles = {}
+        if value is not None:
+            for column in value.columns:
+                self._column_profiles[column] = ColumnProfile(value[column])
+
+    def get_column_profile(self, column: str) -> ColumnProfile:
+        """Get the cached profile of a column of the loaded sheet."""
+        profile = self._column_profiles.get(column)
+        if profile is None:
+            profile = ColumnProfile(self.df[column])
+            self._column_profiles[column] = profile
+        return profile
+
+    @profiled('load')
     def load_file(self):
-        """Load Excel file into pandas DataFrame."""
+        """Load Excel file into pandas DataFrame (only its header when streaming)."""
         try:
-            self.df = pd.read_excel(self.file_path, sheet_name=self.sheet_name)
+            if self.streaming:
+                with stage('read_header'):
+                    if table_format(self._source_path()):
+                        header = read_table_header(self._source_path())
+                    else:
+                        header = read_excel_header(self._source_path(), self.sheet_name)
+                    self.stream_columns = select_columns(self.columns, header)
+                return
+            with stage('read_table' if table_format(self._source_path()) else 'read_excel') as span:
+                if isinstance(self.file_path, (ExcelWorkbook, TableFile)):
+                    df = self.file_path.read_sheet(self.sheet_name, self.columns)
+                elif isinstance(self.file_path, pd.ExcelFile):
+                    df = self.file_path.parse(self.sheet_name)
+                    if self.columns is not None:
+                        df = df[select_columns(self.columns, list(df.columns))]
+                else:
+                    workbook = open_workbook(self.file_path, self.cache)
+                    try:
+                        df = workbook.read_sheet(self.sheet_name, self.columns)
+                    finally:
+                        workbook.close()
+                span.set(rows=len(df))
+            with stage('column_types', rows=len(df)):
+                self.df = apply_column_types(df, self.column_types, self.category_ratio)
         except Exception as e:
             raise Exception(f"Error loading file: {str(e)}")
 
+    def get_header(self) -> List[str]:
+        """
+        All column names of the sheet, read without parsing its rows, e.g.
+        to choose the columns of a narrower load.
+        """
+        if isinstance(self.file_path, (ExcelWorkbook, TableFile)):
+            return self.file_path.read_header(self.sheet_name)
+        if isinstance(self.file_path, pd.ExcelFile):
+            return list(self.file_path.parse(self.sheet_name, nrows=0).columns)
+        workbook = open_workbook(self.file_path, self.cache)
+        try:
+            return workbook.read_header(self.sheet_name)
+        finally:
+            workbook.close()
+
+    def _source_path(self) -> str:
+        """Path of the file being analyzed, whatever form file_path was given in."""
+        if isinstance(self.file_path, (ExcelWorkbook, TableFile)):
+            return self.file_path.file_path
+        if isinstance(self.file_path, pd.ExcelFile):
+            return self.file_path.io
+        return self.file_path
+
     def get_columns(self) -> List[str]:
         """Get list of all columns in the dataset."""
+        if self.df is None:
+            return list(self.stream_columns)
         return list(self.df.columns)
 
+    def _analyze_stream(self, group_column: str = None, progress: ProgressCallback = None,
+                        cancel_event=None) -> Dict[str, Dict]:
+        """Analyze the sheet in one chunked pass (streaming mode)."""
+        analysis = StreamingAnalysis(group_column, self.quantile_error, self.histogram_bins)
+        if table_format(self._source_path()):
+            chunks = iter_table_chunks(self._source_path(), self.chunk_size, self.columns)
+        else:
+            chunks = iter_excel_chunks(self._source_path(), self.sheet_name, self.chunk_size)
+            if self.columns is not None:
+                chunks = (chunk[self.stream_columns] for chunk in chunks)
+        if self.column_types:
+            # Whole-column category decisions need every row; chunks only
+            # take the explicit types
+            chunks = (apply_column_types(chunk, self.column_types, None) for chunk in chunks)
+        for chunk in timed('read_chunk', chunks):
+            _check_cancelled(cancel_event)
+            with stage('update', rows=len(chunk)):
+                analysis.update(chunk)
+        with stage('finish'):
+            results = analysis.results()
+
+        # Columns only finish together, at the end of the pass
+        if progress:
+            columns = [column for column in self.get_columns() if column != group_column]
+            for done, column in enumerate(columns, 1):
+                if group_column is None:
+                    result = results.get(column)
+                else:
+                    result = {
+                        group_name: group_result['columns'][column]
+                        for group_name, group_result in results.items()
+                        if column in group_result['columns']
+                    }
+                progress(done, len(columns), column, result)
+        return results
+
     def analyze_quantitative(self, column: str, grouped_data=None) -> Dict[str, Any]:
         """
         Analyze quantitative (numeric) column.
-        Returns: min, max, average, percentiles (25, 50, 75), sum, % of total, frequency
+        Returns: min, max, average, percentiles (25, 50, 75), sum, % of total, frequency, histogram
         """
-        data = grouped_data[column] if grouped_data is not None else self.df[column]
+        profile = self.get_column_profile(column)
 
         # Filter out non-numeric values
-        numeric_data = pd.to_numeric(data, errors='coerce').dropna()
-
-        if len(numeric_data) == 0:
-            return None
-
-        total_sum = numeric_data.sum()
-        grand_total = pd.to_numeric(self.df[column], errors='coerce').sum()
-
-        # Calculate frequency distribution
-        value_counts = numeric_data.value_counts().sort_index()
-        frequency_data = []
-        total_count = len(numeric_data)
-
-        for value, count in value_counts.items():
-            value_sum = value * count
-            percent_of_total_column = (value_sum / total_sum * 100) if total_sum != 0 else 0
-            frequency_data.append({
-                'value': value,
-                'frequency': int(count),
-                'percentage': (count / total_count * 100) if total_count > 0 else 0,
-                'value_sum': value_sum,
-                'percent_of_total_column': percent_of_total_column
-            })
-
-        result = {
-            'min': numeric_data.min(),
-            'max': numeric_data.max(),
-            'average': numeric_data.mean(),
-            'percentile_25': numeric_data.quantile(0.25),
-            'percentile_50': numeric_data.quantile(0.50),
-            'percentile_75': numeric_data.quantile(0.75),
-            'sum': total_sum,
-            'percent_of_total': (total_sum / grand_total * 100) if grand_total != 0 else 0,
-            'count': len(numeric_data),
-            'frequency': frequency_data
-        }
-
-        return result
-
-    def analyze_qualitative(self, column: str, grouped_data=None) -> List[Dict[str, Any]]:
+        if grouped_data is not None:
+            numeric_data = pd.to_numeric(grouped_data[column], errors='coerce').dropna()
+        else:
+            numeric_data = profile.numeric[profile.numeric_mask]
+
+        return summarize_quantitative(numeric_data.to_numpy(), profile.grand_total, self.histogram_bins)
+
+    def analyze_qualitative(self, column: str, grouped_data=None) -> FrequencyTable:
         """
         Analyze qualitative (categorical) column.
         Returns: label, frequency, % of column that has this value
         """
-        data = grouped_data[column] if grouped_data is not None else self.df[column]
-
-        # Get value counts
-        value_counts = data.value_counts()
-        total_count = len(data.dropna())
+        if grouped_data is not None:
+            return summarize_qualitative(grouped_data[column])
 
-        results = []
-        for label, frequency in value_counts.items():
-            results.append({
-                'label': str(label),
-                'frequency': int(frequency),
-                'percentage': (frequency / total_count * 100) if total_count > 0 else 0
-            })
-
-        return results
+        return summarize_label_codes(*self.get_column_profile(column).label_codes)
 
     def is_numeric_column(self, column: str) -> bool:
         """Check if a column is numeric."""
-        return pd.api.types.is_numeric_dtype(self.df[column])
+        return self.get_column_profile(column).is_numeric
 
-    def analyze_by_group(self, group_column: str) -> Dict[str, Dict]:
+    @profiled('analyze_by_group')
+    def analyze_by_group(self, group_column: str, progress: ProgressCallback = None,
+                         cancel_event=None) -> Dict[str, Dict]:
         """
         Perform analysis grouped by a specific column.
         Returns results for each group.
+
+        All groups are analyzed together: each column is coerced, sorted and
+        counted once, and the per-group statistics are sliced out of the
+        shared result instead of re-analyzing every group separately.
+
+        progress is called after each column with its results for every
+        group. Setting cancel_event (a threading.Event) stops the analysis
+        with AnalysisCancelled before the next column.
         """
-        if group_column not in self.df.columns:
+        if group_column not in self.get_columns():
             raise ValueError(f"Column '{group_column}' not found in dataset")
 
-        results = {}
-        grouped = self.df.groupby(group_column)
+        if self.streaming:
+            return self._analyze_stream(group_column, progress, cancel_event)
+
+        # Same groups and order as DataFrame.groupby (sorted keys, NaN dropped)
+        with stage('factorize_groups', column=group_column, rows=len(self.df)):
+            group_codes, group_keys = pd.factorize(self.df[group_column], sort=True)
+            n_groups = len(group_keys)
+            row_counts = np.bincount(group_codes[group_codes >= 0], minlength=n_groups)
 
-        for group_name, group_data in grouped:
-            group_results = {
-                'group_name': str(group_name),
-                'row_count': len(group_data),
+        group_results = [
+            {
+                'group_name': str(group_key),
+                'row_count': int(row_counts[code]),
                 'columns': {}
             }
+            for code, group_key in enumerate(group_keys)
+        ]
+
+        # Analyze each column for all groups at once
+        columns = [column for column in self.df.columns if column != group_column]
+        for done, column in enumerate(columns, 1):
+            _check_cancelled(cancel_event)
+
+            with stage('column', column=column, rows=len(self.df)):
+                if self.is_numeric_column(column):
+                    column_type = 'quantitative'
+                    analyses = self._analyze_quantitative_grouped(column, group_codes, n_groups)
+                else:
+                    column_type = 'qualitative'
+                    analyses = self._analyze_qualitative_grouped(column, group_codes, n_groups)
+
+            column_results = {}
+            for code, analysis in enumerate(analyses):
+                if analysis:
+                    entry = {
+                        'type': column_type,
+                        'data': analysis
+                    }
+                    group_results[code]['columns'][column] = entry
+                    column_results[group_results[code]['group_name']] = entry
+
+            if progress:
+                progress(done, len(columns), column, column_results)
+
+        results = {}
+        for group_result in group_results:
+            results[group_result['group_name']] = group_result
+
+        return results
 
-            # Analyze each column in the group
-            for column in self.df.columns:
-                if column == group_column:
+    def _analyze_quantitative_grouped(self, column: str, group_codes: np.ndarray,
+                                      n_groups: int) -> List[Dict[str, Any]]:
+        """
+        Quantitative analysis of one column for every group in a single pass.
+        Returns one result per group code (None for groups without numeric values).
+        """
+        profile = self.get_column_profile(column)
+        grand_total = profile.grand_total
+
+        valid = profile.numeric_mask & (group_codes >= 0)
+        values = profile.numeric.to_numpy()[valid]
+        codes = group_codes[valid]
+
+        # min/max/mean/sum/count per group, keeping the column dtype
+        with stage('aggregates'):
+            aggregates = pd.Series(values).groupby(codes).agg(['min', 'max', 'mean', 'sum', 'count'])
+            aggregates = aggregates.reindex(range(n_groups))
+
+        # One shared sort by (group, value) feeds both the quartiles and the
+        # frequency tables, which are read off as contiguous slices
+        with stage('sort'):
+            order = np.lexsort((values, codes))
+            sorted_values = values[order]
+            sorted_codes = codes[order]
+            counts = np.bincount(sorted_codes, minlength=n_groups)
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+        with stage('quantiles'):
+            quartiles = {
+                q: grouped_linear_quantile(sorted_values, starts, counts, q)
+                for q in (0.25, 0.50, 0.75)
+            }
+
+        # Run-length encode the sorted (group, value) pairs into frequency rows
+        with stage('value_counts'):
+            if len(sorted_values):
+                run_flags = np.empty(len(sorted_values), dtype=bool)
+                run_flags[0] = True
+                run_flags[1:] = (sorted_codes[1:] != sorted_codes[:-1]) | (sorted_values[1:] != sorted_values[:-1])
+                run_starts = np.flatnonzero(run_flags)
+            else:
+                run_starts = np.empty(0, dtype=np.intp)
+            run_values = sorted_values[run_starts]
+            run_codes = sorted_codes[run_starts]
+            run_counts = np.diff(np.append(run_starts, len(sorted_values)))
+            run_bounds = np.searchsorted(run_codes, np.arange(n_groups + 1))
+
+        mins = aggregates['min'].to_numpy()
+        maxs = aggregates['max'].to_numpy()
+        means = aggregates['mean'].to_numpy()
+        sums = aggregates['sum'].to_numpy()
+
+        # Histograms of all groups from the same runs, binned in one pass
+        with stage('histogram'):
+            bin_counts = histogram_bin_counts(self.histogram_bins, counts, mins, maxs,
+                                              quartiles[0.75] - quartiles[0.25], np.diff(run_bounds))
+            histograms = grouped_histograms(run_values, run_counts, run_codes, bin_counts, mins, maxs)
+
+        # Frequency fields for every (group, value) row at once
+        with stage('frequency_tables'):
+            run_value_sums = run_values * run_counts
+            run_percentages = run_counts / np.maximum(counts, 1)[run_codes] * 100
+            run_group_sums = sums[run_codes] if len(run_codes) else np.empty(0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                run_percents_of_total = np.where(run_group_sums != 0,
+                                                 run_value_sums / run_group_sums * 100, 0.0)
+
+            analyses = []
+            for code in range(n_groups):
+                total_count = int(counts[code])
+                if total_count == 0:
+                    analyses.append(None)
                     continue
 
+                total_sum = sums[code]
+                lo, hi = run_bounds[code], run_bounds[code + 1]
+
+                analyses.append({
+                    'min': mins[code],
+                    'max': maxs[code],
+                    'average': means[code],
+                    'percentile_25': quartiles[0.25][code],
+                    'percentile_50': quartiles[0.50][code],
+                    'percentile_75': quartiles[0.75][code],
+                    'sum': total_sum,
+                    'percent_of_total': (total_sum / grand_total * 100) if grand_total != 0 else 0,
+                    'count': total_count,
+                    'frequency': FrequencyTable({
+                        'value': run_values[lo:hi],
+                        'frequency': run_counts[lo:hi],
+                        'percentage': run_percentages[lo:hi],
+                        'value_sum': run_value_sums[lo:hi],
+                        'percent_of_total_column': run_percents_of_total[lo:hi]
+                    }),
+                    'histogram': histograms[code]
+                })
+
+        return analyses
+
+    def _analyze_qualitative_grouped(self, column: str, group_codes: np.ndarray,
+                                     n_groups: int) -> List[FrequencyTable]:
+        """
+        Qualitative analysis of one column for every group in a single pass.
+        Returns one frequency table per group code, ordered like value_counts().
+
+        The column's label codes and the group codes index a 2-D table of
+        (group, label) counts filled by one bincount, so the cost is linear
+        in the rows; only when that table would be much larger than the
+        column are the (group, label) pairs sorted instead.
+        """
+        value_codes, labels = self.get_column_profile(column).label_codes
+        n_labels = max(len(labels), 1)
+
+        with stage('value_counts'):
+            valid = (value_codes >= 0) & (group_codes >= 0)
+            keys = group_codes[valid].astype(np.int64) * n_labels + value_codes[valid]
+
+            n_cells = n_groups * n_labels
+            if n_cells <= DENSE_COUNT_CELLS_PER_ROW * max(len(keys), 1):
+                cell_counts = np.bincount(keys, minlength=n_cells)
+                run_keys = np.flatnonzero(cell_counts)
+                run_counts = cell_counts[run_keys]
+                # Position of the first row of every (group, label), for ties
+                run_first_rows = first_occurrences(keys, n_cells)[run_keys]
+            else:
+                # Stable sort keeps the first row of every (group, label) run first
+                order = np.argsort(keys, kind='stable')
+                sorted_keys = keys[order]
+                if len(sorted_keys):
+                    run_flags = np.empty(len(sorted_keys), dtype=bool)
+                    run_flags[0] = True
+                    run_flags[1:] = sorted_keys[1:] != sorted_keys[:-1]
+                    run_starts = np.flatnonzero(run_flags)
+                else:
+                    run_starts = np.empty(0, dtype=np.intp)
+                run_keys = sorted_keys[run_starts]
+                run_counts = np.diff(np.append(run_starts, len(sorted_keys)))
+                run_first_rows = order[run_starts]
+            run_codes = run_keys // n_labels
+            run_labels = run_keys % n_labels
+
+            # Within a group: most frequent first, ties in order of appearance
+            display = np.lexsort((run_first_rows, -run_counts, run_codes))
+            run_codes = run_codes[display]
+            run_labels = run_labels[display]
+            run_counts = run_counts[display]
+            run_bounds = np.searchsorted(run_codes, np.arange(n_groups + 1))
+            group_totals = np.bincount(group_codes[valid], minlength=n_groups)
+            run_labels = labels[run_labels]
+            run_percentages = run_counts / np.maximum(group_totals, 1)[run_codes] * 100
+
+        with stage('frequency_tables'):
+            analyses = []
+            for code in range(n_groups):
+                lo, hi = run_bounds[code], run_bounds[code + 1]
+                analyses.append(FrequencyTable({
+                    'label': run_labels[lo:hi],
+                    'frequency': run_counts[lo:hi],
+                    'percentage': run_percentages[lo:hi]
+                }))
+
+        return analyses
+
+    @profiled('analyze_all_columns')
+    def analyze_all_columns(self, workers: int = 1, progress: ProgressCallback = None,
+                            cancel_event=None) -> Dict[str, Dict]:
+        """
+        Perform analysis on all columns without grouping.
+
+        With workers > 1 (or None for one per CPU) the columns are analyzed
+        in a process pool. Numeric columns reach the workers through one
+        shared memory block instead of being pickled; results keep the
+        original column order either way.
+
+        progress is called after each column (in completion order when
+        running in a pool). Setting cancel_event (a threading.Event) stops
+        the analysis with AnalysisCancelled before the next column.
+        """
+        if self.streaming:
+            return self._analyze_stream(progress=progress, cancel_event=cancel_event)
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers > 1 and len(self.df.columns) > 1:
+            return self._analyze_all_columns_parallel(workers, progress, cancel_event)
+
+        results = {}
+
+        columns = list(self.df.columns)
+        for done, column in enumerate(columns, 1):
+            _check_cancelled(cancel_event)
+
+            with stage('column', column=column, rows=len(self.df)):
                 if self.is_numeric_column(column):
-                    analysis = self.analyze_quantitative(column, group_data)
+                    analysis = self.analyze_quantitative(column)
                     if analysis:
-                        group_results['columns'][column] = {
+                        results[column] = {
                             'type': 'quantitative',
                             'data': analysis
                         }
                 else:
-                    analysis = self.analyze_qualitative(column, group_data)
+                    analysis = self.analyze_qualitative(column)
                     if analysis:
-                        group_results['columns'][column] = {
+                        results[column] = {
                             'type': 'qualitative',
                             'data': analysis
                         }
 
-            results[str(group_name)] = group_results
+            if progress:
+                progress(done, len(columns), column, results.get(column))
 
         return results
 
-    def analyze_all_columns(self) -> Dict[str, Dict]:
-        """
-        Perform analysis on all columns without grouping.
-        """
-        results = {}
+    def _analyze_all_columns_parallel(self, workers: int, progress: ProgressCallback = None,
+                                      cancel_event=None) -> Dict[str, Dict]:
+        """Analyze all columns in a process pool (see analyze_all_columns)."""
+        columns = list(self.df.columns)
+        numeric_arrays = {}
+        object_arrays = {}
+        for column in columns:
+            profile = self.get_column_profile(column)
+            if profile.is_numeric:
+                with stage('prepare_column', column=column, rows=len(self.df)):
+                    values = _shareable_numbers(profile)
+                # Object arrays hold pointers into this process and must not
+                # be copied into shared memory
+                if values.dtype.hasobject:
+                    object_arrays[column] = values
+                else:
+                    numeric_arrays[column] = values
+        # Workers record their own stages when this run is being profiled
+        profile_tasks = is_active()
 
-        for column in self.df.columns:
-            if self.is_numeric_column(column):
-                analysis = self.analyze_quantitative(column)
-                if analysis:
-                    results[column] = {
+        # Pack every numeric column into a single shared block, 8-byte aligned
+        offsets = {}
+        size = 0
+        for column, values in numeric_arrays.items():
+            offsets[column] = size
+            size += -(-values.nbytes // 8) * 8
+
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        try:
+            tasks = []
+            for column in columns:
+                if column in numeric_arrays:
+                    values = numeric_arrays[column]
+                    shared = np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf, offset=offsets[column])
+                    shared[:] = values
+                    del shared
+                    tasks.append({
                         'type': 'quantitative',
-                        'data': analysis
-                    }
-            else:
-                analysis = self.analyze_qualitative(column)
-                if analysis:
-                    results[column] = {
+                        'buffer': shm.name,
+                        'offset': offsets[column],
+                        'shape': values.shape,
+                        'dtype': values.dtype.str,
+                        'grand_total': self.get_column_profile(column).grand_total,
+                        'histogram_bins': self.histogram_bins,
+                        'column': column,
+                        'profile': profile_tasks
+                    })
+                elif column in object_arrays:
+                    tasks.append({
+                        'type': 'quantitative',
+                        'values': object_arrays[column],
+                        'grand_total': self.get_column_profile(column).grand_total,
+                        'histogram_bins': self.histogram_bins,
+                        'column': column,
+                        'profile': profile_tasks
+                    })
+                else:
+                    # Object columns cannot live in shared memory; only this
+                    # column's values travel with its task
+                    tasks.append({
                         'type': 'qualitative',
-                        'data': analysis
-                    }
+                        'values': self.df[column],
+                        'column': column,
+                        'profile': profile_tasks
+                    })
+
+            analyses = [None] * len(tasks)
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+                futures = {executor.submit(_analyze_column_task, task): i for i, task in enumerate(tasks)}
+                try:
+                    for done, future in enumerate(as_completed(futures), 1):
+                        _check_cancelled(cancel_event)
+                        i = futures[future]
+                        analyses[i], spans = future.result()
+                        if spans:
+                            merge_records(spans)
+                        if progress:
+                            entry = {'type': tasks[i]['type'], 'data': analyses[i]} if analyses[i] else None
+                            progress(done, len(tasks), columns[i], entry)
+                except BaseException:
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    raise
+        finally:
+            shm.close()
+            shm.unlink()
+
+        results = {}
+        for column, task, analysis in zip(columns, tasks, analyses):
+            if analysis:
+                results[column] = {
+                    'type': task['type'],
+                    'data': analysis
+                }
 
         return results
+
+
+def _check_cancelled(cancel_event):
+    """Raise AnalysisCancelled if the cancel event has been set."""
+    if cancel_event is not None and cancel_event.is_set():
+        raise AnalysisCancelled("Analysis cancelled")
+
+
+def _analyze_column_task(task: Dict[str, Any]) -> tuple:
+    """
+    Process-pool entry point used by ExcelAnalyzer.analyze_all_columns.
+    Returns the column's analysis and, for a profiled run, its recorded spans.
+    """
+    if not task['profile']:
+        return _summarize_column(task), None
+    profiler = Profiler()
+    with profiler.activate(), stage('column', column=task['column']):
+        analysis = _summarize_column(task)
+    return analysis, profiler.records()
+
+
+def _shareable_numbers(profile: ColumnProfile) -> np.ndarray:
+    """
+    The numbers of a column as a NumPy array for shared memory. Nullable
+    columns (Int64, Float64, boolean) would convert to an object array, so
+    only their present values are taken, in the matching NumPy dtype; NaN
+    marks missing values of plain float columns.
+    """
+    numeric = profile.numeric
+    if isinstance(numeric.dtype, np.dtype):
+        return numeric.to_numpy()
+    present = numeric[profile.numeric_mask]
+    numpy_dtype = getattr(numeric.dtype, 'numpy_dtype', None)
+    if numpy_dtype is None:
+        return present.to_numpy()
+    return present.to_numpy(dtype=numpy_dtype)
+
+
+def _summarize_column(task: Dict[str, Any]):
+    """The analysis of one column task (see _analyze_column_task)."""
+    if task['type'] == 'qualitative':
+        return summarize_qualitative(task['values'])
+    if 'values' in task:
+        return summarize_quantitative(task['values'], task['grand_total'], task['histogram_bins'])
+
+    shm = shared_memory.SharedMemory(name=task['buffer'])
+    try:
+        shared = np.ndarray(task['shape'], dtype=np.dtype(task['dtype']), buffer=shm.buf, offset=task['offset'])
+        # Copy out of the shared block so nothing returned points into it
+        numeric_data = shared[~np.isnan(shared)] if shared.dtype.kind == 'f' else shared.copy()
+        del shared
+        return summarize_quantitative(numeric_data, task['grand_total'], task['histogram_bins'])
+    finally:
+        shm.close()
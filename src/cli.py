@@ -0,0 +1,381 @@
+"""
+Headless command-line entry point: analyze and export many workbooks
+without the GUI, e.g. from a nightly job on a server with no display.
+
+    python src/cli.py "extracts/**/*.xlsx" --group-by Department --output-dir reports
+    python src/cli.py data.xlsx --sheet Sales --sheet 2 --summary run.json
+    python src/cli.py "exports/*.parquet" "exports/*.csv" --group-by Region
+
+Each input file is processed in its own worker process (--jobs at a time).
+CSV, Parquet and Feather files have a single sheet named after the file.
+Every selected sheet is analyzed and exported to
+<output-dir>/<file>_<sheet>_analysis.xlsx (see --output-name). A JSON run
+summary with per-file and per-sheet timings is written to --summary (or
+stdout with "-"). With --profile DIR every sheet's stage timings are added
+to the summary and written to DIR as a speedscope trace (and, with
+--cprofile, as cProfile statistics).
+
+Exit codes: 0 when every file succeeded, 1 when any file failed, 2 for
+invalid arguments or when no input file matched, 130 when interrupted.
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from multiprocessing import freeze_support
+from typing import Dict, List, Any
+
+from analyzer import ExcelAnalyzer, ExcelWorkbook, open_workbook
+from column_stats import HISTOGRAM_STRATEGIES, DEFAULT_HISTOGRAM_BINS
+from excel_exporter import ExcelExporter, DEFAULT_CHART_BUDGET, CHART_RANKINGS
+from profiling import Profiler
+from sheet_cache import SheetCache
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+DEFAULT_OUTPUT_NAME = "{file}_{sheet}_analysis.xlsx"
+ALL_SHEETS = '*'
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    """Command-line options of a batch run."""
+    parser = argparse.ArgumentParser(
+        description="Analyze Excel workbooks and export the results without the GUI.")
+    parser.add_argument('inputs', nargs='+', metavar='INPUT',
+                        help="workbook (or CSV, Parquet, Feather) paths or glob patterns "
+                             "(** matches directories recursively)")
+    parser.add_argument('--sheet', action='append', dest='sheets', metavar='SHEET',
+                        help="sheet name or 0-based index to analyze; repeat for several sheets, "
+                             f"'{ALL_SHEETS}' for all (default: the first sheet)")
+    parser.add_argument('--group-by', metavar='COLUMN',
+                        help="group the analysis by this column")
+    parser.add_argument('--output-dir', default='.',
+                        help="directory for the exported workbooks (default: current directory)")
+    parser.add_argument('--output-name', default=DEFAULT_OUTPUT_NAME,
+                        help="file name of each export; {file} and {sheet} are replaced "
+                             f"(default: {DEFAULT_OUTPUT_NAME})")
+    parser.add_argument('--no-export', action='store_true',
+                        help="only analyze; do not write result workbooks")
+    parser.add_argument('--jobs', type=int, default=0,
+                        help="files processed at the same time (default 0: one per CPU)")
+    parser.add_argument('--summary', metavar='PATH',
+                        help="write the JSON run summary to PATH ('-' for stdout)")
+    parser.add_argument('--histogram-bins', default=DEFAULT_HISTOGRAM_BINS,
+                        help=f"histogram bin strategy {HISTOGRAM_STRATEGIES} or a number of bins "
+                             f"(default: {DEFAULT_HISTOGRAM_BINS})")
+    parser.add_argument('--chart-budget', type=int, default=DEFAULT_CHART_BUDGET,
+                        help="quantitative columns charted on the Visualizations sheet "
+                             f"(0 for all, default: {DEFAULT_CHART_BUDGET})")
+    parser.add_argument('--chart-rank', choices=sorted(CHART_RANKINGS), default='variance',
+                        help="how columns are ranked for the chart budget (default: variance)")
+    parser.add_argument('--cache', action='store_true',
+                        help="use the local sheet cache, so unchanged files are not parsed again")
+    parser.add_argument('--profile', metavar='DIR',
+                        help="record stage timings of every sheet: added to the summary and written "
+                             "to DIR as <file>_<sheet>.speedscope.json")
+    parser.add_argument('--cprofile', action='store_true',
+                        help="with --profile, also write <file>_<sheet>.prof cProfile statistics "
+                             "(slows the run down)")
+    parser.add_argument('--quiet', action='store_true', help="do not print per-file progress")
+    args = parser.parse_args(argv)
+
+    if args.histogram_bins not in HISTOGRAM_STRATEGIES:
+        try:
+            args.histogram_bins = int(args.histogram_bins)
+        except ValueError:
+            parser.error(f"--histogram-bins must be one of {HISTOGRAM_STRATEGIES} or an integer")
+        if args.histogram_bins < 1:
+            parser.error("--histogram-bins must be at least 1")
+    if args.jobs < 0:
+        parser.error("--jobs must be 0 or more")
+    if args.chart_budget < 0:
+        parser.error("--chart-budget must be 0 or more")
+    if args.cprofile and not args.profile:
+        parser.error("--cprofile needs --profile")
+    try:
+        args.output_name.format(file='', sheet='')
+    except (KeyError, IndexError, ValueError):
+        parser.error("--output-name may only use the {file} and {sheet} fields")
+    return args
+
+
+def expand_inputs(patterns: List[str]) -> List[str]:
+    """Input files matching the patterns, in pattern order, without duplicates."""
+    paths = []
+    seen = set()
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        else:
+            matches = [pattern]
+        for path in matches:
+            if os.path.isdir(path):
+                continue
+            key = os.path.abspath(path)
+            if key not in seen:
+                seen.add(key)
+                paths.append(path)
+    return paths
+
+
+def output_path(options: Dict[str, Any], file_path: str, sheet_name: str) -> str:
+    """Export path of one sheet of one input file."""
+    name = options['output_name'].format(file=_safe_name(os.path.splitext(os.path.basename(file_path))[0]),
+                                         sheet=_safe_name(sheet_name))
+    return os.path.join(options['output_dir'], name)
+
+
+def process_file(file_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Analyze (and export) the selected sheets of one workbook. Never raises;
+    failures are reported in the returned summary entry.
+    """
+    started = time.perf_counter()
+    entry = {'input': file_path, 'status': 'ok', 'error': None, 'sheets': []}
+    workbook = None
+    try:
+        cache = SheetCache() if options['cache'] else None
+        workbook = open_workbook(file_path, cache=cache)
+        for sheet_name in _select_sheets(workbook.sheet_names, options['sheets']):
+            entry['sheets'].append(_process_sheet(workbook, file_path, sheet_name, options))
+    except Exception as e:
+        entry['status'] = 'error'
+        entry['error'] = str(e)
+    finally:
+        if workbook is not None:
+            workbook.close()
+
+    if any(sheet['status'] != 'ok' for sheet in entry['sheets']):
+        entry['status'] = 'error'
+        entry['error'] = entry['error'] or "One or more sheets failed"
+    entry['seconds'] = round(time.perf_counter() - started, 3)
+    return entry
+
+
+def run(args: argparse.Namespace) -> int:
+    """Process every input file and write the summary; returns the exit code."""
+    files = expand_inputs(args.inputs)
+    if not files:
+        print("No input files matched.", file=sys.stderr)
+        return EXIT_USAGE
+
+    options = {
+        'sheets': args.sheets or [0],
+        'group_column': args.group_by,
+        'output_dir': args.output_dir,
+        'output_name': args.output_name,
+        'export': not args.no_export,
+        'histogram_bins': args.histogram_bins,
+        'chart_budget': args.chart_budget or None,
+        'chart_rank': args.chart_rank,
+        'cache': args.cache,
+        'profile_dir': args.profile,
+        'cprofile': args.cprofile,
+    }
+    if args.profile:
+        os.makedirs(args.profile, exist_ok=True)
+    if options['export']:
+        # Inputs with the same file name would overwrite each other's exports
+        stems = {}
+        for file_path in files:
+            stems.setdefault(os.path.splitext(os.path.basename(file_path))[0], []).append(file_path)
+        clashes = [paths for paths in stems.values() if len(paths) > 1]
+        if clashes and '{file}' in args.output_name:
+            print(f"Input files share a name and would overwrite each other's results: "
+                  f"{', '.join(clashes[0])}. Use separate runs with different --output-dir.",
+                  file=sys.stderr)
+            return EXIT_USAGE
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    summary = {
+        'started': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'files': [None] * len(files)
+    }
+    started = time.perf_counter()
+    workers = min(args.jobs or os.cpu_count() or 1, len(files))
+
+    def report(entry):
+        if not args.quiet:
+            detail = f"{len(entry['sheets'])} sheet(s)" if entry['status'] == 'ok' else entry['error']
+            print(f"[{entry['status']}] {entry['input']} ({entry['seconds']:.2f} s): {detail}", file=sys.stderr)
+
+    interrupted = False
+    try:
+        if workers == 1:
+            for i, file_path in enumerate(files):
+                summary['files'][i] = process_file(file_path, options)
+                report(summary['files'][i])
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(process_file, file_path, options): i
+                           for i, file_path in enumerate(files)}
+                try:
+                    for future in as_completed(futures):
+                        i = futures[future]
+                        try:
+                            summary['files'][i] = future.result()
+                        except Exception as e:
+                            # The worker process itself died (e.g. out of memory)
+                            summary['files'][i] = {'input': files[i], 'status': 'error', 'error': str(e),
+                                                   'sheets': [], 'seconds': None}
+                        report(summary['files'][i])
+                except BaseException:
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    raise
+    except KeyboardInterrupt:
+        interrupted = True
+
+    # Files that never ran (interrupted run) are reported as skipped
+    for i, entry in enumerate(summary['files']):
+        if entry is None:
+            summary['files'][i] = {'input': files[i], 'status': 'skipped', 'error': None,
+                                   'sheets': [], 'seconds': None}
+
+    summary['finished'] = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    summary['seconds'] = round(time.perf_counter() - started, 3)
+    summary['workers'] = workers
+    summary['succeeded'] = sum(entry['status'] == 'ok' for entry in summary['files'])
+    summary['failed'] = sum(entry['status'] == 'error' for entry in summary['files'])
+    summary['skipped'] = sum(entry['status'] == 'skipped' for entry in summary['files'])
+    if interrupted:
+        exit_code = EXIT_INTERRUPTED
+    else:
+        exit_code = EXIT_FAILED if summary['failed'] else EXIT_OK
+    summary['exit_code'] = exit_code
+
+    if args.summary:
+        try:
+            _write_summary(summary, args.summary)
+        except OSError as e:
+            print(f"Could not write the run summary to {args.summary}: {e}", file=sys.stderr)
+            if exit_code == EXIT_OK:
+                exit_code = EXIT_FAILED
+    return exit_code
+
+
+def main(argv: List[str] = None) -> int:
+    """Entry point of the command-line interface."""
+    return run(parse_args(argv))
+
+
+def _select_sheets(sheet_names: List[str], selectors: List) -> List[str]:
+    """Sheet names picked by name or 0-based index selectors, in workbook order for '*'."""
+    selected = []
+    for selector in selectors:
+        if selector == ALL_SHEETS:
+            matches = list(sheet_names)
+        elif selector in sheet_names:
+            matches = [selector]
+        elif isinstance(selector, int) or str(selector).isdigit():
+            index = int(selector)
+            if index >= len(sheet_names):
+                raise ValueError(f"Sheet index {index} out of range ({len(sheet_names)} sheets)")
+            matches = [sheet_names[index]]
+        else:
+            raise ValueError(f"Sheet '{selector}' not found")
+        for sheet_name in matches:
+            if sheet_name not in selected:
+                selected.append(sheet_name)
+    return selected
+
+
+def _process_sheet(workbook: ExcelWorkbook, file_path: str, sheet_name: str,
+                   options: Dict[str, Any]) -> Dict[str, Any]:
+    """Analyze and export one sheet; returns its summary entry."""
+    entry = {'sheet': sheet_name, 'status': 'ok', 'error': None, 'output': None}
+    profiler = Profiler(cprofile=options['cprofile']) if options['profile_dir'] else None
+    try:
+        started = time.perf_counter()
+        analyzer = ExcelAnalyzer(workbook, sheet_name=sheet_name, histogram_bins=options['histogram_bins'],
+                                 profiler=profiler)
+        entry['rows'] = len(analyzer.df)
+        entry['columns'] = len(analyzer.df.columns)
+        group_column = options['group_column']
+        if group_column:
+            results = analyzer.analyze_by_group(group_column)
+            entry['groups'] = len(results)
+        else:
+            results = analyzer.analyze_all_columns()
+        entry['analysis_seconds'] = round(time.perf_counter() - started, 3)
+
+        if options['export']:
+            started = time.perf_counter()
+            path = output_path(options, file_path, sheet_name)
+            exporter = ExcelExporter(results, group_column, write_only=True,
+                                     chart_budget=options['chart_budget'], chart_rank=options['chart_rank'],
+                                     profiler=profiler)
+            if group_column:
+                exporter.export_grouped(path)
+            else:
+                exporter.export_ungrouped(path)
+            entry['output'] = path
+            entry['export_seconds'] = round(time.perf_counter() - started, 3)
+    except Exception as e:
+        entry['status'] = 'error'
+        entry['error'] = str(e)
+
+    # Failed sheets are profiled too: the stages show how far they got
+    if profiler is not None and profiler.spans:
+        entry['profile'] = _rounded(profiler.report())
+        stem = os.path.splitext(os.path.basename(file_path))[0]
+        base = os.path.join(options['profile_dir'], f"{_safe_name(stem)}_{_safe_name(sheet_name)}")
+        profiler.dump_speedscope(base + '.speedscope.json', name=f"{os.path.basename(file_path)} - {sheet_name}")
+        if options['cprofile']:
+            profiler.dump_cprofile(base + '.prof')
+    return entry
+
+
+def _rounded(value):
+    """Floats of a nested report rounded to milliseconds, for a readable summary."""
+    if isinstance(value, float):
+        return round(value, 4)
+    if isinstance(value, dict):
+        return {key: _rounded(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_rounded(item) for item in value]
+    return value
+
+
+def _safe_name(name) -> str:
+    """A sheet or file name usable as part of a file name."""
+    return re.sub(r'[\\/:*?"<>|\s]+', '_', str(name)).strip('_') or 'sheet'
+
+
+def _write_summary(summary: Dict[str, Any], path: str):
+    """
+    Write the run summary as JSON to stdout, a file (atomically) or a
+    device, pipe or link such as /dev/stdout, which is written in place.
+    """
+    if path == '-':
+        json.dump(summary, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return
+    if os.path.islink(path) or (os.path.exists(path) and not os.path.isfile(path)):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+            f.write("\n")
+        return
+    temp_path = f"{path}.tmp{os.getpid()}"
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+if __name__ == "__main__":
+    # Needed for the worker processes of frozen (PyInstaller) builds
+    freeze_support()
+    sys.exit(main())
@@ -0,0 +1,157 @@
+import tkinter as tk
+from tkinter import ttk
+from typing import Dict, List, Optional, Tuple
+
+CHECKED = "☑"
+UNCHECKED = "☐"
+
+
+class ColumnPicker:
+    """
+    Modal dialog choosing which columns of a sheet to load and how to load
+    them. It only needs the header, so it runs before the sheet is parsed.
+    Click a column name (or press Space) to tick it; double-click its type,
+    or use "Load highlighted as", to set the type of the highlighted rows.
+    """
+
+    def __init__(self, parent, title: str, columns: List[str], types: Tuple[str, ...],
+                 selected: List[str] = None, column_types: Dict[str, str] = None):
+        self.columns = list(columns)
+        self.types = types
+        self.selected = set(self.columns if selected is None else selected)
+        self.column_types = dict(column_types or {})
+        self.result = None
+
+        self.window = tk.Toplevel(parent)
+        self.window.title(title)
+        self.window.geometry("520x560")
+        self.window.transient(parent)
+
+        top = tk.Frame(self.window)
+        top.pack(fill="x", padx=10, pady=(10, 5))
+        tk.Label(top, text="Filter:").pack(side="left")
+        self.filter_var = tk.StringVar()
+        self.filter_var.trace_add('write', lambda *args: self._fill())
+        filter_entry = tk.Entry(top, textvariable=self.filter_var)
+        filter_entry.pack(side="left", fill="x", expand=True, padx=(5, 10))
+        self.count_label = tk.Label(top)
+        self.count_label.pack(side="right")
+
+        tree_frame = tk.Frame(self.window)
+        tree_frame.pack(fill="both", expand=True, padx=10)
+        self.tree = ttk.Treeview(tree_frame, columns=('type',), selectmode='extended')
+        self.tree.heading('#0', text="Column")
+        self.tree.heading('type', text="Load as")
+        self.tree.column('type', width=110, stretch=False)
+        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        self.tree.bind('<Button-1>', self._on_click)
+        self.tree.bind('<Double-Button-1>', self._on_double_click)
+        self.tree.bind('<space>', lambda event: self._toggle(self.tree.selection()))
+
+        actions = tk.Frame(self.window)
+        actions.pack(fill="x", padx=10, pady=5)
+        tk.Button(actions, text="Select All", command=lambda: self._set_visible(True)).pack(side="left")
+        tk.Button(actions, text="Select None", command=lambda: self._set_visible(False)).pack(side="left", padx=5)
+        self.type_var = tk.StringVar(value=types[0])
+        type_combo = ttk.Combobox(actions, textvariable=self.type_var, values=types, state="readonly", width=10)
+        type_combo.pack(side="right")
+        type_combo.bind('<<ComboboxSelected>>', lambda event: self._set_type(self.tree.selection(),
+                                                                             self.type_var.get()))
+        tk.Label(actions, text="Load highlighted as:").pack(side="right", padx=5)
+
+        buttons = tk.Frame(self.window)
+        buttons.pack(fill="x", padx=10, pady=(5, 10))
+        tk.Button(buttons, text="Cancel", width=10, command=self.window.destroy).pack(side="right")
+        tk.Button(buttons, text="Load", width=10, command=self._accept).pack(side="right", padx=5)
+        tk.Label(buttons, text="Only the ticked columns are read.", fg="#7F8C8D").pack(side="left")
+
+        self.window.bind('<Return>', lambda event: self._accept())
+        self.window.bind('<Escape>', lambda event: self.window.destroy())
+        self._fill()
+        filter_entry.focus_set()
+
+    def show(self) -> Optional[Tuple[List[str], Dict[str, str]]]:
+        """Wait for the dialog; (columns, column_types) or None if cancelled."""
+        self.window.grab_set()
+        self.window.wait_window()
+        return self.result
+
+    def _fill(self):
+        """Show the columns matching the filter."""
+        self.tree.delete(*self.tree.get_children())
+        text = self.filter_var.get().strip().lower()
+        for position, column in enumerate(self.columns):
+            if text and text not in str(column).lower():
+                continue
+            self.tree.insert('', 'end', iid=str(position), text=self._label(column),
+                             values=(self.column_types.get(column, self.types[0]),))
+        self._update_count()
+
+    def _label(self, column) -> str:
+        """Tree text of a column: its check mark and name."""
+        return f"{CHECKED if column in self.selected else UNCHECKED} {column}"
+
+    def _update_count(self):
+        """Show how many columns are ticked."""
+        self.count_label.config(text=f"{len(self.selected)} of {len(self.columns)} selected")
+
+    def _toggle(self, items):
+        """Tick or untick rows (all of them like the first one)."""
+        if not items:
+            return
+        select = self.columns[int(items[0])] not in self.selected
+        for item in items:
+            column = self.columns[int(item)]
+            if select:
+                self.selected.add(column)
+            else:
+                self.selected.discard(column)
+            self.tree.item(item, text=self._label(column))
+        self._update_count()
+
+    def _set_visible(self, select: bool):
+        """Tick or untick every row that matches the filter."""
+        for item in self.tree.get_children():
+            column = self.columns[int(item)]
+            if select:
+                self.selected.add(column)
+            else:
+                self.selected.discard(column)
+            self.tree.item(item, text=self._label(column))
+        self._update_count()
+
+    def _set_type(self, items, column_type: str):
+        """Set the load type of rows."""
+        for item in items:
+            column = self.columns[int(item)]
+            if column_type == self.types[0]:
+                self.column_types.pop(column, None)
+            else:
+                self.column_types[column] = column_type
+            self.tree.set(item, 'type', column_type)
+
+    def _on_click(self, event):
+        """Clicking the name of a row ticks or unticks it."""
+        item = self.tree.identify_row(event.y)
+        if item and self.tree.identify_region(event.x, event.y) == 'tree':
+            self._toggle([item])
+
+    def _on_double_click(self, event):
+        """Double-clicking the type of a row cycles through the types."""
+        item = self.tree.identify_row(event.y)
+        if item and self.tree.identify_column(event.x) == '#1':
+            current = self.tree.set(item, 'type')
+            self._set_type([item], self.types[(self.types.index(current) + 1) % len(self.types)])
+
+    def _accept(self):
+        """Close with the ticked columns in sheet order."""
+        if not self.selected:
+            return
+        columns = [column for column in self.columns if column in self.selected]
+        column_types = {column: column_type for column, column_type in self.column_types.items()
+                        if column in self.selected}
+        self.result = (columns, column_types)
+        self.window.destroy()
@@ -0,0 +1,300 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Any, Tuple
+from frequency_table import FrequencyTable
+from profiling import stage
+from quantile_sketch import KLLSketch
+
+
+# Histogram bin strategies: 'sturges' (log2 of the count), 'fd'
+# (Freedman-Diaconis, bin width from the IQR) or a fixed number of bins.
+# A column never gets more bins than it has distinct values, and the
+# estimated strategies stop at MAX_HISTOGRAM_BINS.
+HISTOGRAM_STRATEGIES = ('sturges', 'fd')
+DEFAULT_HISTOGRAM_BINS = 'fd'
+MAX_HISTOGRAM_BINS = 100
+
+
+def summarize_quantitative(numeric_data: np.ndarray, grand_total,
+                           bins=DEFAULT_HISTOGRAM_BINS) -> Dict[str, Any]:
+    """
+    Quantitative statistics of the non-missing numeric values of a column.
+    Percentiles are exact: they come from the sorted distinct values, which
+    the frequency table needs anyway. Returns None when there are no values.
+    """
+    if len(numeric_data) == 0:
+        return None
+
+    # Calculate frequency distribution (distinct values in ascending order)
+    with stage('value_counts', rows=len(numeric_data)):
+        values, counts = np.unique(numeric_data, return_counts=True)
+
+    return summarize_value_counts(values, counts, grand_total,
+                                  total_sum=numeric_data.sum(),
+                                  average=numeric_data.mean(),
+                                  bins=bins)
+
+
+def summarize_value_counts(values: np.ndarray, counts: np.ndarray, grand_total,
+                           total_sum=None, average=None, sketch: KLLSketch = None,
+                           bins=DEFAULT_HISTOGRAM_BINS) -> Dict[str, Any]:
+    """
+    Quantitative statistics from the sorted distinct values of a column and
+    their counts. total_sum and average are derived from the counts unless
+    given; percentiles come from the sketch if one is given. The histogram
+    uses the bins strategy (see HISTOGRAM_STRATEGIES).
+    Returns None when there are no values.
+    """
+    if len(values) == 0:
+        return None
+
+    total_count = int(counts.sum())
+    value_sums = values * counts
+    if total_sum is None:
+        total_sum = value_sums.sum()
+    if average is None:
+        average = total_sum / total_count
+    if total_sum != 0:
+        percents_of_total = value_sums / total_sum * 100
+    else:
+        percents_of_total = np.zeros(len(values))
+
+    frequency_data = FrequencyTable({
+        'value': values,
+        'frequency': counts,
+        'percentage': counts / total_count * 100,
+        'value_sum': value_sums,
+        'percent_of_total_column': percents_of_total
+    })
+
+    # The distinct values are already sorted, so exact percentiles cost no
+    # extra pass over the column
+    with stage('quantiles'):
+        if sketch is not None:
+            percentile_25, percentile_50, percentile_75 = sketch.quantiles([0.25, 0.50, 0.75])
+        else:
+            percentile_25, percentile_50, percentile_75 = quantiles_from_counts(values, counts,
+                                                                                [0.25, 0.50, 0.75])
+
+    with stage('histogram'):
+        bin_counts = histogram_bin_counts(bins, [total_count], [values[0]], [values[-1]],
+                                          [percentile_75 - percentile_25], [len(values)])
+        histogram = grouped_histograms(values, counts, np.zeros(len(values), dtype=np.intp),
+                                       bin_counts, [values[0]], [values[-1]])[0]
+
+    result = {
+        'min': values[0],
+        'max': values[-1],
+        'average': average,
+        'percentile_25': percentile_25,
+        'percentile_50': percentile_50,
+        'percentile_75': percentile_75,
+        'sum': total_sum,
+        'percent_of_total': (total_sum / grand_total * 100) if grand_total != 0 else 0,
+        'count': total_count,
+        'frequency': frequency_data,
+        'histogram': histogram
+    }
+
+    return result
+
+
+def summarize_qualitative(data) -> FrequencyTable:
+    """
+    Frequency table of the labels of a column.
+    Most frequent first, ties in order of appearance.
+    """
+    with stage('encode_labels', rows=len(data)):
+        codes, labels = encode_labels(data)
+    return summarize_label_codes(codes, labels)
+
+
+def encode_labels(data: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Dictionary encoding of a column: an integer code per row (-1 where the
+    value is missing) and the label of every code. Category columns are
+    encoded already and are not hashed again.
+    """
+    if isinstance(data.dtype, pd.CategoricalDtype):
+        codes, labels = data.cat.codes.to_numpy(), data.cat.categories
+    else:
+        codes, labels = pd.factorize(data)
+    return codes, np.array([str(label) for label in labels], dtype=object)
+
+
+def summarize_label_codes(codes: np.ndarray, labels: np.ndarray) -> FrequencyTable:
+    """
+    Frequency table of a dictionary-encoded column (see encode_labels).
+    Most frequent first, ties in order of appearance; labels that never
+    occur are left out.
+    """
+    with stage('value_counts', rows=len(codes)):
+        counts = np.bincount(codes[codes >= 0], minlength=len(labels))
+        first = first_occurrences(codes, len(labels))
+    with stage('frequency_tables'):
+        observed = np.flatnonzero(counts)
+        observed = observed[np.argsort(first[observed], kind='stable')]
+        return summarize_label_counts(labels[observed], counts[observed])
+
+
+def first_occurrences(codes: np.ndarray, n_codes: int) -> np.ndarray:
+    """Position of the first occurrence of every code (len(codes) if it never occurs)."""
+    first = np.full(n_codes, len(codes), dtype=np.int64)
+    valid = np.flatnonzero(codes >= 0)
+    np.minimum.at(first, codes[valid], valid)
+    return first
+
+
+def summarize_label_counts(uniques, counts: np.ndarray) -> FrequencyTable:
+    """
+    Frequency table from distinct labels (in order of first appearance)
+    and their counts. Most frequent first, ties in order of appearance.
+    """
+    order = np.argsort(-counts, kind='stable')
+    total_count = int(counts.sum())
+
+    labels = np.array([str(label) for label in uniques], dtype=object)
+    counts = counts[order]
+
+    return FrequencyTable({
+        'label': labels[order],
+        'frequency': counts,
+        'percentage': counts / total_count * 100 if total_count > 0 else np.zeros(len(counts))
+    })
+
+
+def grouped_linear_quantile(sorted_values: np.ndarray, starts: np.ndarray,
+                            counts: np.ndarray, q: float) -> np.ndarray:
+    """
+    Quantile of every group slice of a (group, value)-sorted array.
+    Uses the same linear interpolation as Series.quantile (numpy 'linear').
+    """
+    result = np.full(len(counts), np.nan)
+    present = counts > 0
+    if not present.any():
+        return result
+
+    virtual = (counts[present] - 1) * q
+    previous = np.floor(virtual)
+    gamma = virtual - previous
+    previous = previous.astype(np.intp)
+    following = np.minimum(previous + 1, counts[present] - 1)
+
+    values = sorted_values.astype(np.float64)
+    a = values[starts[present] + previous]
+    b = values[starts[present] + following]
+    result[present] = _lerp(a, b, gamma)
+    return result
+
+
+def quantiles_from_counts(values: np.ndarray, counts: np.ndarray, qs: List[float]) -> np.ndarray:
+    """
+    Exact quantiles of a column from its sorted distinct values and their
+    counts, with the same linear interpolation as Series.quantile.
+    """
+    cumulative = np.cumsum(counts)
+    virtual = (cumulative[-1] - 1) * np.asarray(qs, dtype=np.float64)
+    previous = np.floor(virtual)
+    gamma = virtual - previous
+    following = np.minimum(previous + 1, cumulative[-1] - 1)
+
+    values = values.astype(np.float64)
+    a = values[np.searchsorted(cumulative, previous, side='right')]
+    b = values[np.searchsorted(cumulative, following, side='right')]
+    return _lerp(a, b, gamma)
+
+
+def histogram_bin_counts(bins, counts, minimums, maximums, iqrs, distinct) -> np.ndarray:
+    """
+    Number of histogram bins of every group (or of a single column, as
+    one-element sequences) for a bin strategy or a fixed bin count. Groups
+    without values get no bins.
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    if isinstance(bins, str):
+        sturges = np.ceil(np.log2(np.maximum(counts, 1))) + 1
+        if bins == 'sturges':
+            estimate = sturges
+        elif bins == 'fd':
+            spans = np.asarray(maximums, dtype=np.float64) - np.asarray(minimums, dtype=np.float64)
+            widths = 2 * np.asarray(iqrs, dtype=np.float64) * np.maximum(counts, 1) ** (-1 / 3)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                estimate = np.ceil(spans / widths)
+            # A zero IQR says nothing about the spread; use Sturges instead
+            estimate = np.where(widths > 0, estimate, sturges)
+        else:
+            raise ValueError(f"Unknown histogram bin strategy '{bins}'")
+        estimate = np.minimum(estimate, MAX_HISTOGRAM_BINS)
+    else:
+        if int(bins) < 1:
+            raise ValueError("Histograms need at least one bin")
+        estimate = np.full(len(counts), int(bins), dtype=np.float64)
+
+    estimate = np.minimum(np.nan_to_num(estimate, nan=1), np.asarray(distinct, dtype=np.float64))
+    return np.where(counts > 0, np.maximum(estimate, 1), 0).astype(np.intp)
+
+
+def grouped_histograms(values: np.ndarray, counts: np.ndarray, codes: np.ndarray, bin_counts: np.ndarray,
+                       minimums, maximums) -> List[Dict[str, np.ndarray]]:
+    """
+    Fixed-width histograms of every group in one pass over its distinct
+    values (sorted by group), each counted counts times. Bins are the same
+    as np.histogram's: half-open, the last one closed. Returns one
+    {'edges', 'counts'} dict per group, None for groups without bins.
+    """
+    minimums = np.asarray(minimums, dtype=np.float64)
+    maximums = np.asarray(maximums, dtype=np.float64)
+    bin_counts = np.asarray(bin_counts, dtype=np.intp)
+    # Columns holding +-inf have no finite range to bin
+    present = (bin_counts > 0) & np.isfinite(minimums) & np.isfinite(maximums)
+
+    # A single value gets a unit-wide bin around it, as in np.histogram
+    flat = present & (minimums == maximums)
+    lows = np.where(flat, minimums - 0.5, minimums)
+    highs = np.where(flat, maximums + 0.5, maximums)
+    # From 2**53 on the half unit rounds away; widen to the neighbouring floats
+    degenerate = flat & (lows == highs)
+    with np.errstate(over='ignore', invalid='ignore'):
+        lows = np.where(degenerate, np.nextafter(minimums, -np.inf), lows)
+        highs = np.where(degenerate, np.nextafter(maximums, np.inf), highs)
+        widths = highs - lows
+
+    edges = [
+        np.linspace(lows[code], highs[code], bin_counts[code] + 1) if present[code] else None
+        for code in range(len(bin_counts))
+    ]
+    bin_offsets = np.concatenate(([0], np.cumsum(np.where(present, bin_counts, 0))))
+    edge_offsets = bin_offsets[:-1] + np.concatenate(([0], np.cumsum(present)[:-1]))
+    all_edges = np.concatenate([e for e in edges if e is not None] or [np.empty(0)])
+
+    # Bin of every value within its group, corrected against the actual
+    # edges the same way np.histogram does
+    keep = present[codes]
+    codes = codes[keep]
+    group_bins = bin_counts[codes]
+    x = values[keep].astype(np.float64)
+    group_widths = widths[codes]
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        positions = (x - lows[codes]) / group_widths * group_bins
+    # Without a usable width every value falls in the first bin
+    positions = np.where(np.isfinite(positions) & (group_widths > 0), positions, 0)
+    indices = np.clip(positions.astype(np.intp), 0, group_bins - 1)
+    first_edges = edge_offsets[codes]
+    indices[x < all_edges[first_edges + indices]] -= 1
+    indices[(x >= all_edges[first_edges + indices + 1]) & (indices != group_bins - 1)] += 1
+
+    totals = np.bincount(bin_offsets[codes] + indices, weights=counts[keep], minlength=bin_offsets[-1])
+    totals = np.rint(totals).astype(np.int64)
+
+    return [
+        {'edges': edges[code], 'counts': totals[bin_offsets[code]:bin_offsets[code + 1]]} if present[code] else None
+        for code in range(len(bin_counts))
+    ]
+
+
+def _lerp(a: np.ndarray, b: np.ndarray, gamma: np.ndarray) -> np.ndarray:
+    """Linear interpolation between a and b, computed the way numpy does."""
+    diff = b - a
+    interpolated = a + diff * gamma
+    np.subtract(b, diff * (1 - gamma), out=interpolated, where=gamma >= 0.5)
+    return interpolated
@@ -0,0 +1,75 @@
+import pandas as pd
+from typing import Dict, List
+
+
+# Types a column can be loaded as; 'auto' keeps pandas' inference
+COLUMN_TYPES = ('auto', 'number', 'text', 'category')
+
+# Text columns whose distinct values make up at most this share of their
+# non-empty values are stored as category
+DEFAULT_CATEGORY_RATIO = 0.5
+
+
+def apply_column_types(df: pd.DataFrame, column_types: Dict[str, str] = None,
+                       category_ratio: float = DEFAULT_CATEGORY_RATIO) -> pd.DataFrame:
+    """
+    Convert the columns of a freshly loaded sheet.
+
+    column_types maps columns to 'number' (non-numeric values become
+    empty), 'text', 'category' or 'auto'. Other columns are 'auto': those
+    holding only strings become category when they have few distinct
+    values (see category_ratio; None turns this off). Returns a new
+    DataFrame sharing the unconverted columns with df.
+    """
+    column_types = column_types or {}
+    unknown = set(column_types.values()).difference(COLUMN_TYPES)
+    if unknown:
+        raise ValueError(f"Column types must be one of {COLUMN_TYPES}, not {sorted(unknown)}")
+    missing = [column for column in column_types if column not in df.columns]
+    if missing:
+        raise ValueError(f"Columns not found: {', '.join(map(str, missing))}")
+
+    converted = {}
+    for position, column in enumerate(df.columns):
+        series = df.iloc[:, position]
+        column_type = column_types.get(column, 'auto')
+        if column_type == 'number':
+            converted[position] = pd.to_numeric(series, errors='coerce')
+        elif column_type == 'text':
+            if series.dtype != object or pd.api.types.infer_dtype(series, skipna=True) != 'string':
+                converted[position] = series.astype(str).where(series.notna())
+        elif column_type == 'category':
+            if not isinstance(series.dtype, pd.CategoricalDtype):
+                converted[position] = series.astype('category')
+        elif category_ratio is not None and series.dtype == object:
+            category = _as_category(series, category_ratio)
+            if category is not None:
+                converted[position] = category
+
+    if not converted:
+        return df
+    df = df.copy(deep=False)
+    for position, series in converted.items():
+        df.isetitem(position, series)
+    return df
+
+
+def _as_category(series: pd.Series, category_ratio: float) -> pd.Series:
+    """A string column as a category with sorted categories, or None if it has too many values."""
+    if pd.api.types.infer_dtype(series, skipna=True) != 'string':
+        return None
+    codes, categories = pd.factorize(series, sort=True)
+    if len(categories) > category_ratio * max(int((codes >= 0).sum()), 1):
+        return None
+    return pd.Series(pd.Categorical.from_codes(codes, categories), index=series.index, name=series.name)
+
+
+def select_columns(columns: List[str], available: List[str]) -> List[str]:
+    """The requested columns in sheet order; raises ValueError for unknown ones."""
+    if columns is None:
+        return list(available)
+    missing = [column for column in columns if column not in available]
+    if missing:
+        raise ValueError(f"Columns not found: {', '.join(map(str, missing))}")
+    wanted = set(columns)
+    return [column for column in available if column in wanted]
@@ -1,22 +1,148 @@
+import numpy as np
 import pandas as pd
 from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.cell import Cell
+from openpyxl.cell.cell import TIME_FORMATS
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
 from openpyxl.chart import BarChart, PieChart, LineChart, Reference, ScatterChart, Series
 from openpyxl.chart.marker import Marker
+from openpyxl.chart.reference import DummyWorksheet
+from openpyxl.packaging.manifest import Manifest, Override
+from openpyxl.packaging.relationship import Relationship, RelationshipList
+from openpyxl.packaging.workbook import ChildSheet, WorkbookPackage
 from openpyxl.utils import get_column_letter
-from typing import Dict, Any, List
+from openpyxl.workbook.child import avoid_duplicate_name
+from openpyxl.worksheet.worksheet import Worksheet
+from openpyxl.xml.constants import ARC_CORE, ARC_WORKBOOK, ARC_WORKBOOK_RELS
+from openpyxl.xml.functions import fromstring, tostring
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, List, Callable, Iterator
+from frequency_table import FrequencyTable
+from profiling import Profiler, profiled, activated, stage, is_active, merge_records
+from copy import copy
+from datetime import datetime, timezone
+import io
+import os
 import re
+import tempfile
+import zipfile
+
+
+# Called as progress(done, total, sheet_name) after every column sheet
+ExportProgressCallback = Callable[[int, int, str], None]
+
+# Named styles used by the report, registered once per workbook. Cells
+# refer to a style by name, which copies its precomputed style ids instead
+# of creating and deduplicating Font/PatternFill objects for every cell.
+TITLE_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+HEADER_FILL = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
+
+PAGE_TITLE_STYLE = "DataLens Page Title"
+SHEET_TITLE_STYLE = "DataLens Sheet Title"
+SECTION_STYLE = "DataLens Section"
+HEADER_STYLE = "DataLens Table Header"
+LABEL_STYLE = "DataLens Label"
+CHART_LABEL_STYLE = "DataLens Chart Label"
+NOTE_STYLE = "DataLens Note"
+LINK_STYLE = "DataLens Link"
+DECIMAL_STYLE = "DataLens Decimal"
+PERCENT_STYLE = "DataLens Percent"
+
+STYLE_REGISTRY = {
+    PAGE_TITLE_STYLE: {'font': Font(bold=True, size=16, color="FFFFFF"), 'fill': TITLE_FILL},
+    SHEET_TITLE_STYLE: {'font': Font(bold=True, size=14, color="FFFFFF"), 'fill': TITLE_FILL},
+    SECTION_STYLE: {'font': Font(bold=True, size=12)},
+    HEADER_STYLE: {'font': Font(bold=True), 'fill': HEADER_FILL},
+    LABEL_STYLE: {'font': Font(bold=True)},
+    CHART_LABEL_STYLE: {'font': Font(bold=True, size=10)},
+    NOTE_STYLE: {'font': Font(size=11)},
+    LINK_STYLE: {'font': Font(color="0563C1", underline="single")},
+    # Numbers stay numbers; only their display is formatted. Percentages
+    # are stored as fractions (12.5% as 0.125), as Excel expects.
+    DECIMAL_STYLE: {'number_format': '0.00'},
+    PERCENT_STYLE: {'number_format': '0.00%'},
+}
+
+
+# Quantitative columns whose charts go on the Visualizations sheet, by
+# default, and the measures they can be ranked by
+DEFAULT_CHART_BUDGET = 50
+CHART_RANKINGS = {'variance': "variance", 'count': "number of values"}
+
+# Quantitative charts are drawn from the column's histogram bins, written
+# beside the frequency table from BIN_COLUMN onwards (right of the charts)
+BIN_COLUMN = 32  # AF
+
+# Parallel grouped exports render this many column sheets per task. The
+# chunking does not depend on the worker count, so neither does the file.
+PARTS_CHUNK_SHEETS = 25
+
+# Numbered package parts of a rendered chunk, and the rels targets naming them
+PART_NAME_RE = re.compile(r'^(xl/(?:worksheets|drawings|charts)/(?:_rels/)?)(sheet|drawing|chart)(\d+)(\.xml(?:\.rels)?)$')
+PART_TARGET_RE = re.compile(r'(/xl/(?:drawings/|charts/))(drawing|chart)(\d+)(\.xml)')
+
+
+class ExportCancelled(Exception):
+    """Raised when an export is stopped through its cancel_event."""
 
 
 class ExcelExporter:
-    """Export analysis results to Excel with visualizations and hyperlinks."""
-
-    def __init__(self, results: Dict, group_column: str = None):
+    """
+    Export analysis results to Excel with visualizations and hyperlinks.
+
+    Every sheet is laid out top to bottom, one row at a time. With
+    write_only=True the workbook is an openpyxl write-only workbook: each
+    row is streamed to disk as soon as it is produced, so memory no longer
+    grows with the number of sheets and frequency rows. The resulting
+    files are the same in both modes.
+
+    Every quantitative column sheet has its own charts, but the
+    Visualizations overview only repeats them for chart_budget columns
+    (None for all): those ranked highest by chart_rank, 'variance' or
+    'count'.
+    """
+
+    def __init__(self, results: Dict, group_column: str = None, write_only: bool = False,
+                 chart_budget: int = DEFAULT_CHART_BUDGET, chart_rank: str = 'variance',
+                 profiler: Profiler = None, timestamp: datetime = None):
+        if chart_rank not in CHART_RANKINGS:
+            raise ValueError(f"chart_rank must be one of {', '.join(CHART_RANKINGS)}")
         self.results = results
         self.group_column = group_column
-        self.wb = Workbook()
-        self.wb.remove(self.wb.active)  # Remove default sheet
+        self.write_only = write_only
+        self.chart_budget = chart_budget
+        self.chart_rank = chart_rank
+        # Optional Profiler recording the stages of the export
+        self.profiler = profiler
+        # Created/modified time of grouped exports (default: when the export starts)
+        self.timestamp = timestamp
+        self.wb = Workbook(write_only=write_only)
+        if not write_only:
+            self.wb.remove(self.wb.active)  # Remove default sheet
+        self._register_styles()
         self.viz_charts = []  # Store charts to add to visualization sheet
+        self._charted_columns = 0  # Quantitative columns with charts, see _select_overview_columns
+
+    def _register_styles(self):
+        """
+        Register the named styles, plus the cell formats of the named styles
+        and of date/time values. Cell formats are otherwise numbered in order
+        of first use; registering them up front gives every workbook the same
+        styles part, which parallel exports rely on.
+        """
+        # Cells of a worksheet that is never added to the workbook register
+        # their formats with it when asked for their style_id
+        scratch = Worksheet(self.wb)
+        self._style_arrays = {}
+        for name, attributes in STYLE_REGISTRY.items():
+            style = NamedStyle(name=name, **attributes)
+            self.wb.add_named_style(style)
+            self._style_arrays[name] = style.as_tuple()
+            Cell(scratch, style_array=copy(self._style_arrays[name])).style_id
+        for number_format in TIME_FORMATS.values():
+            cell = Cell(scratch)
+            cell.number_format = number_format
+            cell.style_id
 
     def create_safe_sheet_name(self, name: str) -> str:
         """Create a safe sheet name (max 31 chars, no invalid characters)."""
@@ -27,349 +153,678 @@ class ExcelExporter:
             safe_name = safe_name[:31]
         return safe_name
 
-    def export_ungrouped(self, output_path: str):
-        """Export ungrouped analysis results."""
-        # Create index sheet
+    @profiled('export_ungrouped')
+    def export_ungrouped(self, output_path: str, progress: ExportProgressCallback = None,
+                         cancel_event=None):
+        """
+        Export ungrouped analysis results.
+
+        progress is called after each column sheet. Setting cancel_event (a
+        threading.Event) stops the export with ExportCancelled; the file at
+        output_path is only replaced once the whole workbook has been saved.
+        """
+        # The index and visualization sheets go first but are filled in last,
+        # once every column sheet (and chart) exists
         index_ws = self.wb.create_sheet("Index", 0)
-        self._format_index_sheet(index_ws)
-
-        # Create visualization overview sheet
         viz_ws = self.wb.create_sheet("Visualizations", 1)
 
-        row_idx = 2
+        index_entries = []
+        total = len(self.results)
+        overview = self._select_overview_columns(
+            (column_name, column_data['data']) for column_name, column_data in self.results.items()
+            if column_data['type'] == 'quantitative')
 
         # Create a sheet for each column
         for idx, (column_name, column_data) in enumerate(self.results.items(), start=2):
+            _check_cancelled(cancel_event)
             sheet_name = self.create_safe_sheet_name(column_name)
             ws = self.wb.create_sheet(sheet_name, idx)
-
-            # Add to index with hyperlink
-            index_ws.cell(row=row_idx, column=1, value=row_idx - 1)
-            index_ws.cell(row=row_idx, column=2, value=column_name)
-            index_ws.cell(row=row_idx, column=3, value=column_data['type'].upper())
-
-            # Create hyperlink
-            index_ws.cell(row=row_idx, column=4, value="Go to Sheet")
-            index_ws.cell(row=row_idx, column=4).hyperlink = f"#{sheet_name}!A1"
-            index_ws.cell(row=row_idx, column=4).font = Font(color="0563C1", underline="single")
-
-            row_idx += 1
+            index_entries.append((column_name, column_data['type'], sheet_name))
 
             # Fill the column sheet and collect charts for visualization sheet
-            if column_data['type'] == 'quantitative':
-                self._create_quantitative_sheet(ws, column_name, column_data['data'], sheet_name)
-            else:
-                self._create_qualitative_sheet(ws, column_name, column_data['data'])
+            with stage('sheet', column=column_name, rows=len(_frequency_table(column_data))):
+                if column_data['type'] == 'quantitative':
+                    self._create_quantitative_sheet(ws, column_name, column_data['data'],
+                                                    sheet_name if column_name in overview else None)
+                else:
+                    self._create_qualitative_sheet(ws, column_name, column_data['data'])
+                self._finish_sheet(ws)
 
-        # Now add all collected charts to visualization sheet
-        self._populate_viz_overview(viz_ws)
+            if progress:
+                progress(idx - 1, total, sheet_name)
 
-        # Save workbook
-        self.wb.save(output_path)
+        with stage('index_sheet'):
+            self._create_index_sheet(index_ws, index_entries)
+        with stage('overview_sheet'):
+            self._populate_viz_overview(viz_ws, self._overview_note(overview))
 
-    def export_grouped(self, output_path: str):
-        """Export grouped analysis results."""
-        # Create index sheet
+        # Save workbook
+        self._save(output_path, cancel_event)
+
+    @profiled('export_grouped')
+    def export_grouped(self, output_path: str, progress: ExportProgressCallback = None,
+                       cancel_event=None, workers: int = 1):
+        """
+        Export grouped analysis results.
+        progress and cancel_event work as in export_ungrouped.
+
+        The sheets are rendered in chunks and assembled into one package,
+        in a process pool with workers > 1 (or None for one per CPU). The
+        file is the same, byte for byte, for any number of workers; every
+        part is stamped with one time, taken when the export starts unless
+        the exporter was given a timestamp.
+        """
+        self._export_grouped_parallel(output_path, workers or os.cpu_count() or 1, progress, cancel_event)
+
+    def _export_grouped_parallel(self, output_path: str, workers: int,
+                                 progress: ExportProgressCallback = None, cancel_event=None):
+        """
+        Export grouped results with the sheets rendered in worker processes
+        (see export_grouped).
+
+        Sheet titles are settled up front. Workers render the visualization
+        overview and fixed-size chunks of column sheets into small standalone
+        packages, while this workbook only gets the index sheet. _save_parts
+        then renumbers the rendered parts into one package. Charts and
+        hyperlinks refer to sheets by title, so they resolve unchanged.
+        """
+        # openpyxl keeps these times as naive UTC
+        started = self.timestamp or datetime.now(timezone.utc).replace(tzinfo=None)
+        self.wb.properties.created = self.wb.properties.modified = started
         index_ws = self.wb.create_sheet("Index", 0)
-        self._format_index_sheet_grouped(index_ws)
-
-        # Create visualization overview sheet
-        viz_ws = self.wb.create_sheet("Visualizations", 1)
-
-        row_idx = 2
-        sheet_idx = 2
+        titles = ["Index", "Visualizations"]
+        taken = {title.lower() for title in titles}
 
-        # Create sheets for each group
+        index_groups = []
+        column_sheets = []
+        overview_charts = []
+        overview = self._select_overview_columns(self._grouped_quantitative_columns())
         for group_name, group_data in self.results.items():
-            # Add group header to index
-            index_ws.cell(row=row_idx, column=1, value=f"GROUP: {group_name}")
-            index_ws.cell(row=row_idx, column=1).font = Font(bold=True, size=12)
-            row_idx += 1
-
-            # Process each column in the group
+            index_entries = []
+            index_groups.append((group_name, index_entries))
             for column_name, column_data in group_data['columns'].items():
                 sheet_name = self.create_safe_sheet_name(f"{group_name}_{column_name}")
-                ws = self.wb.create_sheet(sheet_name, sheet_idx)
-                sheet_idx += 1
-
-                # Add to index
-                index_ws.cell(row=row_idx, column=1, value=column_name)
-                index_ws.cell(row=row_idx, column=2, value=column_data['type'].upper())
-                index_ws.cell(row=row_idx, column=3, value="Go to Sheet")
-                index_ws.cell(row=row_idx, column=3).hyperlink = f"#{sheet_name}!A1"
-                index_ws.cell(row=row_idx, column=3).font = Font(color="0563C1", underline="single")
-
-                row_idx += 1
-
-                # Fill the sheet
+                index_entries.append((column_name, column_data['type'], sheet_name))
+
+                # Deduplicate the way openpyxl titles a new sheet
+                sheet_title = sheet_name
+                if sheet_title.lower() in taken:
+                    sheet_title = avoid_duplicate_name(titles, sheet_title)
+                titles.append(sheet_title)
+                taken.add(sheet_title.lower())
+
+                title = f"{group_name} - {column_name}"
+                column_sheets.append((sheet_title, title, column_data, group_name, column_name))
+                if (group_name, column_name) in overview:
+                    overview_charts.append((sheet_title, title, self._chart_source(column_data['data'])))
+
+        with stage('index_sheet'):
+            self._create_index_sheet_grouped(index_ws, index_groups)
+            self._finish_sheet(index_ws)
+
+        # Sheet parts are numbered by workbook position: Index is sheet1.xml,
+        # Visualizations sheet2.xml and the column sheets follow
+        # Workers record their own stages when this export is being profiled
+        profile_tasks = is_active()
+        tasks = [{
+            'first_sheet': 2,
+            'overview': "Visualizations",
+            'charts': overview_charts,
+            'note': self._overview_note(overview),
+            'profile': profile_tasks
+        }]
+        for start in range(0, len(column_sheets), PARTS_CHUNK_SHEETS):
+            tasks.append({
+                'first_sheet': 3 + start,
+                'group_column': self.group_column,
+                'sheets': column_sheets[start:start + PARTS_CHUNK_SHEETS],
+                'profile': profile_tasks
+            })
+
+        total = len(column_sheets)
+        packages = [None] * len(tasks)
+        done = 0
+
+        def task_finished(i, spans):
+            nonlocal done
+            if spans:
+                merge_records(spans)
+            sheets = tasks[i].get('sheets')
+            if sheets:
+                done += len(sheets)
+                if progress:
+                    progress(done, total, sheets[-1][0])
+
+        workers = min(workers, len(tasks))
+        with stage('render_sheets'):
+            if workers == 1:
+                for i, task in enumerate(tasks):
+                    _check_cancelled(cancel_event)
+                    packages[i], spans = _render_sheets_task(task)
+                    task_finished(i, spans)
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    futures = {executor.submit(_render_sheets_task, task): i for i, task in enumerate(tasks)}
+                    try:
+                        for future in as_completed(futures):
+                            _check_cancelled(cancel_event)
+                            i = futures[future]
+                            packages[i], spans = future.result()
+                            task_finished(i, spans)
+                    except BaseException:
+                        executor.shutdown(wait=True, cancel_futures=True)
+                        raise
+
+        rendered = [(task['first_sheet'], package) for task, package in zip(tasks, packages)]
+        with stage('assemble_package'):
+            self._save_parts(output_path, rendered, titles[1:], cancel_event)
+
+    def _save_parts(self, output_path: str, rendered: List[tuple], titles: List[str], cancel_event=None):
+        """
+        Save this workbook together with sheets rendered elsewhere.
+
+        rendered holds (first sheet number, package bytes) pairs and titles
+        the titles of the rendered sheets, both in workbook order after this
+        workbook's own sheets. The sheet list, relationships and content
+        types are extended to cover the rendered parts. The file is written
+        atomically like _save, with every entry stamped with the workbook's
+        modified time, so the same results and properties give the same bytes.
+        """
+        _check_cancelled(cancel_event)
+
+        # Saving stamps the current time into the properties; keep ours
+        modified = self.wb.properties.modified
+        main_buffer = io.BytesIO()
+        self.wb.save(main_buffer)
+        self.wb.properties.modified = modified
+        # ZIP entries carry local time, like those written by wb.save
+        local_time = modified.replace(tzinfo=timezone.utc).astimezone()
+        date_time = max(local_time.timetuple()[:6], (1980, 1, 1, 0, 0, 0))
+
+        with zipfile.ZipFile(main_buffer) as main_package:
+            styles = main_package.read('xl/styles.xml')
+            manifest = Manifest.from_tree(fromstring(main_package.read(Manifest.path)))
+            workbook = WorkbookPackage.from_tree(fromstring(main_package.read(ARC_WORKBOOK)))
+            workbook_rels = RelationshipList.from_tree(fromstring(main_package.read(ARC_WORKBOOK_RELS)))
+
+            # Renumber each package's parts after the ones before it
+            parts = []
+            drawings = charts = 0
+            for first_sheet, package in rendered:
+                _check_cancelled(cancel_event)
+                with zipfile.ZipFile(io.BytesIO(package)) as chunk:
+                    if chunk.read('xl/styles.xml') != styles:
+                        raise Exception("Rendered sheets do not share the workbook's styles")
+                    offsets = {'sheet': first_sheet - 1, 'drawing': drawings, 'chart': charts}
+
+                    def renumber(match):
+                        prefix, kind, number, suffix = match.groups()
+                        return f"{prefix}{kind}{offsets[kind] + int(number)}{suffix}"
+
+                    for name in chunk.namelist():
+                        if not PART_NAME_RE.match(name):
+                            continue
+                        data = chunk.read(name)
+                        if name.endswith('.rels'):
+                            data = PART_TARGET_RE.sub(renumber, data.decode('utf-8')).encode('utf-8')
+                        parts.append((PART_NAME_RE.sub(renumber, name), data))
+
+                    for override in Manifest.from_tree(fromstring(chunk.read(Manifest.path))).Override:
+                        part_name = override.PartName.lstrip('/')
+                        if PART_NAME_RE.match(part_name):
+                            manifest.Override.append(Override(PartName='/' + PART_NAME_RE.sub(renumber, part_name),
+                                                              ContentType=override.ContentType))
+
+                    drawings += sum(1 for name in chunk.namelist() if name.startswith('xl/drawings/drawing'))
+                    charts += sum(1 for name in chunk.namelist() if name.startswith('xl/charts/chart'))
+
+            # Rendered sheets follow this workbook's sheets; the other workbook
+            # relationships (styles, theme) move behind them
+            sheet_rels = [rel for rel in workbook_rels.Relationship if rel.Type.endswith('/worksheet')]
+            other_rels = [rel for rel in workbook_rels.Relationship if not rel.Type.endswith('/worksheet')]
+            sheets = list(workbook.sheets)
+            for number, title in enumerate(titles, len(sheets) + 1):
+                sheets.append(ChildSheet(name=title, sheetId=number, id=f"rId{number}"))
+                sheet_rels.append(Relationship(type='worksheet', Target=f"/xl/worksheets/sheet{number}.xml",
+                                               Id=f"rId{number}"))
+            for number, rel in enumerate(other_rels, len(sheet_rels) + 1):
+                rel.Id = f"rId{number}"
+            workbook.sheets = sheets
+            workbook_rels = RelationshipList(Relationship=sheet_rels + other_rels)
+
+            regenerated = {
+                Manifest.path: tostring(manifest.to_tree()),
+                ARC_WORKBOOK: tostring(workbook.to_tree()),
+                ARC_WORKBOOK_RELS: tostring(workbook_rels.to_tree()),
+                ARC_CORE: tostring(self.wb.properties.to_tree()),
+            }
+
+            directory = os.path.dirname(os.path.abspath(output_path))
+            fd, temp_path = tempfile.mkstemp(suffix='.xlsx.tmp', dir=directory)
+            os.close(fd)
+            try:
+                with zipfile.ZipFile(temp_path, 'w', zipfile.ZIP_DEFLATED) as package:
+                    def write(name, data):
+                        package.writestr(zipfile.ZipInfo(name, date_time), data, zipfile.ZIP_DEFLATED)
+
+                    for name in main_package.namelist():
+                        if name not in regenerated:
+                            write(name, main_package.read(name))
+                    for name, data in parts:
+                        write(name, data)
+                    for name, data in regenerated.items():
+                        write(name, data)
+                _check_cancelled(cancel_event)
+                os.replace(temp_path, output_path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+
+    def _save(self, output_path: str, cancel_event=None):
+        """
+        Save the workbook to a temporary file next to output_path and move it
+        into place only when saving succeeded, so a failed or cancelled export
+        never leaves a half-written file behind.
+        """
+        _check_cancelled(cancel_event)
+        directory = os.path.dirname(os.path.abspath(output_path))
+        fd, temp_path = tempfile.mkstemp(suffix='.xlsx.tmp', dir=directory)
+        os.close(fd)
+        try:
+            with stage('save'):
+                self.wb.save(temp_path)
+            _check_cancelled(cancel_event)
+            os.replace(temp_path, output_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _cell(self, ws, value, style: str = None, hyperlink: str = None) -> Cell:
+        """A cell with one of the registered named styles, to be placed by _append_rows."""
+        # style_array gives what cell.style = style does, minus looking the style up by name
+        style_array = copy(self._style_arrays[style]) if style is not None else None
+        cell = Cell(ws, row=1, column=1, value=value, style_array=style_array)
+        if hyperlink is not None:
+            cell.hyperlink = hyperlink
+        return cell
+
+    def _append_rows(self, ws, rows):
+        """Append rows (lists of values or cells, None for an empty cell) to a sheet."""
+        for row in rows:
+            ws.append(row)
+            if not self.write_only:
+                # Write-only sheets point hyperlinks at their cell on append
+                for cell in row:
+                    if isinstance(cell, Cell) and cell.hyperlink is not None:
+                        cell.hyperlink.ref = cell.coordinate
+
+    def _finish_sheet(self, ws):
+        """
+        Flush a completed sheet. A write-only sheet keeps an open XML writer
+        until it is closed, so sheets are closed as soon as they are done
+        rather than all at once in wb.save.
+        """
+        if self.write_only:
+            ws.close()
+
+    def _merge_cells(self, ws, cell_range: str):
+        """
+        Merge a range of cells in either kind of worksheet. The range is
+        registered directly: the merged title cells have no borders, so
+        ws.merge_cells' per-range border restyling is not needed.
+        """
+        ws.merged_cells.add(cell_range)
+
+    def _set_column_widths(self, ws, widths: Dict[str, float]):
+        """Set column widths (before any row is written, as write-only sheets require)."""
+        for column, width in widths.items():
+            ws.column_dimensions[column].width = width
+
+    def _create_index_sheet(self, ws, entries: List[tuple]):
+        """Fill the index sheet with a linked row per (column name, type, sheet name)."""
+        self._set_column_widths(ws, {'A': 8, 'B': 40, 'C': 20, 'D': 15})
+
+        rows = [
+            [self._cell(ws, "Excel Analysis Results - Column Index", PAGE_TITLE_STYLE)],
+            [self._cell(ws, header, HEADER_STYLE) for header in ["#", "Column Name", "Type", "Link"]]
+        ]
+        for number, (column_name, column_type, sheet_name) in enumerate(entries, start=1):
+            rows.append([
+                number,
+                column_name,
+                column_type.upper(),
+                self._cell(ws, "Go to Sheet", LINK_STYLE, hyperlink=f"#{sheet_name}!A1")
+            ])
+
+        self._append_rows(ws, rows)
+        self._merge_cells(ws, 'A1:D1')
+
+    def _create_index_sheet_grouped(self, ws, groups: List[tuple]):
+        """Fill the index sheet for grouped results: a header per group, then its columns."""
+        self._set_column_widths(ws, {'A': 50, 'B': 20, 'C': 15})
+
+        def rows():
+            yield [self._cell(ws, f"Excel Analysis Results - Grouped by {self.group_column}",
+                              PAGE_TITLE_STYLE)]
+            for group_name, entries in groups:
+                yield [self._cell(ws, f"GROUP: {group_name}", SECTION_STYLE)]
+                for column_name, column_type, sheet_name in entries:
+                    yield [
+                        column_name,
+                        column_type.upper(),
+                        self._cell(ws, "Go to Sheet", LINK_STYLE, hyperlink=f"#{sheet_name}!A1")
+                    ]
+                yield []  # Spacing between groups
+
+        self._append_rows(ws, rows())
+        self._merge_cells(ws, 'A1:C1')
+
+    def _grouped_quantitative_columns(self) -> Iterator[tuple]:
+        """((group, column), data) for every quantitative column of grouped results."""
+        for group_name, group_data in self.results.items():
+            for column_name, column_data in group_data['columns'].items():
                 if column_data['type'] == 'quantitative':
-                    self._create_quantitative_sheet(ws, f"{group_name} - {column_name}", column_data['data'], sheet_name)
-                else:
-                    self._create_qualitative_sheet(ws, f"{group_name} - {column_name}", column_data['data'])
+                    yield (group_name, column_name), column_data['data']
+
+    def _select_overview_columns(self, columns) -> set:
+        """
+        Keys of the quantitative columns whose charts go on the overview:
+        all chartable ones, or the chart_budget ranked highest by chart_rank
+        (ties keep workbook order).
+        """
+        charted = [(key, data) for key, data in columns if self._chart_source(data)]
+        self._charted_columns = len(charted)
+        if self.chart_budget is None or len(charted) <= self.chart_budget:
+            return {key for key, data in charted}
+
+        if self.chart_rank == 'variance':
+            scores = [_variance(data['frequency']) for key, data in charted]
+        else:
+            scores = [data['count'] for key, data in charted]
+        ranked = sorted(range(len(charted)), key=lambda i: -scores[i])
+        return {charted[i][0] for i in ranked[:self.chart_budget]}
+
+    def _overview_note(self, overview: set) -> str:
+        """The note above the overview charts, saying whether any were left out."""
+        if len(overview) == self._charted_columns:
+            return "This sheet contains visualizations for all quantitative columns."
+        return (f"This sheet shows the {len(overview)} of {self._charted_columns} quantitative columns with the "
+                f"highest {CHART_RANKINGS[self.chart_rank]}. Every column sheet has its own charts.")
+
+    def _populate_viz_overview(self, ws, note: str):
+        """Populate the visualization overview sheet with charts."""
+        ws.column_dimensions['A'].width = 2
 
-            row_idx += 1  # Spacing between groups
+        rows = [
+            [self._cell(ws, "Visualizations Overview", PAGE_TITLE_STYLE)],
+            [],
+            [self._cell(ws, note, NOTE_STYLE)],
+            []
+        ]
 
-        # Now add all collected charts to visualization sheet
-        self._populate_viz_overview(viz_ws)
+        # Three columns of charts (A, I, Q), each with a label row above it
+        chart_row = 5
+        chart_col_positions = ['A', 'I', 'Q']
+        for start in range(0, len(self.viz_charts), 3):
+            label_row = []
+            for offset, chart_info in enumerate(self.viz_charts[start:start + 3]):
+                col_pos = chart_col_positions[offset]
+                label_row += [None] * (8 * offset - len(label_row))
+                label_row.append(self._cell(ws, f"{chart_info['column_name']} - {chart_info['chart_type']}",
+                                            CHART_LABEL_STYLE))
+                ws.add_chart(chart_info['chart'], f'{col_pos}{chart_row + 1}')
+            rows.append(label_row)
+
+            # Space for chart height before the next row of charts
+            rows += [[] for _ in range(17)]
+            chart_row += 18
+
+        self._append_rows(ws, rows)
+        self._merge_cells(ws, 'A1:P1')
 
-        # Save workbook
-        self.wb.save(output_path)
-
-    def _format_index_sheet(self, ws):
-        """Format the index sheet."""
-        ws.title = "Index"
-        ws['A1'] = "Excel Analysis Results - Column Index"
-        ws['A1'].font = Font(bold=True, size=16, color="FFFFFF")
-        ws['A1'].fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        ws.merge_cells('A1:D1')
-
-        # Headers
-        headers = ["#", "Column Name", "Type", "Link"]
-        for col, header in enumerate(headers, start=1):
-            cell = ws.cell(row=2, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
-
-        # Column widths
-        ws.column_dimensions['A'].width = 8
-        ws.column_dimensions['B'].width = 40
-        ws.column_dimensions['C'].width = 20
-        ws.column_dimensions['D'].width = 15
-
-    def _format_index_sheet_grouped(self, ws):
-        """Format the index sheet for grouped results."""
-        ws.title = "Index"
-        ws['A1'] = f"Excel Analysis Results - Grouped by {self.group_column}"
-        ws['A1'].font = Font(bold=True, size=16, color="FFFFFF")
-        ws['A1'].fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        ws.merge_cells('A1:C1')
-
-        # Column widths
-        ws.column_dimensions['A'].width = 50
-        ws.column_dimensions['B'].width = 20
-        ws.column_dimensions['C'].width = 15
-
-    def _populate_viz_overview(self, ws):
-        """Populate the visualization overview sheet with charts."""
-        ws.title = "Visualizations"
-        ws['A1'] = "Visualizations Overview"
-        ws['A1'].font = Font(bold=True, size=16, color="FFFFFF")
-        ws['A1'].fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        ws.merge_cells('A1:P1')
+    def _create_quantitative_sheet(self, ws, column_name: str, data: Dict[str, Any], sheet_name: str = None):
+        """
+        Create sheet for quantitative column analysis with multiple visualizations.
+        The overview charts are only collected when sheet_name is given.
+        """
+        # Set column widths
+        self._set_column_widths(ws, {'A': 20, 'B': 15, 'C': 15, 'D': 15, 'E': 15})
 
-        ws['A3'] = "This sheet contains visualizations for all quantitative columns."
-        ws['A3'].font = Font(size=11)
+        stats = self._quantitative_stats(data)
+        freq_start_row = self._frequency_layout(data)[0]
 
-        # Add all collected charts to this sheet
-        chart_row = 5
-        chart_col_positions = ['A', 'I', 'Q']  # Three columns of charts
-        chart_idx = 0
+        with stage('write_rows'):
+            self._append_rows(ws, self._quantitative_rows(ws, column_name, data, stats))
+        self._merge_cells(ws, 'A1:E1')
 
-        for chart_info in self.viz_charts:
-            col_pos = chart_col_positions[chart_idx % 3]
+        # Create visualizations from the histogram bins
+        source = self._chart_source(data)
+        if source is None:
+            return
+        with stage('charts'):
+            self._add_quantitative_charts(ws, column_name, source, freq_start_row, sheet_name)
 
-            # Add section label
-            label_cell = ws[f'{col_pos}{chart_row}']
-            label_cell.value = f"{chart_info['column_name']} - {chart_info['chart_type']}"
-            label_cell.font = Font(bold=True, size=10)
+    def _add_quantitative_charts(self, ws, column_name: str, source: tuple, freq_start_row: int,
+                                 sheet_name: str = None):
+        """Add a quantitative sheet's histogram and density charts (see _create_quantitative_sheet)."""
+        cats_col, values_col, header_row, n_rows = source
+        data_ref = Reference(ws, min_col=values_col, min_row=header_row, max_row=header_row + n_rows)
+        cats = Reference(ws, min_col=cats_col, min_row=header_row + 1, max_row=header_row + n_rows)
 
-            # Add the chart
-            ws.add_chart(chart_info['chart'], f'{col_pos}{chart_row + 1}')
+        # 1. Create histogram (bar chart for frequency distribution)
+        histogram = BarChart()
+        histogram.type = "col"
+        histogram.title = f"Histogram - Frequency Distribution"
+        histogram.y_axis.title = 'Frequency'
+        histogram.x_axis.title = 'Value'
 
-            chart_idx += 1
+        histogram.add_data(data_ref, titles_from_data=True)
+        histogram.set_categories(cats)
+        histogram.height = 10
+        histogram.width = 15
 
-            # Move to next row after every 3 charts
-            if chart_idx % 3 == 0:
-                chart_row += 18  # Space for chart height
+        # Place histogram on the sheet
+        ws.add_chart(histogram, f"G{freq_start_row}")
 
-        ws.column_dimensions['A'].width = 2
+        # 2. Create distribution density diagram (line chart showing value distribution)
+        density_chart = LineChart()
+        density_chart.title = f"Distribution Density"
+        density_chart.y_axis.title = 'Frequency'
+        density_chart.x_axis.title = 'Value'
+        density_chart.style = 13
+
+        density_chart.add_data(data_ref, titles_from_data=True)
+        density_chart.set_categories(cats)
+        density_chart.height = 10
+        density_chart.width = 15
+
+        # Place density chart on sheet
+        ws.add_chart(density_chart, f"V{freq_start_row}")
+
+        if sheet_name:
+            self._add_viz_charts(ws.title, column_name, source)
+
+    def _chart_source(self, data: Dict[str, Any]) -> tuple:
+        """
+        Where a quantitative sheet's charts read from, as (category column,
+        value column, header row, number of rows): its histogram bins.
+        None when there is nothing to chart.
+        """
+        histogram = data.get('histogram')
+        if histogram is None:
+            return None
+        header_row = self._frequency_layout(data)[1]
+        return BIN_COLUMN, BIN_COLUMN + 2, header_row, len(histogram['counts'])
+
+    def _add_viz_charts(self, sheet_title: str, column_name: str, source: tuple):
+        """
+        Collect the overview copies of a quantitative sheet's charts (source
+        as from _chart_source). They refer to the sheet by title only, so the
+        sheet itself may live in another workbook until the package is
+        assembled.
+        """
+        sheet = DummyWorksheet(sheet_title)
+        cats_col, values_col, header_row, n_rows = source
+        data_end = header_row + n_rows
+
+        # Histogram copy for visualization sheet
+        histogram_viz = BarChart()
+        histogram_viz.type = "col"
+        histogram_viz.title = f"{column_name} - Histogram"
+        histogram_viz.y_axis.title = 'Frequency'
+        histogram_viz.x_axis.title = 'Value'
+        histogram_viz.add_data(Reference(sheet, min_col=values_col, min_row=header_row, max_row=data_end),
+                               titles_from_data=True)
+        histogram_viz.set_categories(Reference(sheet, min_col=cats_col, min_row=header_row + 1, max_row=data_end))
+        histogram_viz.height = 8
+        histogram_viz.width = 12
+
+        self.viz_charts.append({
+            'column_name': column_name,
+            'chart_type': 'Histogram',
+            'chart': histogram_viz
+        })
+
+        # Distribution density copy for visualization sheet
+        density_chart_viz = LineChart()
+        density_chart_viz.title = f"{column_name} - Distribution Density"
+        density_chart_viz.y_axis.title = 'Frequency'
+        density_chart_viz.x_axis.title = 'Value'
+        density_chart_viz.style = 13
+        density_chart_viz.add_data(Reference(sheet, min_col=values_col, min_row=header_row, max_row=data_end),
+                                   titles_from_data=True)
+        density_chart_viz.set_categories(Reference(sheet, min_col=cats_col, min_row=header_row + 1, max_row=data_end))
+        density_chart_viz.height = 8
+        density_chart_viz.width = 12
+
+        self.viz_charts.append({
+            'column_name': column_name,
+            'chart_type': 'Distribution Density',
+            'chart': density_chart_viz
+        })
+
+    def _quantitative_stats(self, data: Dict[str, Any]) -> List[tuple]:
+        """The (label, value, style) rows of a quantitative sheet's statistical summary."""
+        return [
+            ("Count", data['count'], None),
+            ("Minimum", data['min'], DECIMAL_STYLE),
+            ("25th Percentile", data['percentile_25'], DECIMAL_STYLE),
+            ("Median (50th)", data['percentile_50'], DECIMAL_STYLE),
+            ("75th Percentile", data['percentile_75'], DECIMAL_STYLE),
+            ("Maximum", data['max'], DECIMAL_STYLE),
+            ("Average", data['average'], DECIMAL_STYLE),
+            ("Sum", data['sum'], DECIMAL_STYLE),
+            ("% of Total", _fraction(data['percent_of_total']), PERCENT_STYLE),
+        ]
 
-    def _create_quantitative_sheet(self, ws, column_name: str, data: Dict[str, Any], sheet_name: str = None):
-        """Create sheet for quantitative column analysis with multiple visualizations."""
+    def _frequency_layout(self, data: Dict[str, Any]) -> tuple:
+        """
+        Rows of a quantitative sheet's frequency section: (section start,
+        table header, first data row).
+        """
+        # Layout: title, statistics from row 4, then (after a blank row and the
+        # box plot header) the frequency table with the box plot data beside it
+        freq_start_row = 4 + len(self._quantitative_stats(data)) + 2
+        return freq_start_row, freq_start_row + 1, freq_start_row + 2
+
+    def _quantitative_rows(self, ws, column_name: str, data: Dict[str, Any], stats: List[tuple]) -> Iterator[list]:
+        """Rows of a quantitative column sheet, top to bottom."""
         # Title
-        ws['A1'] = f"Analysis: {column_name}"
-        ws['A1'].font = Font(bold=True, size=14, color="FFFFFF")
-        ws['A1'].fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        ws.merge_cells('A1:E1')
+        yield [self._cell(ws, f"Analysis: {column_name}", SHEET_TITLE_STYLE)]
+        yield []
 
         # Statistics section
-        ws['A3'] = "Statistical Summary"
-        ws['A3'].font = Font(bold=True, size=12)
-
-        stats = [
-            ("Count", data['count']),
-            ("Minimum", f"{data['min']:.2f}"),
-            ("25th Percentile", f"{data['percentile_25']:.2f}"),
-            ("Median (50th)", f"{data['percentile_50']:.2f}"),
-            ("75th Percentile", f"{data['percentile_75']:.2f}"),
-            ("Maximum", f"{data['max']:.2f}"),
-            ("Average", f"{data['average']:.2f}"),
-            ("Sum", f"{data['sum']:.2f}"),
-            ("% of Total", f"{data['percent_of_total']:.2f}%"),
+        yield [self._cell(ws, "Statistical Summary", SECTION_STYLE)]
+        for stat_name, stat_value, style in stats:
+            value_cell = self._cell(ws, stat_value, style) if style else stat_value
+            yield [self._cell(ws, stat_name, LABEL_STYLE), value_cell]
+        yield []
+
+        # Box plot data (G:H) starts one row above the frequency section
+        box_rows = [
+            ["Min", data['min']],
+            ["Q1", data['percentile_25']],
+            ["Median", data['percentile_50']],
+            ["Q3", data['percentile_75']],
+            ["Max", data['max']],
         ]
-
-        row = 4
-        for stat_name, stat_value in stats:
-            ws.cell(row=row, column=1, value=stat_name).font = Font(bold=True)
-            ws.cell(row=row, column=2, value=stat_value)
-            row += 1
-
-        # Create box plot data for visualization
-        box_data_row = row + 1
-        ws.cell(row=box_data_row, column=7, value="Box Plot Data").font = Font(bold=True)
-        ws.cell(row=box_data_row + 1, column=7, value="Min")
-        ws.cell(row=box_data_row + 1, column=8, value=data['min'])
-        ws.cell(row=box_data_row + 2, column=7, value="Q1")
-        ws.cell(row=box_data_row + 2, column=8, value=data['percentile_25'])
-        ws.cell(row=box_data_row + 3, column=7, value="Median")
-        ws.cell(row=box_data_row + 3, column=8, value=data['percentile_50'])
-        ws.cell(row=box_data_row + 4, column=7, value="Q3")
-        ws.cell(row=box_data_row + 4, column=8, value=data['percentile_75'])
-        ws.cell(row=box_data_row + 5, column=7, value="Max")
-        ws.cell(row=box_data_row + 5, column=8, value=data['max'])
+        box_padding = [None] * 6
+        yield box_padding + [self._cell(ws, "Box Plot Data", LABEL_STYLE)]
+
+        # Histogram bins (from BIN_COLUMN) beside the frequency table; a
+        # column never has more bins than distinct values, so they fit
+        bin_rows = []
+        histogram = data.get('histogram')
+        if histogram is not None:
+            counts, edges = histogram['counts'], histogram['edges']
+            bin_rows = [
+                [self._cell(ws, "Histogram Bins", SECTION_STYLE)],
+                [self._cell(ws, header, HEADER_STYLE) for header in ["From", "To", "Frequency"]]
+            ]
+            for count, low, high in zip(counts.tolist(), edges[:-1].tolist(), edges[1:].tolist()):
+                bin_rows.append([self._cell(ws, low, DECIMAL_STYLE), self._cell(ws, high, DECIMAL_STYLE), count])
+
+        def beside(row, idx):
+            """A frequency section row with its histogram bin row appended."""
+            if idx >= len(bin_rows):
+                return row
+            return row + [None] * (BIN_COLUMN - 1 - len(row)) + bin_rows[idx]
 
         # Frequency distribution section
-        freq_start_row = row + 2
-        ws.cell(row=freq_start_row, column=1, value="Frequency Distribution").font = Font(bold=True, size=12)
-
+        yield beside([self._cell(ws, "Frequency Distribution", SECTION_STYLE)] + [None] * 5 + box_rows[0], 0)
         freq_headers = ["Value", "Frequency", "% of Count", "Value Sum", "% of Total"]
-        freq_header_row = freq_start_row + 1
-        for col, header in enumerate(freq_headers, start=1):
-            cell = ws.cell(row=freq_header_row, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
+        yield beside([self._cell(ws, header, HEADER_STYLE) for header in freq_headers] + [None] + box_rows[1], 1)
 
         # Frequency data
-        freq_data_start = freq_header_row + 1
-        for idx, freq_item in enumerate(data['frequency']):
-            row = freq_data_start + idx
-            ws.cell(row=row, column=1, value=freq_item['value'])
-            ws.cell(row=row, column=2, value=freq_item['frequency'])
-            ws.cell(row=row, column=3, value=f"{freq_item['percentage']:.2f}%")
-            ws.cell(row=row, column=4, value=f"{freq_item['value_sum']:.2f}")
-            ws.cell(row=row, column=5, value=f"{freq_item['percent_of_total_column']:.2f}%")
-
+        remaining_box_rows = box_rows[2:]
+        freq_rows = data['frequency'].iter_rows('value', 'frequency', 'percentage',
+                                                'value_sum', 'percent_of_total_column')
+        for idx, (value, frequency, percentage, value_sum, percent_of_total) in enumerate(freq_rows):
+            row = [
+                value,
+                frequency,
+                self._cell(ws, _fraction(percentage), PERCENT_STYLE),
+                self._cell(ws, value_sum, DECIMAL_STYLE),
+                self._cell(ws, _fraction(percent_of_total), PERCENT_STYLE)
+            ]
+            if idx < len(remaining_box_rows):
+                row += [None] + remaining_box_rows[idx]
+            yield beside(row, idx + 2)
+        for box_row in remaining_box_rows[len(data['frequency']):]:
+            yield box_padding + box_row
+
+    def _create_qualitative_sheet(self, ws, column_name: str, data: FrequencyTable):
+        """Create sheet for qualitative column analysis."""
         # Set column widths
-        ws.column_dimensions['A'].width = 20
-        ws.column_dimensions['B'].width = 15
-        ws.column_dimensions['C'].width = 15
-        ws.column_dimensions['D'].width = 15
-        ws.column_dimensions['E'].width = 15
+        self._set_column_widths(ws, {'A': 30, 'B': 15, 'C': 15})
 
-        # Create visualizations
-        charts_created = []
+        header_row = 4
 
-        # 1. Create histogram (bar chart for frequency distribution)
-        if len(data['frequency']) > 0 and len(data['frequency']) <= 50:
-            histogram = BarChart()
-            histogram.type = "col"
-            histogram.title = f"Histogram - Frequency Distribution"
-            histogram.y_axis.title = 'Frequency'
-            histogram.x_axis.title = 'Value'
-
-            data_ref = Reference(ws, min_col=2, min_row=freq_header_row, max_row=freq_data_start + len(data['frequency']) - 1)
-            cats = Reference(ws, min_col=1, min_row=freq_header_row + 1, max_row=freq_data_start + len(data['frequency']) - 1)
-
-            histogram.add_data(data_ref, titles_from_data=True)
-            histogram.set_categories(cats)
-            histogram.height = 10
-            histogram.width = 15
-
-            # Place histogram on the sheet
-            ws.add_chart(histogram, f"G{freq_start_row}")
-
-            # Create a copy for visualization sheet
-            histogram_viz = BarChart()
-            histogram_viz.type = "col"
-            histogram_viz.title = f"{column_name} - Histogram"
-            histogram_viz.y_axis.title = 'Frequency'
-            histogram_viz.x_axis.title = 'Value'
-
-            if sheet_name:
-                data_ref_viz = Reference(ws, min_col=2, min_row=freq_header_row, max_row=freq_data_start + len(data['frequency']) - 1)
-                cats_viz = Reference(ws, min_col=1, min_row=freq_header_row + 1, max_row=freq_data_start + len(data['frequency']) - 1)
-                histogram_viz.add_data(data_ref_viz, titles_from_data=True)
-                histogram_viz.set_categories(cats_viz)
-                histogram_viz.height = 8
-                histogram_viz.width = 12
-
-                self.viz_charts.append({
-                    'column_name': column_name,
-                    'chart_type': 'Histogram',
-                    'chart': histogram_viz
-                })
+        def rows():
+            # Title
+            yield [self._cell(ws, f"Analysis: {column_name}", SHEET_TITLE_STYLE)]
+            yield []
 
-        # 2. Create distribution density diagram (line chart showing value distribution)
-        if len(data['frequency']) > 0 and len(data['frequency']) <= 50:
-            density_chart = LineChart()
-            density_chart.title = f"Distribution Density"
-            density_chart.y_axis.title = 'Frequency'
-            density_chart.x_axis.title = 'Value'
-            density_chart.style = 13
-
-            density_data_ref = Reference(ws, min_col=2, min_row=freq_header_row, max_row=freq_data_start + len(data['frequency']) - 1)
-            density_cats = Reference(ws, min_col=1, min_row=freq_header_row + 1, max_row=freq_data_start + len(data['frequency']) - 1)
-
-            density_chart.add_data(density_data_ref, titles_from_data=True)
-            density_chart.set_categories(density_cats)
-            density_chart.height = 10
-            density_chart.width = 15
-
-            # Place density chart on sheet
-            ws.add_chart(density_chart, f"V{freq_start_row}")
-
-            # Create copy for visualization sheet
-            density_chart_viz = LineChart()
-            density_chart_viz.title = f"{column_name} - Distribution Density"
-            density_chart_viz.y_axis.title = 'Frequency'
-            density_chart_viz.x_axis.title = 'Value'
-            density_chart_viz.style = 13
-
-            if sheet_name:
-                density_data_ref_viz = Reference(ws, min_col=2, min_row=freq_header_row, max_row=freq_data_start + len(data['frequency']) - 1)
-                density_cats_viz = Reference(ws, min_col=1, min_row=freq_header_row + 1, max_row=freq_data_start + len(data['frequency']) - 1)
-                density_chart_viz.add_data(density_data_ref_viz, titles_from_data=True)
-                density_chart_viz.set_categories(density_cats_viz)
-                density_chart_viz.height = 8
-                density_chart_viz.width = 12
-
-                self.viz_charts.append({
-                    'column_name': column_name,
-                    'chart_type': 'Distribution Density',
-                    'chart': density_chart_viz
-                })
-
-    def _create_qualitative_sheet(self, ws, column_name: str, data: list):
-        """Create sheet for qualitative column analysis."""
-        # Title
-        ws['A1'] = f"Analysis: {column_name}"
-        ws['A1'].font = Font(bold=True, size=14, color="FFFFFF")
-        ws['A1'].fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        ws.merge_cells('A1:D1')
+            # Data section
+            yield [self._cell(ws, "Category Distribution", SECTION_STYLE)]
+            yield [self._cell(ws, header, HEADER_STYLE) for header in ["Label", "Frequency", "Percentage"]]
 
-        # Data section
-        ws['A3'] = "Category Distribution"
-        ws['A3'].font = Font(bold=True, size=12)
+            # Data rows
+            for label, frequency, percentage in data.iter_rows('label', 'frequency', 'percentage'):
+                yield [label, frequency, self._cell(ws, _fraction(percentage), PERCENT_STYLE)]
 
-        headers = ["Label", "Frequency", "Percentage"]
-        header_row = 4
-        for col, header in enumerate(headers, start=1):
-            cell = ws.cell(row=header_row, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
+        with stage('write_rows'):
+            self._append_rows(ws, rows())
+        self._merge_cells(ws, 'A1:D1')
 
-        # Data rows
-        data_start = header_row + 1
-        for idx, item in enumerate(data):
-            row = data_start + idx
-            ws.cell(row=row, column=1, value=item['label'])
-            ws.cell(row=row, column=2, value=item['frequency'])
-            ws.cell(row=row, column=3, value=f"{item['percentage']:.2f}%")
+        with stage('charts'):
+            self._add_qualitative_chart(ws, column_name, data, header_row)
 
-        # Set column widths
-        ws.column_dimensions['A'].width = 30
-        ws.column_dimensions['B'].width = 15
-        ws.column_dimensions['C'].width = 15
+    def _add_qualitative_chart(self, ws, column_name: str, data: FrequencyTable, header_row: int):
+        """Add a qualitative sheet's pie chart (up to 20 labels) or bar chart (see _create_qualitative_sheet)."""
+        data_start = header_row + 1
 
         # Create pie chart
         if len(data) > 0 and len(data) <= 20:
@@ -403,3 +858,66 @@ class ExcelExporter:
             chart.width = 25
 
             ws.add_chart(chart, "E4")
+
+
+def _check_cancelled(cancel_event):
+    """Raise ExportCancelled if the cancel event has been set."""
+    if cancel_event is not None and cancel_event.is_set():
+        raise ExportCancelled("Export cancelled")
+
+
+def _variance(table: FrequencyTable) -> float:
+    """Variance of the values a quantitative frequency table counts."""
+    values = table.column('value').astype(float)
+    weights = table.column('frequency')
+    mean = np.average(values, weights=weights)
+    return float(np.average((values - mean) ** 2, weights=weights))
+
+
+def _frequency_table(column_data: Dict[str, Any]) -> FrequencyTable:
+    """The frequency table of a column's results entry (one row per distinct value)."""
+    if column_data['type'] == 'quantitative':
+        return column_data['data']['frequency']
+    return column_data['data']
+
+
+def _fraction(percentage: float) -> float:
+    """
+    A percentage as the fraction a percent-formatted cell holds, to 0.0001%;
+    the extra digits of the full float only make the sheet larger.
+    """
+    return round(percentage / 100, 6)
+
+
+def _render_sheets_task(task: Dict[str, Any]) -> tuple:
+    """
+    Process-pool entry point used by ExcelExporter.export_grouped: render
+    the overview or a chunk of column sheets into a standalone package.
+    Returns the package bytes and, for a profiled export run in a worker
+    process, the recorded spans (run in-process, stages are recorded directly).
+    """
+    profiler = Profiler() if task['profile'] and not is_active() else None
+    exporter = ExcelExporter({}, task.get('group_column'), write_only=True, profiler=profiler)
+    with activated(profiler):
+        if 'overview' in task:
+            with stage('overview_sheet'):
+                ws = exporter.wb.create_sheet(task['overview'])
+                for chart_spec in task['charts']:
+                    exporter._add_viz_charts(*chart_spec)
+                exporter._populate_viz_overview(ws, task['note'])
+                exporter._finish_sheet(ws)
+        else:
+            for sheet_title, title, column_data, group_name, column_name in task['sheets']:
+                with stage('sheet', column=column_name, group=group_name,
+                           rows=len(_frequency_table(column_data))):
+                    ws = exporter.wb.create_sheet(sheet_title)
+                    if column_data['type'] == 'quantitative':
+                        exporter._create_quantitative_sheet(ws, title, column_data['data'])
+                    else:
+                        exporter._create_qualitative_sheet(ws, title, column_data['data'])
+                    exporter._finish_sheet(ws)
+
+        buffer = io.BytesIO()
+        with stage('save'):
+            exporter.wb.save(buffer)
+    return buffer.getvalue(), profiler.records() if profiler else None
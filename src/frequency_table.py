@@ -0,0 +1,62 @@
+import numpy as np
+from collections.abc import Sequence
+from typing import Dict, Any, Iterator, Tuple
+
+
+class FrequencyTable(Sequence):
+    """
+    Columnar frequency table produced by ExcelAnalyzer.
+
+    Every field (value/label, frequency, percentage, ...) is stored as one
+    NumPy array. The table still behaves like the list of row dicts the
+    analyzer used to return - len(), indexing, slicing and iteration all
+    work - but a row dict is only built when a consumer asks for that row.
+    Consumers that can work on columns should use column() or iter_rows().
+    """
+
+    # Rows converted to Python objects per step while iterating
+    CHUNK_SIZE = 4096
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        self.columns = dict(columns)
+        self._length = len(next(iter(self.columns.values()))) if self.columns else 0
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """Names of the table fields, in row-dict order."""
+        return tuple(self.columns)
+
+    def column(self, name: str) -> np.ndarray:
+        """Get the array holding one field for all rows."""
+        return self.columns[name]
+
+    def iter_rows(self, *names: str) -> Iterator[tuple]:
+        """
+        Iterate rows as tuples of Python scalars for the given fields
+        (all fields if none are given), converting one chunk at a time.
+        """
+        arrays = [self.columns[name] for name in (names or self.fields)]
+        for start in range(0, self._length, self.CHUNK_SIZE):
+            stop = start + self.CHUNK_SIZE
+            yield from zip(*[values[start:stop].tolist() for values in arrays])
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return FrequencyTable({name: values[index] for name, values in self.columns.items()})
+
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("frequency table index out of range")
+        return {name: values[index:index + 1].tolist()[0] for name, values in self.columns.items()}
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        names = self.fields
+        for row in self.iter_rows():
+            yield dict(zip(names, row))
+
+    def __repr__(self) -> str:
+        return f"FrequencyTable({self._length} rows, fields={list(self.fields)})"
@@ -1,12 +1,32 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
-from analyzer import ExcelAnalyzer
-from excel_exporter import ExcelExporter
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import freeze_support
+from results_view import (ResultsDocument, VirtualTextView, VisualizationView, append_results_header,
+                          append_ungrouped_column, append_grouped_results)
 import json
 import os
+import queue
 import subprocess
 import platform
-import pandas as pd
+import threading
+import time
+
+# The analysis modules pull in pandas, numpy and openpyxl, which take far
+# longer to import than building the window. They are imported on first
+# use instead of here, and warmed on a background thread once the window
+# is shown (see _warm_up_imports), so the window paints first.
+WARM_UP_MODULES = ('analyzer', 'excel_exporter', 'sheet_cache')
+
+# Set to a file path to have main() create that file once the window has
+# been painted and exit (used by benchmarks/startup_benchmark.py)
+STARTUP_PROBE_ENV = 'DATALENS_STARTUP_PROBE'
+
+# Sheets wider than this open the column picker before they are loaded
+WIDE_SHEET_COLUMNS = 50
+
+PERFORMANCE_HINT = ("Tick \"Record timings\" and load a sheet or run an analysis to see where the time goes: "
+                    "per stage, column and group.")
 
 
 class ExcelAnalysisApp:
@@ -43,10 +63,40 @@ class ExcelAnalysisApp:
         self.last_export_path = None
         self.available_sheets = []
         self.current_sheet = None
-        self.excel_file = None  # Store the Excel file object
+        self.excel_file = None  # Open ExcelWorkbook (or TableFile) shared by all sheet loads
+        # Sheet name -> (columns, column_types) chosen in the column picker
+        self.column_choices = {}
+        # SheetCache of parsed sheets, created with the first file
+        self.sheet_cache = None
+        # Profiler of the run shown in the Performance tab (see _new_profiler),
+        # and the one that recorded the last sheet load until an analysis takes it over
+        self.profiler = None
+        self.load_profiler = None
+        self.results_profiler = None  # the one that recorded the analysis of current_results
+
+        # Analysis runs on a background thread; its progress reports are
+        # queued and picked up on the Tk thread by _poll_analysis
+        self.analysis_executor = ThreadPoolExecutor(max_workers=1)
+        self.analysis_future = None
+        self.analysis_cancel = None
+        self.analysis_updates = None
+        self.analysis_started = None
+        self.analysis_shown_columns = []
+
+        # Exports run on their own thread, so a new analysis can start while
+        # the previous results are still being written
+        self.export_executor = ThreadPoolExecutor(max_workers=1)
+        self.export_future = None
+        self.export_cancel = None
+        self.export_updates = None
+        self.export_started = None
 
         self.setup_menu()
         self.setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # Import the analysis modules while the user picks a file
+        self.root.after_idle(lambda: threading.Thread(target=_warm_up_imports, daemon=True).start())
 
     def setup_menu(self):
         """Set up the menu bar."""
@@ -59,6 +109,7 @@ class ExcelAnalysisApp:
         file_menu.add_command(label="Open Excel File", command=self.browse_file)
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.root.quit)
+        self.file_menu = file_menu
 
         # View menu
         view_menu = tk.Menu(menubar, tearoff=0)
@@ -158,19 +209,19 @@ class ExcelAnalysisApp:
                                    anchor="w")
         self.file_label.pack(side="left", fill="x", expand=True)
 
-        browse_btn = tk.Button(file_select_frame,
-                              text="📂 Browse Excel File",
-                              command=self.browse_file,
-                              font=self.button_font,
-                              bg=self.primary_color,
-                              fg="white",
-                              activebackground=self.primary_dark,
-                              activeforeground="white",
-                              relief='flat',
-                              padx=25,
-                              pady=10,
-                              cursor="hand2")
-        browse_btn.pack(side="right")
+        self.browse_button = tk.Button(file_select_frame,
+                                       text="📂 Browse Excel File",
+                                       command=self.browse_file,
+                                       font=self.button_font,
+                                       bg=self.primary_color,
+                                       fg="white",
+                                       activebackground=self.primary_dark,
+                                       activeforeground="white",
+                                       relief='flat',
+                                       padx=25,
+                                       pady=10,
+                                       cursor="hand2")
+        self.browse_button.pack(side="right")
 
         # Sheet selection (initially hidden)
         self.sheet_select_frame = tk.Frame(file_inner, bg=self.secondary_color)
@@ -191,6 +242,30 @@ class ExcelAnalysisApp:
         self.sheet_combo.pack(side="left")
         self.sheet_combo.bind('<<ComboboxSelected>>', self.on_sheet_selected)
 
+        # Column selection (shown once a file is open)
+        self.column_select_frame = tk.Frame(file_inner, bg=self.secondary_color)
+
+        self.column_summary_label = tk.Label(self.column_select_frame,
+                                             text="",
+                                             font=self.normal_font,
+                                             bg=self.secondary_color,
+                                             fg=self.text_color)
+        self.column_summary_label.pack(side="left", padx=(0, 10))
+
+        self.choose_columns_button = tk.Button(self.column_select_frame,
+                                               text="☰ Choose Columns...",
+                                               command=self.choose_columns,
+                                               font=self.small_font,
+                                               bg=self.text_light,
+                                               fg="white",
+                                               activebackground="#5F6A6A",
+                                               activeforeground="white",
+                                               relief='flat',
+                                               padx=10,
+                                               pady=2,
+                                               cursor="hand2")
+        self.choose_columns_button.pack(side="left")
+
         # Analysis Options Card
         options_card = ttk.Frame(content_frame, style='Card.TFrame', relief='solid', borderwidth=1)
         options_card.pack(fill="x", pady=(0, 15))
@@ -274,6 +349,12 @@ class ExcelAnalysisApp:
                                            cursor="hand2")
         self.open_excel_button.pack(side="left", padx=5)
 
+        # Analysis and export progress (each shown only while running)
+        (self.progress_frame, self.progress_bar,
+         self.progress_label, self.cancel_button) = self._create_progress_row(options_inner, self.cancel_analysis)
+        (self.export_progress_frame, self.export_progress_bar,
+         self.export_progress_label, self.export_cancel_button) = self._create_progress_row(options_inner, self.cancel_export)
+
         # Results Area with Tabs
         results_card = tk.Frame(content_frame, bg="white", relief='solid', borderwidth=1)
         results_card.pack(fill="both", expand=True)
@@ -296,44 +377,78 @@ class ExcelAnalysisApp:
         text_frame = tk.Frame(self.notebook, bg="white")
         self.notebook.add(text_frame, text="📄 Text Summary")
 
-        self.results_text = scrolledtext.ScrolledText(text_frame,
-                                                      wrap=tk.WORD,
-                                                      font=("Consolas", 10),
-                                                      bg="white",
-                                                      relief='flat',
-                                                      padx=15,
-                                                      pady=15)
-        self.results_text.pack(fill="both", expand=True)
-
-        # Visual Results Tab (for future charts)
+        # Find and jump-to-column bar above the report
+        search_bar = tk.Frame(text_frame, bg="white")
+        search_bar.pack(fill="x", padx=15, pady=(10, 0))
+
+        tk.Label(search_bar, text="Find:", font=self.small_font, bg="white",
+                 fg=self.text_color).pack(side="left")
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_bar, textvariable=self.search_var, width=30)
+        search_entry.pack(side="left", padx=(5, 5))
+        search_entry.bind('<Return>', lambda event: self.find_in_results())
+        search_entry.bind('<Shift-Return>', lambda event: self.find_in_results(backwards=True))
+        ttk.Button(search_bar, text="Previous",
+                   command=lambda: self.find_in_results(backwards=True)).pack(side="left")
+        ttk.Button(search_bar, text="Next", command=self.find_in_results).pack(side="left", padx=(5, 0))
+        self.search_status = tk.Label(search_bar, text="", font=self.small_font, bg="white", fg=self.text_light)
+        self.search_status.pack(side="left", padx=10)
+
+        self.jump_var = tk.StringVar()
+        self.jump_combo = ttk.Combobox(search_bar, textvariable=self.jump_var, state="readonly", width=35)
+        self.jump_combo.pack(side="right")
+        self.jump_combo.bind('<<ComboboxSelected>>', self.jump_to_column)
+        tk.Label(search_bar, text="Jump to column:", font=self.small_font, bg="white",
+                 fg=self.text_color).pack(side="right", padx=(0, 5))
+
+        # Only the lines on screen are formatted; the report itself is a
+        # ResultsDocument built from the result structures
+        self.results_document = ResultsDocument()
+        self.results_view = VirtualTextView(text_frame, self.results_document,
+                                            font=("Consolas", 10),
+                                            bg="white",
+                                            relief='flat',
+                                            padx=15,
+                                            pady=15)
+        self.results_view.pack(fill="both", expand=True)
+
+        # Visual Results Tab: cards drawn on one canvas, only near the viewport
         self.visual_frame = tk.Frame(self.notebook, bg="white")
         self.notebook.add(self.visual_frame, text="📊 Visualizations")
 
-        # Placeholder for visualizations
-        self.viz_canvas = tk.Canvas(self.visual_frame, bg="white", highlightthickness=0)
-        self.viz_scrollbar = ttk.Scrollbar(self.visual_frame, orient="vertical", command=self.viz_canvas.yview)
-        self.viz_scrollable_frame = tk.Frame(self.viz_canvas, bg="white")
-
-        self.viz_scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.viz_canvas.configure(scrollregion=self.viz_canvas.bbox("all"))
-        )
-
-        self.viz_canvas.create_window((0, 0), window=self.viz_scrollable_frame, anchor="nw")
-        self.viz_canvas.configure(yscrollcommand=self.viz_scrollbar.set)
-
-        self.viz_canvas.pack(side="left", fill="both", expand=True)
-        self.viz_scrollbar.pack(side="right", fill="y")
-
-        # Add welcome message to visual tab
-        welcome_label = tk.Label(self.viz_scrollable_frame,
-                                text="📊 Run analysis to see visualizations here\n\n"
-                                     "Charts and statistics will appear after you click 'Run Analysis'",
-                                font=self.normal_font,
-                                bg="white",
-                                fg=self.text_light,
-                                pady=50)
-        welcome_label.pack(expand=True)
+        theme_names = ('primary_color', 'secondary_color', 'accent_color', 'text_color', 'text_light',
+                       'border_color', 'title_font', 'heading_font', 'normal_font', 'small_font')
+        self.viz_view = VisualizationView(self.visual_frame, {name: getattr(self, name) for name in theme_names})
+        self.viz_view.pack(fill="both", expand=True)
+
+        # Performance Tab: stage timings of the last recorded load, analysis and export
+        performance_frame = tk.Frame(self.notebook, bg="white")
+        self.notebook.add(performance_frame, text="⏱ Performance")
+
+        performance_bar = tk.Frame(performance_frame, bg="white")
+        performance_bar.pack(fill="x", padx=15, pady=(10, 0))
+        self.record_timings_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(performance_bar, text="Record timings",
+                        variable=self.record_timings_var).pack(side="left")
+        self.record_cprofile_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(performance_bar, text="Include cProfile call statistics (slower)",
+                        variable=self.record_cprofile_var).pack(side="left", padx=(10, 0))
+        self.save_cprofile_button = ttk.Button(performance_bar, text="Save cProfile Stats...",
+                                               command=self.save_cprofile_stats, state="disabled")
+        self.save_cprofile_button.pack(side="right")
+        self.save_trace_button = ttk.Button(performance_bar, text="Save Trace (speedscope)...",
+                                            command=self.save_performance_trace, state="disabled")
+        self.save_trace_button.pack(side="right", padx=(0, 5))
+
+        self.performance_document = ResultsDocument()
+        self.performance_document.append_lines([PERFORMANCE_HINT])
+        self.performance_view = VirtualTextView(performance_frame, self.performance_document,
+                                                font=("Consolas", 10),
+                                                bg="white",
+                                                relief='flat',
+                                                padx=15,
+                                                pady=15)
+        self.performance_view.pack(fill="both", expand=True)
 
         # Status Bar
         status_frame = tk.Frame(self.root, bg=self.primary_color)
@@ -349,19 +464,61 @@ class ExcelAnalysisApp:
                                    pady=8)
         self.status_bar.pack(fill="x")
 
+    def _create_progress_row(self, parent, cancel_command):
+        """Create a (hidden) progress bar row with a status label and a Cancel button."""
+        frame = tk.Frame(parent, bg=self.secondary_color)
+
+        progress_bar = ttk.Progressbar(frame, mode='determinate', length=400)
+        progress_bar.pack(side="left", padx=(0, 10))
+
+        label = tk.Label(frame,
+                         text="",
+                         font=self.normal_font,
+                         bg=self.secondary_color,
+                         fg=self.text_color)
+        label.pack(side="left")
+
+        cancel_button = tk.Button(frame,
+                                  text="✖ Cancel",
+                                  command=cancel_command,
+                                  font=self.button_font,
+                                  bg=self.text_light,
+                                  fg="white",
+                                  activebackground="#5F6A6A",
+                                  activeforeground="white",
+                                  relief='flat',
+                                  padx=15,
+                                  pady=4,
+                                  cursor="hand2")
+        cancel_button.pack(side="right")
+
+        return frame, progress_bar, label, cancel_button
+
     def browse_file(self):
-        """Open file dialog to select Excel file."""
+        """Open file dialog to select an Excel, CSV, Parquet or Feather file."""
+        # The running analysis reports against the loaded sheet
+        if self.analysis_future is not None and not self.analysis_future.done():
+            return
         file_path = filedialog.askopenfilename(
-            title="Select Excel File",
-            filetypes=[("Excel files", "*.xlsx *.xls"), ("All files", "*.*")]
+            title="Select Data File",
+            filetypes=[("Data files", "*.xlsx *.xls *.csv *.tsv *.parquet *.feather"),
+                       ("Excel files", "*.xlsx *.xls"),
+                       ("CSV files", "*.csv *.tsv *.txt"),
+                       ("Parquet / Feather files", "*.parquet *.pq *.feather *.arrow"),
+                       ("All files", "*.*")]
         )
 
         if file_path:
             try:
+                from analyzer import open_workbook
                 self.current_file = file_path
 
-                # Read Excel file to get available sheets
-                self.excel_file = pd.ExcelFile(file_path)
+                # Open the workbook once; sheets are parsed from it and cached
+                if self.excel_file is not None:
+                    self.excel_file.close()
+                self.excel_file = open_workbook(file_path, cache=self._get_sheet_cache())
+                self.column_choices = {}
+                self.column_select_frame.pack_forget()
                 self.available_sheets = self.excel_file.sheet_names
 
                 # Update file label
@@ -387,6 +544,17 @@ class ExcelAnalysisApp:
                 messagebox.showerror("Error", f"Failed to load file:\n{str(e)}")
                 self.status_bar.config(text="Error loading file")
 
+    def _get_sheet_cache(self):
+        """The on-disk sheet cache, created on first use (None if unavailable)."""
+        if self.sheet_cache is None:
+            from sheet_cache import SheetCache
+            try:
+                # Parsed sheets are kept on disk, so reopening a file is fast
+                self.sheet_cache = SheetCache()
+            except OSError:
+                pass
+        return self.sheet_cache
+
     def on_sheet_selected(self, event=None):
         """Handle sheet selection change."""
         selected_sheet = self.sheet_var.get()
@@ -400,8 +568,19 @@ class ExcelAnalysisApp:
             return
 
         try:
-            # Create analyzer with specific sheet
-            self.analyzer = ExcelAnalyzer(self.current_file, sheet_name=sheet_name)
+            from analyzer import ExcelAnalyzer
+
+            # Wide sheets: pick the columns from the header before parsing any rows
+            if sheet_name not in self.column_choices:
+                header = self.excel_file.read_header(sheet_name)
+                if len(header) > WIDE_SHEET_COLUMNS:
+                    self.column_choices[sheet_name] = self._pick_columns(sheet_name, header)
+            columns, column_types = self.column_choices.get(sheet_name) or (None, None)
+
+            # Create analyzer with specific sheet from the already open workbook
+            self.load_profiler = self._new_profiler()
+            self.analyzer = ExcelAnalyzer(self.excel_file, sheet_name=sheet_name, profiler=self.load_profiler,
+                                          columns=columns, column_types=column_types)
 
             # Update group by dropdown
             columns = ["None"] + self.analyzer.get_columns()
@@ -411,129 +590,268 @@ class ExcelAnalysisApp:
             # Enable run button
             self.run_button.config(state="normal")
 
+            self._show_column_summary(sheet_name)
             sheet_info = f" (Sheet: {sheet_name})" if len(self.available_sheets) > 1 else ""
             self.status_bar.config(text=f"✓ Loaded{sheet_info}: {len(self.analyzer.df)} rows, {len(self.analyzer.df.columns)} columns")
+            if self.load_profiler is not None:
+                self.profiler = self.load_profiler
+                self._show_performance()
 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load sheet '{sheet_name}':\n{str(e)}")
             self.status_bar.config(text=f"Error loading sheet: {sheet_name}")
 
+    def choose_columns(self):
+        """Pick the columns of the current sheet and load them again."""
+        if self.excel_file is None or not self.current_sheet:
+            return
+        if self.analysis_future is not None and not self.analysis_future.done():
+            return
+        try:
+            header = self.excel_file.read_header(self.current_sheet)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to read the columns of '{self.current_sheet}':\n{str(e)}")
+            return
+        choice = self._pick_columns(self.current_sheet, header)
+        if choice is not None:
+            self.column_choices[self.current_sheet] = choice
+            self.load_sheet(self.current_sheet)
+
+    def _pick_columns(self, sheet_name, header):
+        """Show the column picker for a sheet; (columns, column_types) or None for all columns."""
+        from column_picker import ColumnPicker
+        from column_types import COLUMN_TYPES
+        columns, column_types = self.column_choices.get(sheet_name) or (None, None)
+        picker = ColumnPicker(self.root, f"Choose Columns - {sheet_name}", header, COLUMN_TYPES,
+                              selected=columns, column_types=column_types)
+        return picker.show()
+
+    def _show_column_summary(self, sheet_name):
+        """Show how many of the sheet's columns are loaded."""
+        columns, column_types = self.column_choices.get(sheet_name) or (None, None)
+        if columns is None:
+            text = f"Columns: all {len(self.analyzer.get_columns())}"
+        else:
+            text = f"Columns: {len(columns)} of {len(self.excel_file.read_header(sheet_name))}"
+        if column_types:
+            text += f" ({len(column_types)} with a type set)"
+        self.column_summary_label.config(text=text)
+        self.column_select_frame.pack(fill="x", pady=(10, 0))
+
     def run_analysis(self):
-        """Run the analysis based on selected options."""
+        """Start the analysis selected in the options on a background thread."""
         if not self.analyzer:
             messagebox.showwarning("Warning", "Please select an Excel file first")
             return
+        if self.analysis_future is not None and not self.analysis_future.done():
+            return
 
-        try:
-            self.status_bar.config(text="Running analysis...")
-            self.results_text.delete(1.0, tk.END)
+        group_column = self.group_column_var.get()
+        group_column = None if group_column == "None" else group_column
+
+        self.status_bar.config(text="Running analysis...")
+        self._reset_results(group_column)
+        self.analysis_shown_columns = []
+
+        self.analysis_cancel = cancel_event = threading.Event()
+        self.analysis_updates = queue.Queue()
+        self.analysis_started = time.monotonic()
+        updates = self.analysis_updates
+
+        def report_progress(done, total, column, result):
+            updates.put((done, total, column, result))
+
+        # A recorded analysis also reports the sheet load it follows
+        analyzer = self.analyzer
+        self.profiler = analyzer.profiler = self._new_profiler()
+        if self.profiler is not None and self.load_profiler is not None:
+            self.profiler.merge(self.load_profiler.records())
+        self.load_profiler = None
+        if group_column is None:
+            task = lambda: analyzer.analyze_all_columns(progress=report_progress,
+                                                        cancel_event=cancel_event)
+        else:
+            task = lambda: analyzer.analyze_by_group(group_column, progress=report_progress,
+                                                     cancel_event=cancel_event)
+
+        self._set_analysis_running(True)
+        self.analysis_future = self.analysis_executor.submit(task)
+        self.root.after(100, self._poll_analysis, self.analysis_future, group_column)
+
+    def cancel_analysis(self):
+        """Ask the running analysis to stop after the current column."""
+        if self.analysis_cancel is not None:
+            self.analysis_cancel.set()
+            self.cancel_button.config(state="disabled")
+            self.status_bar.config(text="Cancelling analysis...")
+
+    def _set_analysis_running(self, running):
+        """Show or hide the progress row and lock the controls while running."""
+        if running:
+            self.progress_bar.config(value=0, maximum=1)
+            self.progress_label.config(text="Starting...")
+            self.cancel_button.config(state="normal")
+            self.progress_frame.pack(fill="x", pady=(10, 0))
+            self.run_button.config(state="disabled")
+            self.export_button.config(state="disabled")
+            self.sheet_combo.config(state="disabled")
+            self.choose_columns_button.config(state="disabled")
+            self.browse_button.config(state="disabled")
+            self.file_menu.entryconfig("Open Excel File", state="disabled")
+        else:
+            self.progress_frame.pack_forget()
+            self.run_button.config(state="normal")
+            self.sheet_combo.config(state="readonly")
+            self.choose_columns_button.config(state="normal")
+            self.browse_button.config(state="normal")
+            self.file_menu.entryconfig("Open Excel File", state="normal")
 
-            group_column = self.group_column_var.get()
+    def _is_exporting(self):
+        """Whether an export is still being written."""
+        return self.export_future is not None and not self.export_future.done()
 
-            if group_column == "None":
-                # Analyze all columns without grouping
-                results = self.analyzer.analyze_all_columns()
-                self.current_results = results
-                self.current_group_column = None
-                self.display_ungrouped_results(results)
-            else:
-                # Analyze with grouping
-                results = self.analyzer.analyze_by_group(group_column)
-                self.current_results = results
-                self.current_group_column = group_column
-                self.display_grouped_results(results, group_column)
+    def _poll_analysis(self, future, group_column):
+        """Apply queued progress reports and finish up once the analysis is done."""
+        from analyzer import AnalysisCancelled
 
-            self.export_button.config(state="normal")
-            self.create_visual_results()
-            self.status_bar.config(text="✓ Analysis completed successfully  •  View results in tabs below")
+        # Bounded per tick so a burst of small columns cannot block the UI
+        for _ in range(50):
+            try:
+                done, total, column, result = self.analysis_updates.get_nowait()
+            except queue.Empty:
+                break
+            self.progress_bar.config(value=done, maximum=max(total, 1))
+            self.progress_label.config(text=self._format_progress(done, total, "columns", self.analysis_started))
+            self._show_partial_result(column, result, group_column)
+        self._refresh_results()
+
+        if not future.done() or not self.analysis_updates.empty():
+            self.root.after(100, self._poll_analysis, future, group_column)
+            return
 
+        self._set_analysis_running(False)
+        self._show_performance()
+        try:
+            results = future.result()
+        except AnalysisCancelled:
+            self.current_results = None
+            self.status_bar.config(text="Analysis cancelled  •  Partial results are shown in the Text Summary tab")
+            return
         except Exception as e:
+            self.current_results = None
             messagebox.showerror("Error", f"Analysis failed:\n{str(e)}")
             self.status_bar.config(text="Analysis failed")
+            return
+
+        self.current_results = results
+        self.current_group_column = group_column
+        self.results_profiler = self.profiler
+        if group_column is not None:
+            self.display_grouped_results(results, group_column)
+        elif self.analysis_shown_columns != list(results):
+            self.display_ungrouped_results(results)
+
+        if not self._is_exporting():
+            self.export_button.config(state="normal")
+        self.create_visual_results()
+        self.status_bar.config(text="✓ Analysis completed successfully  •  View results in tabs below")
+
+    def _format_progress(self, done, total, unit, started):
+        """Progress text with an estimate of the remaining time."""
+        elapsed = time.monotonic() - started
+        remaining = elapsed / done * (total - done) if done else 0
+        minutes, seconds = divmod(int(remaining + 0.5), 60)
+        return f"{done} of {total} {unit}  •  about {minutes}:{seconds:02d} left"
+
+    def _show_partial_result(self, column, result, group_column):
+        """Append a column that has just been analyzed to the text results."""
+        if group_column is None:
+            if result:
+                append_ungrouped_column(self.results_document, column, result)
+                self.analysis_shown_columns.append(column)
+        else:
+            # Grouped output is ordered by group, so it is laid out once the
+            # analysis is done; until then each finished column is listed
+            self.results_document.append_lines([f"  ✓ {column}: analyzed for {len(result)} groups"])
+
+    def on_close(self):
+        """Stop any running analysis or export and close the window."""
+        for cancel_event in (self.analysis_cancel, self.export_cancel):
+            if cancel_event is not None:
+                cancel_event.set()
+        self.analysis_executor.shutdown(wait=False)
+        self.export_executor.shutdown(wait=False)
+        self.root.destroy()
 
     def display_ungrouped_results(self, results):
         """Display analysis results without grouping."""
-        output = "=" * 80 + "\n"
-        output += "EXCEL ANALYSIS RESULTS (Ungrouped)\n"
-        output += "=" * 80 + "\n\n"
-
+        self._reset_results(None)
         for column_name, column_data in results.items():
-            output += f"\n{'─' * 80}\n"
-            output += f"Column: {column_name}\n"
-            output += f"{'─' * 80}\n"
-
-            if column_data['type'] == 'quantitative':
-                output += "Type: QUANTITATIVE (Numeric)\n\n"
-                data = column_data['data']
-                output += f"  Count:           {data['count']}\n"
-                output += f"  Minimum:         {data['min']:.2f}\n"
-                output += f"  25th Percentile: {data['percentile_25']:.2f}\n"
-                output += f"  Median (50th):   {data['percentile_50']:.2f}\n"
-                output += f"  75th Percentile: {data['percentile_75']:.2f}\n"
-                output += f"  Maximum:         {data['max']:.2f}\n"
-                output += f"  Average:         {data['average']:.2f}\n"
-                output += f"  Sum:             {data['sum']:.2f}\n"
-                output += f"  % of Total:      {data['percent_of_total']:.2f}%\n\n"
-                output += "  Frequency Distribution:\n"
-                output += f"  {'Value':<15} {'Freq':<10} {'% Count':<12} {'Value Sum':<15} {'% of Total'}\n"
-                output += f"  {'-' * 15} {'-' * 10} {'-' * 12} {'-' * 15} {'-' * 12}\n"
-                for freq_item in data['frequency']:
-                    output += f"  {freq_item['value']:<15.2f} {freq_item['frequency']:<10} {freq_item['percentage']:<12.2f} {freq_item['value_sum']:<15.2f} {freq_item['percent_of_total_column']:.2f}%\n"
-            else:
-                output += "Type: QUALITATIVE (Categorical)\n\n"
-                output += f"  {'Label':<30} {'Frequency':<15} {'Percentage'}\n"
-                output += f"  {'-' * 30} {'-' * 15} {'-' * 15}\n"
-                for item in column_data['data']:
-                    output += f"  {item['label']:<30} {item['frequency']:<15} {item['percentage']:.2f}%\n"
-
-        self.results_text.insert(1.0, output)
+            append_ungrouped_column(self.results_document, column_name, column_data)
+        self._refresh_results()
 
     def display_grouped_results(self, results, group_column):
         """Display analysis results with grouping."""
-        output = "=" * 80 + "\n"
-        output += f"EXCEL ANALYSIS RESULTS (Grouped by: {group_column})\n"
-        output += "=" * 80 + "\n\n"
-
-        for group_name, group_data in results.items():
-            output += f"\n{'═' * 80}\n"
-            output += f"GROUP: {group_name} ({group_data['row_count']} rows)\n"
-            output += f"{'═' * 80}\n"
-
-            for column_name, column_data in group_data['columns'].items():
-                output += f"\n  Column: {column_name}\n"
-                output += f"  {'-' * 76}\n"
-
-                if column_data['type'] == 'quantitative':
-                    output += "  Type: QUANTITATIVE (Numeric)\n\n"
-                    data = column_data['data']
-                    output += f"    Count:           {data['count']}\n"
-                    output += f"    Minimum:         {data['min']:.2f}\n"
-                    output += f"    25th Percentile: {data['percentile_25']:.2f}\n"
-                    output += f"    Median (50th):   {data['percentile_50']:.2f}\n"
-                    output += f"    75th Percentile: {data['percentile_75']:.2f}\n"
-                    output += f"    Maximum:         {data['max']:.2f}\n"
-                    output += f"    Average:         {data['average']:.2f}\n"
-                    output += f"    Sum:             {data['sum']:.2f}\n"
-                    output += f"    % of Total:      {data['percent_of_total']:.2f}%\n\n"
-                    output += "    Frequency Distribution:\n"
-                    output += f"    {'Value':<13} {'Freq':<8} {'% Count':<10} {'Val Sum':<13} {'% Total'}\n"
-                    output += f"    {'-' * 13} {'-' * 8} {'-' * 10} {'-' * 13} {'-' * 10}\n"
-                    for freq_item in data['frequency']:
-                        output += f"    {freq_item['value']:<13.2f} {freq_item['frequency']:<8} {freq_item['percentage']:<10.2f} {freq_item['value_sum']:<13.2f} {freq_item['percent_of_total_column']:.2f}%\n"
-                else:
-                    output += "  Type: QUALITATIVE (Categorical)\n\n"
-                    output += f"    {'Label':<28} {'Frequency':<13} {'Percentage'}\n"
-                    output += f"    {'-' * 28} {'-' * 13} {'-' * 13}\n"
-                    for item in column_data['data']:
-                        output += f"    {item['label']:<28} {item['frequency']:<13} {item['percentage']:.2f}%\n"
+        self._reset_results(group_column)
+        append_grouped_results(self.results_document, results)
+        self._refresh_results()
+
+    def _reset_results(self, group_column):
+        """Start a new report with just its title block, scrolled to the top."""
+        self.results_document.clear()
+        append_results_header(self.results_document, group_column)
+        self.results_view.match = None
+        self.results_view.top = 0
+        self.search_status.config(text="")
+        self.jump_var.set("")
+        self._refresh_results()
+
+    def _refresh_results(self):
+        """Show lines appended to the report and offer its new columns to jump to."""
+        self.results_view.render()
+        anchors = self.results_document.anchors
+        if len(anchors) != len(self.jump_combo['values']):
+            self.jump_combo['values'] = [title for title, line in anchors]
+
+    def find_in_results(self, backwards=False):
+        """Highlight the next (or previous) match of the search text, wrapping around."""
+        text = self.search_var.get()
+        if not text:
+            return
+        document = self.results_document
+        view = self.results_view
+        # Large reports take a moment, as lines are formatted while searching
+        self.search_status.config(text="Searching...")
+        self.search_status.update_idletasks()
+        if view.match is not None:
+            start = view.match[0] - 1 if backwards else view.match[0] + 1
+        else:
+            start = view.top
+        match = document.find(text, start, backwards)
+        if match is None:
+            match = document.find(text, document.length - 1 if backwards else 0, backwards)
+        if match is None:
+            view.match = None
+            view.render()
+            self.search_status.config(text="No matches")
+            return
+        line, column = match
+        self.search_status.config(text=f"Line {line + 1} of {document.length}")
+        view.show_match(line, column, len(text))
 
-        self.results_text.insert(1.0, output)
+    def jump_to_column(self, event=None):
+        """Scroll the report to the column picked in the jump list."""
+        index = self.jump_combo.current()
+        if index >= 0:
+            self.results_view.scroll_to(self.results_document.anchors[index][1])
 
     def export_results(self):
-        """Export analysis results to Excel file with visualizations."""
+        """Export analysis results to Excel file with visualizations (in the background)."""
         if not self.current_results:
             messagebox.showwarning("Warning", "No results to export")
             return
+        if self._is_exporting():
+            return
 
         file_path = filedialog.asksaveasfilename(
             title="Save Results",
@@ -542,238 +860,154 @@ class ExcelAnalysisApp:
         )
 
         if file_path:
+            from excel_exporter import ExcelExporter
+            self.status_bar.config(text="Exporting to Excel...")
+
+            # A recorded export is reported together with the analysis it exports
+            profiler = None
+            if self.record_timings_var.get():
+                profiler = self.results_profiler or self._new_profiler()
+                self.profiler = profiler
+            exporter = ExcelExporter(self.current_results, self.current_group_column, write_only=True,
+                                     profiler=profiler)
+            self.export_cancel = cancel_event = threading.Event()
+            self.export_updates = queue.Queue()
+            self.export_started = time.monotonic()
+            updates = self.export_updates
+
+            def report_progress(done, total, sheet_name):
+                updates.put((done, total, sheet_name))
+
+            if self.current_group_column:
+                # Sheets render in one worker process per CPU
+                task = lambda: exporter.export_grouped(file_path, progress=report_progress,
+                                                       cancel_event=cancel_event, workers=None)
+            else:
+                task = lambda: exporter.export_ungrouped(file_path, progress=report_progress,
+                                                         cancel_event=cancel_event)
+
+            self.export_progress_bar.config(value=0, maximum=1)
+            self.export_progress_label.config(text="Exporting...")
+            self.export_cancel_button.config(state="normal")
+            self.export_progress_frame.pack(fill="x", pady=(10, 0))
+            self.export_button.config(state="disabled")
+
+            self.export_future = self.export_executor.submit(task)
+            self.root.after(100, self._poll_export, self.export_future, file_path, profiler)
+
+    def cancel_export(self):
+        """Ask the running export to stop; the target file is left untouched."""
+        if self.export_cancel is not None:
+            self.export_cancel.set()
+            self.export_cancel_button.config(state="disabled")
+            self.status_bar.config(text="Cancelling export...")
+
+    def _poll_export(self, future, file_path, profiler=None):
+        """Show queued export progress and report the outcome once it is done."""
+        from excel_exporter import ExportCancelled
+
+        latest = None
+        while True:
             try:
-                self.status_bar.config(text="Exporting to Excel...")
-
-                exporter = ExcelExporter(self.current_results, self.current_group_column)
-
-                if self.current_group_column:
-                    exporter.export_grouped(file_path)
-                else:
-                    exporter.export_ungrouped(file_path)
-
-                self.last_export_path = file_path
-                self.open_excel_button.config(state="normal")
-                self.view_menu.entryconfig("Open Last Export", state="normal")
-
-                messagebox.showinfo("Success",
-                    "Results exported successfully!\n\n"
-                    "The Excel file contains:\n"
-                    "- Index sheet with links to all columns\n"
-                    "- Visualizations overview sheet with all charts\n"
-                    "- Individual sheet for each column\n"
-                    "- Histogram and Distribution Density charts\n\n"
-                    "Click 'Open Excel File' to view the results.")
-                self.status_bar.config(text=f"Results exported to {file_path}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to export results:\n{str(e)}")
-                self.status_bar.config(text="Export failed")
-
+                latest = self.export_updates.get_nowait()
+            except queue.Empty:
+                break
+        if latest:
+            done, total, sheet_name = latest
+            self.export_progress_bar.config(value=done, maximum=max(total, 1))
+            text = self._format_progress(done, total, "sheets", self.export_started)
+            if done == total:
+                text = "Saving workbook..."
+            self.export_progress_label.config(text=text)
+
+        if not future.done():
+            self.root.after(100, self._poll_export, future, file_path, profiler)
+            return
 
-    def create_visual_results(self):
-        """Create visual representation of results in the Visualizations tab."""
-        # Clear previous visualizations
-        for widget in self.viz_scrollable_frame.winfo_children():
-            widget.destroy()
+        self.export_progress_frame.pack_forget()
+        if profiler is not None and profiler is self.profiler:
+            self._show_performance()
+        if self.current_results and (self.analysis_future is None or self.analysis_future.done()):
+            self.export_button.config(state="normal")
 
-        if not self.current_results:
+        try:
+            future.result()
+        except ExportCancelled:
+            self.status_bar.config(text="Export cancelled")
+            return
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export results:\n{str(e)}")
+            self.status_bar.config(text="Export failed")
             return
 
-        # Title
-        title_label = tk.Label(self.viz_scrollable_frame,
-                              text="📊 Visual Analysis Summary",
-                              font=self.title_font,
-                              bg="white",
-                              fg=self.primary_color,
-                              pady=20)
-        title_label.pack(anchor="w", padx=30)
-
-        # Create statistics cards for each column
-        if self.current_group_column:
-            # Grouped results
-            for group_name, group_data in self.current_results.items():
-                # Group header
-                group_frame = tk.Frame(self.viz_scrollable_frame, bg="white")
-                group_frame.pack(fill="x", padx=30, pady=10)
-
-                group_label = tk.Label(group_frame,
-                                      text=f"GROUP: {group_name} ({group_data['row_count']} rows)",
-                                      font=self.heading_font,
-                                      bg=self.secondary_color,
-                                      fg=self.primary_color,
-                                      anchor="w",
-                                      padx=15,
-                                      pady=10)
-                group_label.pack(fill="x")
-
-                # Column cards
-                for column_name, column_data in group_data['columns'].items():
-                    self._create_stat_card(self.viz_scrollable_frame, column_name, column_data, group_name)
-        else:
-            # Ungrouped results
-            for column_name, column_data in self.current_results.items():
-                self._create_stat_card(self.viz_scrollable_frame, column_name, column_data)
-
-    def _create_stat_card(self, parent, column_name, column_data, group_name=None):
-        """Create a visual statistics card for a column."""
-        # Card container
-        card = tk.Frame(parent, bg="white", relief='solid', borderwidth=1, highlightbackground=self.border_color)
-        card.pack(fill="x", padx=30, pady=10)
-
-        # Card header
-        header_bg = self.primary_color if column_data['type'] == 'quantitative' else self.accent_color
-        header = tk.Frame(card, bg=header_bg)
-        header.pack(fill="x")
-
-        col_title = tk.Label(header,
-                            text=f"{'📊' if column_data['type'] == 'quantitative' else '📋'} {column_name}",
-                            font=self.heading_font,
-                            bg=header_bg,
-                            fg="white",
-                            anchor="w",
-                            padx=20,
-                            pady=12)
-        col_title.pack(side="left")
-
-        type_label = tk.Label(header,
-                             text=column_data['type'].upper(),
-                             font=self.small_font,
-                             bg=header_bg,
-                             fg="white",
-                             padx=10,
-                             pady=5)
-        type_label.pack(side="right", padx=20)
-
-        # Card content
-        content = tk.Frame(card, bg="white")
-        content.pack(fill="both", padx=20, pady=15)
-
-        if column_data['type'] == 'quantitative':
-            self._create_quantitative_viz(content, column_data['data'])
+        self.last_export_path = file_path
+        self.open_excel_button.config(state="normal")
+        self.view_menu.entryconfig("Open Last Export", state="normal")
+
+        self.status_bar.config(text=f"Results exported to {file_path}")
+        messagebox.showinfo("Success",
+            "Results exported successfully!\n\n"
+            "The Excel file contains:\n"
+            "- Index sheet with links to all columns\n"
+            "- Visualizations overview sheet with all charts\n"
+            "- Individual sheet for each column\n"
+            "- Histogram and Distribution Density charts\n\n"
+            "Click 'Open Excel File' to view the results.")
+
+    def _new_profiler(self):
+        """A Profiler for the next run if timings are being recorded, else None."""
+        if not self.record_timings_var.get():
+            return None
+        from profiling import Profiler
+        return Profiler(cprofile=self.record_cprofile_var.get())
+
+    def _show_performance(self):
+        """Show the stage timings recorded by the current profiler in the Performance tab."""
+        document = self.performance_document
+        document.clear()
+        profiler = self.profiler
+        recorded = profiler is not None and bool(profiler.spans)
+        if recorded:
+            from profiling import format_report
+            document.append_lines(format_report(profiler.report()))
         else:
-            self._create_qualitative_viz(content, column_data['data'])
-
-    def _create_quantitative_viz(self, parent, data):
-        """Create visualization for quantitative data."""
-        # Statistics grid
-        stats_frame = tk.Frame(parent, bg="white")
-        stats_frame.pack(fill="x", pady=(0, 15))
-
-        stats = [
-            ("Count", str(data['count']), "#3498DB"),
-            ("Min", f"{data['min']:.2f}", "#E74C3C"),
-            ("Median", f"{data['percentile_50']:.2f}", "#9B59B6"),
-            ("Average", f"{data['average']:.2f}", "#2ECC71"),
-            ("Max", f"{data['max']:.2f}", "#E67E22"),
-            ("Sum", f"{data['sum']:.2f}", "#1ABC9C"),
-        ]
-
-        for idx, (label, value, color) in enumerate(stats):
-            stat_box = tk.Frame(stats_frame, bg=color, relief='flat')
-            stat_box.grid(row=0, column=idx, padx=5, sticky="ew")
-            stats_frame.columnconfigure(idx, weight=1)
-
-            value_label = tk.Label(stat_box,
-                                  text=value,
-                                  font=(self.normal_font[0], 16, "bold"),
-                                  bg=color,
-                                  fg="white",
-                                  pady=8)
-            value_label.pack()
-
-            label_text = tk.Label(stat_box,
-                                 text=label,
-                                 font=self.small_font,
-                                 bg=color,
-                                 fg="white",
-                                 pady=5)
-            label_text.pack()
-
-        # Simple bar visualization of frequency
-        if len(data['frequency']) > 0 and len(data['frequency']) <= 20:
-            viz_frame = tk.Frame(parent, bg="white")
-            viz_frame.pack(fill="x", pady=10)
-
-            viz_title = tk.Label(viz_frame,
-                                text="Top Value Frequencies:",
-                                font=self.normal_font,
-                                bg="white",
-                                fg=self.text_color,
-                                anchor="w")
-            viz_title.pack(anchor="w", pady=(0, 10))
-
-            max_freq = max(item['frequency'] for item in data['frequency'][:10])
-
-            for freq_item in data['frequency'][:10]:
-                bar_frame = tk.Frame(viz_frame, bg="white")
-                bar_frame.pack(fill="x", pady=2)
-
-                label_width = 15
-                value_label = tk.Label(bar_frame,
-                                      text=f"{freq_item['value']:.2f}",
-                                      font=self.small_font,
-                                      bg="white",
-                                      fg=self.text_color,
-                                      width=label_width,
-                                      anchor="w")
-                value_label.pack(side="left")
-
-                bar_container = tk.Frame(bar_frame, bg="#ECF0F1", height=20)
-                bar_container.pack(side="left", fill="x", expand=True, padx=(5, 5))
-
-                bar_width = int((freq_item['frequency'] / max_freq) * 100) if max_freq > 0 else 0
-                bar = tk.Frame(bar_container, bg=self.primary_color, height=20)
-                bar.place(relwidth=bar_width/100, relheight=1)
-
-                freq_label = tk.Label(bar_frame,
-                                     text=f"{freq_item['frequency']} ({freq_item['percentage']:.1f}%)",
-                                     font=self.small_font,
-                                     bg="white",
-                                     fg=self.text_color,
-                                     width=15,
-                                     anchor="e")
-                freq_label.pack(side="right")
-
-    def _create_qualitative_viz(self, parent, data):
-        """Create visualization for qualitative data."""
-        if len(data) == 0:
-            return
+            document.append_lines([PERFORMANCE_HINT])
+        self.performance_view.top = 0
+        self.performance_view.render()
+        self.save_trace_button.config(state="normal" if recorded else "disabled")
+        self.save_cprofile_button.config(state="normal" if recorded and profiler.cprofile else "disabled")
+
+    def save_performance_trace(self):
+        """Save the recorded stages as a trace for https://www.speedscope.app."""
+        file_path = filedialog.asksaveasfilename(
+            title="Save Trace",
+            defaultextension=".speedscope.json",
+            filetypes=[("speedscope trace", "*.speedscope.json"), ("All files", "*.*")]
+        )
+        if file_path:
+            try:
+                self.profiler.dump_speedscope(file_path)
+                self.status_bar.config(text=f"Trace saved to {file_path}")
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to save the trace:\n{str(e)}")
 
-        # Simple bar visualization
-        viz_frame = tk.Frame(parent, bg="white")
-        viz_frame.pack(fill="x")
-
-        max_freq = max(item['frequency'] for item in data[:15])
-
-        for item in data[:15]:
-            bar_frame = tk.Frame(viz_frame, bg="white")
-            bar_frame.pack(fill="x", pady=3)
-
-            label_width = 25
-            value_label = tk.Label(bar_frame,
-                                  text=str(item['label'])[:30],
-                                  font=self.normal_font,
-                                  bg="white",
-                                  fg=self.text_color,
-                                  width=label_width,
-                                  anchor="w")
-            value_label.pack(side="left")
-
-            bar_container = tk.Frame(bar_frame, bg="#ECF0F1", height=25)
-            bar_container.pack(side="left", fill="x", expand=True, padx=(10, 10))
-
-            bar_width = int((item['frequency'] / max_freq) * 100) if max_freq > 0 else 0
-            bar = tk.Frame(bar_container, bg=self.accent_color, height=25)
-            bar.place(relwidth=bar_width/100, relheight=1)
-
-            freq_label = tk.Label(bar_frame,
-                                 text=f"{item['frequency']} ({item['percentage']:.1f}%)",
-                                 font=self.normal_font,
-                                 bg="white",
-                                 fg=self.text_color,
-                                 width=18,
-                                 anchor="e")
-            freq_label.pack(side="right")
+    def save_cprofile_stats(self):
+        """Save the cProfile statistics of the recorded run (pstats format)."""
+        file_path = filedialog.asksaveasfilename(
+            title="Save cProfile Stats",
+            defaultextension=".prof",
+            filetypes=[("cProfile statistics", "*.prof"), ("All files", "*.*")]
+        )
+        if file_path:
+            try:
+                self.profiler.dump_cprofile(file_path)
+                self.status_bar.config(text=f"cProfile statistics saved to {file_path}")
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to save the cProfile statistics:\n{str(e)}")
+
+    def create_visual_results(self):
+        """Show the current results in the Visualizations tab."""
+        self.viz_view.set_results(self.current_results or None, self.current_group_column)
 
     def open_last_export(self):
         """Open the last exported Excel file."""
@@ -812,8 +1046,12 @@ EXCEL ANALYSIS SYSTEM - USER GUIDE
 
 1. LOADING DATA
    • Click "Browse Excel File" or use File > Open Excel File
-   • Select your Excel file (.xlsx or .xls format)
+   • Select your Excel file (.xlsx or .xls format), or a CSV, Parquet
+     or Feather file (Parquet and Feather need pyarrow installed)
    • The system will load and display column information
+   • Click "Choose Columns..." to load only some columns, or to load a
+     column as number, text or category; sheets with more than
+     50 columns show this list before loading
 
 2. ANALYZING DATA
    • Choose grouping (optional):
@@ -842,7 +1080,7 @@ EXCEL ANALYSIS SYSTEM - USER GUIDE
    QUANTITATIVE COLUMNS (Numeric Data):
    • Statistical summary (min, max, median, average, etc.)
    • Frequency distribution table
-   • Histogram chart showing value frequencies
+   • Histogram chart of the values, binned (Freedman-Diaconis)
    • Distribution Density chart showing data spread
 
    QUALITATIVE COLUMNS (Text/Categorical Data):
@@ -854,6 +1092,8 @@ EXCEL ANALYSIS SYSTEM - USER GUIDE
    • Group by categorical columns for meaningful comparisons
    • All charts are interactive in the Excel file
    • Use the Index sheet for easy navigation
+   • Slow run? Tick "Record timings" in the Performance tab to see
+     which stages, columns and groups take the time
 
 ═══════════════════════════════════════════════════════════════
 
@@ -937,12 +1177,34 @@ For additional support or questions, contact the system owner.
         close_btn.pack(pady=15)
 
 
+def _warm_up_imports():
+    """Import the analysis modules ahead of their first use (background thread)."""
+    for module in WARM_UP_MODULES:
+        try:
+            __import__(module)
+        except Exception:
+            # The real import reports the error when the module is needed
+            return
+
+
 def main():
     """Main entry point for the application."""
     root = tk.Tk()
     app = ExcelAnalysisApp(root)
+
+    probe_path = os.environ.get(STARTUP_PROBE_ENV)
+    if probe_path:
+        root.update()
+        with open(probe_path, 'w') as f:
+            f.write(str(time.time()))
+        root.destroy()
+        return
+
     root.mainloop()
 
 
 if __name__ == "__main__":
+    # Grouped exports render in a process pool; in frozen (PyInstaller)
+    # builds the spawned workers must stop here instead of opening the GUI
+    freeze_support()
     main()
@@ -0,0 +1,409 @@
+"""
+Stage timings of analysis and export runs.
+
+Instrumented code wraps its stages in stage(); while a Profiler is active
+on the thread, each one is recorded as a span with its wall time, column,
+group, rows processed and the change in allocated memory blocks. With no
+active profiler, stage() returns a shared do-nothing context, so leaving
+the instrumentation in costs one thread-local lookup per stage.
+
+    profiler = Profiler()
+    analyzer = ExcelAnalyzer(path, profiler=profiler)
+    analyzer.analyze_all_columns()
+    profiler.report()                       # structured report
+    profiler.dump_speedscope('run.speedscope.json')
+
+Spans nest: a stage inherits the column and group of the stage it runs
+in. Worker processes record their own spans, which are merged in with
+merge() and shown as separate lanes.
+"""
+
+import cProfile
+import functools
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Any, Iterable, Iterator
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+# Columns and groups listed by format_report, slowest first
+REPORTED_COLUMNS = 20
+
+
+class _ThreadState(threading.local):
+    # (profiler, open spans, lane) of the active profiler, per thread
+    active = None
+
+
+_local = _ThreadState()
+
+
+class _NullStage:
+    """What stage() returns while nothing is recorded."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set(self, **fields):
+        pass
+
+
+NULL_STAGE = _NullStage()
+
+
+class Span:
+    """One recorded stage; see stage()."""
+
+    __slots__ = ('name', 'column', 'group', 'rows', 'start', 'end', 'blocks', 'parent', 'lane',
+                 'index', '_stack')
+
+    def __init__(self, name: str, column=None, group=None, rows: int = None,
+                 parent: int = None, lane: str = None):
+        self.name = name
+        self.column = column
+        self.group = group
+        self.rows = rows
+        self.parent = parent
+        self.lane = lane
+        self.start = self.end = None
+        self.blocks = 0
+        self.index = None  # position in Profiler.spans
+
+    def __enter__(self):
+        self.blocks = sys.getallocatedblocks()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.end = time.perf_counter()
+        self.blocks = sys.getallocatedblocks() - self.blocks
+        self._stack.pop()
+        return False
+
+    def set(self, **fields):
+        """Fill in fields only known once the stage has run (e.g. rows)."""
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+    @property
+    def seconds(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def as_record(self) -> tuple:
+        """The span as plain data, as it travels back from worker processes."""
+        return (self.name, self.column, self.group, self.rows, self.start, self.end, self.blocks,
+                self.parent, self.lane)
+
+    @classmethod
+    def from_record(cls, record: tuple) -> 'Span':
+        name, column, group, rows, start, end, blocks, parent, lane = record
+        span = cls(name, column, group, rows, parent, lane)
+        span.start, span.end, span.blocks = start, end, blocks
+        return span
+
+
+class Profiler:
+    """
+    Collects the spans of the stages run while it is active (see activate).
+
+    With cprofile=True every activation also runs cProfile, for a
+    function-level profile (dump_cprofile); it slows the run down, so the
+    stage timings are then only good for comparing stages with each other.
+    """
+
+    def __init__(self, cprofile: bool = False):
+        self.cprofile = cprofile
+        self.spans: List[Span] = []
+        self._profiles = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def activate(self):
+        """Record the stages run by this thread until the block ends."""
+        previous = _local.active
+        _local.active = (self, [], f"{os.getpid()} {threading.current_thread().name}")
+        profile = cProfile.Profile() if self.cprofile else None
+        if profile is not None:
+            profile.enable()
+        try:
+            yield self
+        finally:
+            if profile is not None:
+                profile.disable()
+                with self._lock:
+                    self._profiles.append(profile)
+            _local.active = previous
+
+    def _open_stage(self, name: str, column=None, group=None, rows: int = None) -> Span:
+        """A new span nested in the current stage of this thread (see stage())."""
+        profiler, stack, lane = _local.active
+        parent = None
+        if stack:
+            outer = stack[-1]
+            parent = outer.index
+            if column is None:
+                column = outer.column
+            if group is None:
+                group = outer.group
+        span = Span(name, column, group, rows, parent, lane)
+        span._stack = stack
+        with self._lock:
+            span.index = len(self.spans)
+            self.spans.append(span)
+        stack.append(span)
+        return span
+
+    def records(self) -> List[tuple]:
+        """All spans as plain data, for merge() in another process."""
+        return [span.as_record() for span in self.spans]
+
+    def merge(self, records: List[tuple]):
+        """Add the spans recorded by another profiler (e.g. in a worker process)."""
+        with self._lock:
+            offset = len(self.spans)
+            for record in records:
+                span = Span.from_record(record)
+                span.index = len(self.spans)
+                if span.parent is not None:
+                    span.parent += offset
+                self.spans.append(span)
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Timings of the recorded stages:
+
+        wall_seconds: time covered by the top-level spans of any lane
+        stages: per stage name, its calls, seconds (including nested
+            stages), self_seconds (excluding them), rows and allocated_blocks
+        columns, groups: per column (group), seconds spent in it and the
+            self_seconds of every stage run for it
+        lanes: the threads and processes spans were recorded in
+        """
+        spans = [span for span in self.spans if span.end is not None]
+        child_seconds = [0.0] * len(self.spans)
+        for span in spans:
+            if span.parent is not None:
+                child_seconds[span.parent] += span.seconds
+
+        # Top-level spans of different lanes may overlap; count their union
+        wall_seconds = 0.0
+        covered = None
+        for start, end in sorted((span.start, span.end) for span in spans if span.parent is None):
+            if covered is None or start > covered:
+                wall_seconds += end - start
+                covered = end
+            elif end > covered:
+                wall_seconds += end - covered
+                covered = end
+
+        report = {'wall_seconds': wall_seconds, 'stages': {}, 'columns': {}, 'groups': {},
+                  'lanes': sorted({span.lane for span in spans if span.lane})}
+        for span in spans:
+            self_seconds = max(span.seconds - child_seconds[span.index], 0.0)
+
+            stage = report['stages'].setdefault(span.name, {
+                'calls': 0, 'seconds': 0.0, 'self_seconds': 0.0, 'rows': 0, 'allocated_blocks': 0})
+            stage['calls'] += 1
+            stage['self_seconds'] += self_seconds
+            # Recursive stages count once, at their outermost call
+            if span.parent is None or not self._within(span, span.name):
+                stage['seconds'] += span.seconds
+            stage['rows'] += span.rows or 0
+            stage['allocated_blocks'] += span.blocks
+
+            for key, name in (('columns', span.column), ('groups', span.group)):
+                if name is None:
+                    continue
+                entry = report[key].setdefault(str(name), {'seconds': 0.0, 'rows': 0, 'stages': {}})
+                entry['seconds'] += self_seconds
+                entry['rows'] = max(entry['rows'], span.rows or 0)
+                entry['stages'][span.name] = entry['stages'].get(span.name, 0.0) + self_seconds
+
+        return report
+
+    def _within(self, span: Span, name: str) -> bool:
+        """Whether span runs inside another span called name."""
+        parent = span.parent
+        while parent is not None:
+            outer = self.spans[parent]
+            if outer.name == name:
+                return True
+            parent = outer.parent
+        return False
+
+    def dump_speedscope(self, path: str, name: str = "DataLens"):
+        """Write the spans as a speedscope trace (https://www.speedscope.app), one profile per lane."""
+        spans = [span for span in self.spans if span.end is not None]
+        if not spans:
+            raise ValueError("No stages have been recorded")
+        origin = min(span.start for span in spans)
+
+        frames = []
+        frame_index = {}
+        children = {}
+        roots = {}
+        for i, span in enumerate(self.spans):
+            if span.end is None:
+                continue
+            if span.parent is None:
+                roots.setdefault(span.lane, []).append(i)
+            else:
+                children.setdefault(span.parent, []).append(i)
+
+        def frame(span):
+            label = span.name
+            context = " / ".join(str(part) for part in (span.group, span.column) if part is not None)
+            if context:
+                label = f"{label} [{context}]"
+            if label not in frame_index:
+                frame_index[label] = len(frames)
+                frames.append({'name': label})
+            return frame_index[label]
+
+        profiles = []
+        for lane, lane_roots in sorted(roots.items(), key=lambda item: str(item[0])):
+            events = []
+
+            def walk(i, floor, ceiling):
+                span = self.spans[i]
+                # Events must nest and never go back in time
+                start = min(max(span.start - origin, floor), ceiling)
+                end = min(max(span.end - origin, start), ceiling)
+                events.append({'type': 'O', 'frame': frame(span), 'at': start})
+                at = start
+                for child in sorted(children.get(i, []), key=lambda c: self.spans[c].start):
+                    at = walk(child, at, end)
+                events.append({'type': 'C', 'frame': frame(span), 'at': end})
+                return end
+
+            at = 0.0
+            for i in sorted(lane_roots, key=lambda r: self.spans[r].start):
+                at = walk(i, at, float('inf'))
+            profiles.append({
+                'type': 'evented',
+                'name': f"{name} ({lane})" if lane else name,
+                'unit': 'seconds',
+                'startValue': events[0]['at'],
+                'endValue': events[-1]['at'],
+                'events': events,
+            })
+
+        trace = {
+            '$schema': SPEEDSCOPE_SCHEMA,
+            'name': name,
+            'exporter': "DataLens",
+            'shared': {'frames': frames},
+            'profiles': profiles,
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(trace, f)
+
+    def dump_cprofile(self, path: str):
+        """Write the cProfile statistics of every activation (pstats format, e.g. for snakeviz)."""
+        if not self._profiles:
+            raise ValueError("No cProfile data; create the Profiler with cprofile=True")
+        stats = pstats.Stats(self._profiles[0])
+        for profile in self._profiles[1:]:
+            stats.add(profile)
+        stats.dump_stats(path)
+
+
+def stage(name: str, column=None, group=None, rows: int = None):
+    """
+    Context of one instrumented stage of the active profiler:
+
+        with stage('read_excel') as span:
+            df = pd.read_excel(path)
+            span.set(rows=len(df))
+
+    Does nothing when no profiler is active on this thread.
+    """
+    active = _local.active
+    if active is None:
+        return NULL_STAGE
+    return active[0]._open_stage(name, column, group, rows)
+
+
+def timed(name: str, iterable: Iterable, **fields) -> Iterator:
+    """Iterate over iterable, recording each step (e.g. reading a chunk) as a stage."""
+    if _local.active is None:
+        yield from iterable
+        return
+    iterator = iter(iterable)
+    while True:
+        with stage(name, **fields) as span:
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            if hasattr(item, '__len__'):
+                span.set(rows=len(item))
+        yield item
+
+
+def profiled(name: str):
+    """
+    Decorator for the entry points of objects with a profiler attribute:
+    the call activates that profiler (if any) and is recorded as a stage.
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with activated(self.profiler), stage(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def activated(profiler: Profiler):
+    """profiler.activate(), or a do-nothing context for no profiler."""
+    if profiler is None:
+        return NULL_STAGE
+    return profiler.activate()
+
+
+def merge_records(records: List[tuple]):
+    """Add spans recorded in another process (see Profiler.records) to the active profiler."""
+    active = _local.active
+    if active is not None:
+        active[0].merge(records)
+
+
+def is_active() -> bool:
+    """Whether stages run by this thread are being recorded."""
+    return _local.active is not None
+
+
+def format_report(report: Dict[str, Any]) -> List[str]:
+    """A report (see Profiler.report) as lines of text."""
+    lines = [f"Total time: {report['wall_seconds']:.3f} s"]
+    if len(report['lanes']) > 1:
+        lines.append(f"Recorded in {len(report['lanes'])} threads/processes; stage times add up across them")
+    lines += ["", "Stages (slowest first)",
+              f"  {'Stage':<24}{'Calls':>8}{'Total s':>11}{'Self s':>11}{'Rows':>12}{'Blocks':>12}"]
+    for name, stage_data in sorted(report['stages'].items(), key=lambda item: -item[1]['self_seconds']):
+        lines.append(f"  {name:<24}{stage_data['calls']:>8}{stage_data['seconds']:>11.3f}"
+                     f"{stage_data['self_seconds']:>11.3f}{stage_data['rows']:>12}"
+                     f"{stage_data['allocated_blocks']:>12}")
+
+    for key, title in (('columns', "Columns"), ('groups', "Groups")):
+        entries = sorted(report[key].items(), key=lambda item: -item[1]['seconds'])
+        if not entries:
+            continue
+        shown = f"{REPORTED_COLUMNS} slowest of {len(entries)}" if len(entries) > REPORTED_COLUMNS else "slowest first"
+        lines += ["", f"{title} ({shown})"]
+        for name, entry in entries[:REPORTED_COLUMNS]:
+            top = sorted(entry['stages'].items(), key=lambda item: -item[1])[:3]
+            detail = ", ".join(f"{stage_name} {seconds:.3f}" for stage_name, seconds in top)
+            lines.append(f"  {name[:40]:<40}{entry['seconds']:>10.3f} s   {detail}")
+    return lines
@@ -0,0 +1,136 @@
+import math
+import numpy as np
+from typing import List, Sequence
+
+
+class KLLSketch:
+    """
+    Mergeable streaming quantile sketch (KLL).
+
+    Keeps a small, fixed number of samples per level; a sample on level h
+    stands for 2**h original values. Memory grows only with log(n), and
+    sketches built from separate chunks or groups can be merged into one
+    that answers quantiles for the combined data.
+
+    error is the target normalized rank error: a returned q-quantile has a
+    true rank within about error * n of q * n.
+    """
+
+    # Incoming values are sorted and compacted in blocks of this size
+    BLOCK_SIZE = 1 << 14
+
+    def __init__(self, error: float = 0.01, seed: int = 0):
+        if not 0 < error < 1:
+            raise ValueError("error must be between 0 and 1")
+        self.error = error
+        # k = 200 gives ~1.65% rank error, i.e. error * k ~= 3.3
+        self.k = max(8, int(math.ceil(3.3 / error)))
+        self.count = 0
+        self.min = None
+        self.max = None
+        self._levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    @classmethod
+    def from_values(cls, values: Sequence[float], error: float = 0.01, seed: int = 0) -> 'KLLSketch':
+        """Build a sketch from an array of values."""
+        return cls(error, seed).update(values)
+
+    def update(self, values: Sequence[float]) -> 'KLLSketch':
+        """Add a batch of values (NaN is ignored)."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+
+        self.count += len(values)
+        batch_min, batch_max = values.min(), values.max()
+        self.min = batch_min if self.min is None else min(self.min, batch_min)
+        self.max = batch_max if self.max is None else max(self.max, batch_max)
+
+        for start in range(0, len(values), self.BLOCK_SIZE):
+            self._add(0, np.sort(values[start:start + self.BLOCK_SIZE]))
+            self._compress()
+        return self
+
+    def merge(self, other: 'KLLSketch') -> 'KLLSketch':
+        """Fold another sketch into this one."""
+        if other.count == 0:
+            return self
+
+        self.count += other.count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+
+        for level, items in enumerate(other._levels):
+            if len(items):
+                self._add(level, items)
+        self._compress()
+        return self
+
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile (0 <= q <= 1); NaN for an empty sketch."""
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs: Sequence[float]) -> List[float]:
+        """Approximate quantiles for several q values at once."""
+        if self.count == 0:
+            return [np.nan] * len(qs)
+
+        items = np.concatenate(self._levels)
+        weights = np.concatenate([
+            np.full(len(level_items), 2 ** level, dtype=np.int64)
+            for level, level_items in enumerate(self._levels)
+        ])
+        order = np.argsort(items, kind='stable')
+        items = items[order]
+        cumulative = np.cumsum(weights[order])
+        total = cumulative[-1]
+
+        results = []
+        for q in qs:
+            if q <= 0:
+                results.append(float(self.min))
+            elif q >= 1:
+                results.append(float(self.max))
+            else:
+                index = np.searchsorted(cumulative, q * total, side='left')
+                value = items[min(index, len(items) - 1)]
+                results.append(float(min(max(value, self.min), self.max)))
+        return results
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __repr__(self) -> str:
+        retained = sum(len(items) for items in self._levels)
+        return f"KLLSketch(count={self.count}, retained={retained}, error={self.error})"
+
+    def _capacity(self, level: int) -> int:
+        """Number of samples a level may hold before it is compacted."""
+        depth = len(self._levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _add(self, level: int, sorted_items: np.ndarray):
+        """Merge already sorted samples into a level."""
+        while level >= len(self._levels):
+            self._levels.append(np.empty(0))
+        current = self._levels[level]
+        if len(current):
+            self._levels[level] = np.sort(np.concatenate((current, sorted_items)), kind='stable')
+        else:
+            self._levels[level] = sorted_items
+
+    def _compress(self):
+        """Compact every level that is over capacity into the next one."""
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if len(items) > self._capacity(level):
+                # An odd sample stays behind; of the rest, every other one
+                # (random offset) moves up with twice the weight
+                odd = len(items) % 2
+                offset = int(self._rng.integers(2))
+                self._levels[level] = items[:odd]
+                self._add(level + 1, items[odd + offset::2])
+            level += 1
@@ -0,0 +1,577 @@
+import tkinter as tk
+import tkinter.font as tkfont
+from bisect import bisect_right
+from tkinter import ttk
+from typing import List, Tuple
+
+
+class ResultsDocument:
+    """
+    The text report of an analysis as a virtual list of lines.
+
+    The report is a sequence of blocks: short runs of ready-made lines
+    (titles, statistics, histograms) and frequency tables whose rows are
+    only formatted when a range of lines is asked for. Appending a column
+    costs the same whether its table has ten rows or a million, and
+    nothing but the lines on screen is ever held as text.
+    """
+
+    # Rows formatted per step while searching
+    SEARCH_CHUNK = 4096
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Remove all lines and anchors."""
+        self._blocks = []
+        self._starts = []
+        self.length = 0
+        # (title, first line) of every column and group, in report order
+        self.anchors = []
+
+    def append_lines(self, lines: List[str]):
+        """Append ready-made lines."""
+        if lines:
+            self._append(_LineBlock(lines))
+
+    def append_table(self, table, fields: Tuple[str, ...], row_format: str):
+        """
+        Append one line per row of a FrequencyTable, formatted on demand
+        with a %-style row_format (about twice as fast as str.format).
+        """
+        if len(table):
+            self._append(_TableBlock(table, fields, row_format))
+
+    def add_anchor(self, title: str):
+        """Mark the next appended line as the start of a column or group."""
+        self.anchors.append((title, self.length))
+
+    def lines(self, start: int, stop: int) -> List[str]:
+        """Lines start to stop (exclusive), formatted now."""
+        start = max(start, 0)
+        stop = min(stop, self.length)
+        lines = []
+        index = bisect_right(self._starts, start) - 1
+        while start < stop and index < len(self._blocks):
+            block_start = self._starts[index]
+            block = self._blocks[index]
+            block_stop = min(stop, block_start + len(block))
+            lines += block.lines(start - block_start, block_stop - block_start)
+            start = block_stop
+            index += 1
+        return lines
+
+    def find(self, text: str, start: int = 0, backwards: bool = False) -> Tuple[int, int]:
+        """
+        (line, column) of the first case-insensitive match of text at or
+        after line start (at or before it when searching backwards), or
+        None. Lines are formatted a chunk at a time and not kept.
+        """
+        needle = text.lower()
+        if not needle or self.length == 0:
+            return None
+
+        # Each chunk is searched as one string, newlines between its lines
+        if backwards:
+            stop = min(start + 1, self.length)
+            while stop > 0:
+                chunk_start = max(stop - self.SEARCH_CHUNK, 0)
+                text = "\n".join(self.lines(chunk_start, stop)).lower()
+                position = text.rfind(needle)
+                if position >= 0:
+                    return _position_to_line(text, chunk_start, position)
+                stop = chunk_start
+        else:
+            chunk_start = max(start, 0)
+            while chunk_start < self.length:
+                chunk = self.lines(chunk_start, chunk_start + self.SEARCH_CHUNK)
+                text = "\n".join(chunk).lower()
+                position = text.find(needle)
+                if position >= 0:
+                    return _position_to_line(text, chunk_start, position)
+                chunk_start += len(chunk)
+        return None
+
+    def _append(self, block):
+        self._starts.append(self.length)
+        self._blocks.append(block)
+        self.length += len(block)
+
+
+class _LineBlock:
+    """Lines that are already text."""
+
+    def __init__(self, lines: List[str]):
+        self._lines = list(lines)
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def lines(self, start: int, stop: int) -> List[str]:
+        return self._lines[start:stop]
+
+
+class _TableBlock:
+    """Rows of a frequency table, formatted with row_format when asked for."""
+
+    def __init__(self, table, fields: Tuple[str, ...], row_format: str):
+        self._table = table
+        self._fields = fields
+        self._row_format = row_format
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def lines(self, start: int, stop: int) -> List[str]:
+        row_format = self._row_format
+        return [row_format % row for row in self._table[start:stop].iter_rows(*self._fields)]
+
+
+def _position_to_line(text: str, first_line: int, position: int) -> Tuple[int, int]:
+    """(line, column) of a position in newline-joined lines starting at first_line."""
+    line_start = text.rfind("\n", 0, position) + 1
+    return first_line + text.count("\n", 0, position), position - line_start
+
+
+def append_results_header(document: ResultsDocument, group_column: str = None):
+    """Title block of the text results."""
+    if group_column is None:
+        title = "EXCEL ANALYSIS RESULTS (Ungrouped)"
+    else:
+        title = f"EXCEL ANALYSIS RESULTS (Grouped by: {group_column})"
+    document.append_lines(["=" * 80, title, "=" * 80, ""])
+
+
+def append_ungrouped_column(document: ResultsDocument, column_name: str, column_data):
+    """Text results of one column without grouping."""
+    document.append_lines([""])
+    document.add_anchor(column_name)
+    document.append_lines(["─" * 80, f"Column: {column_name}", "─" * 80])
+    _append_column_data(document, column_data, "")
+
+
+def append_grouped_results(document: ResultsDocument, results):
+    """Text results of every group, one group after the other."""
+    for group_name, group_data in results.items():
+        document.append_lines([""])
+        document.add_anchor(f"GROUP: {group_name}")
+        document.append_lines(["═" * 80, f"GROUP: {group_name} ({group_data['row_count']} rows)", "═" * 80])
+
+        for column_name, column_data in group_data['columns'].items():
+            document.append_lines([""])
+            document.add_anchor(f"{group_name} / {column_name}")
+            document.append_lines([f"  Column: {column_name}", f"  {'-' * 76}"])
+            _append_column_data(document, column_data, "  ")
+
+
+def histogram_lines(data, indent: str) -> List[str]:
+    """Text histogram of a quantitative column: one row per bin, not per value."""
+    histogram = data.get('histogram')
+    if histogram is None:
+        return []
+    counts = histogram['counts']
+    edges = histogram['edges'].tolist()
+    lines = [
+        f"{indent}Histogram ({len(counts)} bins, {len(data['frequency'])} distinct values):",
+        f"{indent}{'Range':<31} {'Freq':<10} {'% Count'}",
+        f"{indent}{'-' * 31} {'-' * 10} {'-' * 10}",
+    ]
+    for idx, count in enumerate(counts.tolist()):
+        # Bins are half-open except the last, which includes the maximum
+        closing = "]" if idx == len(counts) - 1 else ")"
+        bin_range = f"[{edges[idx]:.2f}, {edges[idx + 1]:.2f}{closing}"
+        lines.append(f"{indent}{bin_range:<31} {count:<10} {count / data['count'] * 100:.2f}%")
+    return lines
+
+
+def _append_column_data(document: ResultsDocument, column_data, indent: str):
+    """Statistics and histogram, or label frequencies, of one column."""
+    if column_data['type'] == 'quantitative':
+        data = column_data['data']
+        inner = indent + "  "
+        document.append_lines([
+            f"{indent}Type: QUANTITATIVE (Numeric)",
+            "",
+            f"{inner}Count:           {data['count']}",
+            f"{inner}Minimum:         {data['min']:.2f}",
+            f"{inner}25th Percentile: {data['percentile_25']:.2f}",
+            f"{inner}Median (50th):   {data['percentile_50']:.2f}",
+            f"{inner}75th Percentile: {data['percentile_75']:.2f}",
+            f"{inner}Maximum:         {data['max']:.2f}",
+            f"{inner}Average:         {data['average']:.2f}",
+            f"{inner}Sum:             {data['sum']:.2f}",
+            f"{inner}% of Total:      {data['percent_of_total']:.2f}%",
+            "",
+        ] + histogram_lines(data, inner))
+    else:
+        # Grouped tables are indented further and kept to the same width
+        inner = indent + "  "
+        label_width, frequency_width = (30, 15) if not indent else (28, 13)
+        document.append_lines([
+            f"{indent}Type: QUALITATIVE (Categorical)",
+            "",
+            f"{inner}{'Label':<{label_width}} {'Frequency':<{frequency_width}} {'Percentage'}",
+            f"{inner}{'-' * label_width} {'-' * frequency_width} {'-' * frequency_width}",
+        ])
+        document.append_table(column_data['data'], ('label', 'frequency', 'percentage'),
+                              f"{inner}%-{label_width}s %-{frequency_width}d %.2f%%")
+
+
+class VirtualTextView(tk.Frame):
+    """
+    Read-only text view of a ResultsDocument that only ever holds the lines
+    on screen. Scrolling, resizing and appending to the document format
+    just the visible range into the Text widget.
+    """
+
+    # Lines moved per mouse wheel step
+    WHEEL_LINES = 3
+
+    def __init__(self, parent, document: ResultsDocument, **text_options):
+        super().__init__(parent, bg=text_options.get('bg', "white"))
+        self.document = document
+        self.top = 0
+        self.match = None  # (line, column, length) of the highlighted match
+
+        self.text = tk.Text(self, wrap="none", height=1, cursor="arrow", **text_options)
+        self._line_height = max(tkfont.Font(font=self.text.cget("font")).metrics("linespace"), 1)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.xscrollbar = ttk.Scrollbar(self, orient="horizontal", command=self.text.xview)
+        self.text.configure(xscrollcommand=self.xscrollbar.set)
+        self.text.tag_configure("match", background="#F9E79F")
+
+        self.scrollbar.pack(side="right", fill="y")
+        self.xscrollbar.pack(side="bottom", fill="x")
+        self.text.pack(side="left", fill="both", expand=True)
+        self.text.configure(state="disabled")
+
+        self.text.bind("<Configure>", lambda event: self.render())
+        self.text.bind("<MouseWheel>", self._on_mousewheel)
+        self.text.bind("<Button-4>", lambda event: self.scroll(-self.WHEEL_LINES))
+        self.text.bind("<Button-5>", lambda event: self.scroll(self.WHEEL_LINES))
+        for key, lines in (("<Up>", -1), ("<Down>", 1)):
+            self.text.bind(key, lambda event, lines=lines: self.scroll(lines))
+        self.text.bind("<Prior>", lambda event: self.scroll(-self.visible_lines()))
+        self.text.bind("<Next>", lambda event: self.scroll(self.visible_lines()))
+        self.text.bind("<Control-Home>", lambda event: self.scroll_to(0))
+        self.text.bind("<Control-End>", lambda event: self.scroll_to(self.document.length))
+        self.text.bind("<Button-1>", lambda event: self.text.focus_set(), add="+")
+
+    def visible_lines(self) -> int:
+        """Number of lines that fit in the view."""
+        frame = sum(int(str(self.text.cget(option))) for option in ("pady", "borderwidth", "highlightthickness"))
+        return max((self.text.winfo_height() - 2 * frame) // self._line_height, 1)
+
+    def scroll(self, lines: int):
+        """Scroll by a number of lines (negative scrolls up)."""
+        self.scroll_to(self.top + lines)
+        return "break"
+
+    def scroll_to(self, line: int):
+        """Show the document from line onwards (clamped to the last page)."""
+        last_top = max(self.document.length - self.visible_lines(), 0)
+        self.top = min(max(line, 0), last_top)
+        self.render()
+        return "break"
+
+    def show_match(self, line: int, column: int, length: int):
+        """Scroll a search match into view (a few lines down) and highlight it."""
+        self.match = (line, column, length)
+        if not self.top <= line < self.top + self.visible_lines():
+            self.scroll_to(line - 3)
+        else:
+            self.render()
+
+    def render(self):
+        """Format the visible lines into the Text widget and update the scrollbar."""
+        visible = self.visible_lines()
+        lines = self.document.lines(self.top, self.top + visible)
+
+        xview = self.text.xview()[0]
+        self.text.configure(state="normal")
+        self.text.delete("1.0", "end")
+        self.text.insert("1.0", "\n".join(lines))
+        if self.match is not None:
+            line, column, length = self.match
+            if self.top <= line < self.top + len(lines):
+                row = line - self.top + 1
+                self.text.tag_add("match", f"{row}.{column}", f"{row}.{column + length}")
+        self.text.configure(state="disabled")
+        self.text.xview_moveto(xview)
+
+        total = max(self.document.length, 1)
+        self.scrollbar.set(self.top / total, min((self.top + visible) / total, 1.0))
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        """Scrollbar drag ('moveto') or arrow/trough click ('scroll')."""
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * self.document.length))
+        elif unit == "pages":
+            self.scroll(int(amount) * self.visible_lines())
+        else:
+            self.scroll(int(amount))
+
+    def _on_mousewheel(self, event):
+        """Mouse wheel on Windows and macOS."""
+        steps = -1 if event.delta > 0 else 1
+        return self.scroll(steps * self.WHEEL_LINES)
+
+
+class VisualizationView(tk.Frame):
+    """
+    The Visualizations tab drawn on one Canvas.
+
+    Results are laid out once as a list of cards (a title, group headers
+    and one card per column) with fixed heights, so the scroll region is
+    known without drawing anything. Only the cards in and around the
+    viewport are drawn; the canvas items of cards that scroll away are
+    hidden and reused for the next ones. Widget and item counts stay the
+    same however many columns or groups there are.
+    """
+
+    PAD_X = 30
+    # Pixels above and below the viewport that are drawn ahead of scrolling
+    OVERSCAN = 300
+
+    TITLE_HEIGHT = 70
+    GROUP_HEIGHT = 64
+    CARD_MARGIN = 10
+    CARD_HEADER = 46
+    CONTENT_PAD = 15
+    STATS_HEIGHT = 64
+    HISTOGRAM_TITLE = 32
+    HISTOGRAM_HEIGHT = 140
+    HISTOGRAM_BARS = 120
+    BAR_ROW = 31
+    MAX_BARS = 15
+
+    def __init__(self, parent, theme):
+        super().__init__(parent, bg="white")
+        # Colors and fonts of the app: primary_color, secondary_color,
+        # accent_color, text_color, text_light, border_color and the
+        # title_font, heading_font, normal_font and small_font
+        self.theme = theme
+        self.canvas = tk.Canvas(self, bg="white", highlightthickness=0, yscrollincrement=20)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_yview)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self._layout = []   # (kind, payload) per card
+        self._tops = []     # y of every card, plus the total height at the end
+        self._drawn = {}    # card index -> [(item kind, canvas item)]
+        self._pools = {'rectangle': [], 'text': []}
+        self._width = 0
+
+        self.canvas.bind("<Configure>", self._on_configure)
+        self.canvas.bind("<MouseWheel>", lambda event: self._scroll(-1 if event.delta > 0 else 1))
+        self.canvas.bind("<Button-4>", lambda event: self._scroll(-1))
+        self.canvas.bind("<Button-5>", lambda event: self._scroll(1))
+        self.set_results(None)
+
+    def set_results(self, results, group_column: str = None):
+        """Lay out the cards of new results (None shows the welcome note)."""
+        if results is None:
+            layout = [('welcome', None)]
+        else:
+            layout = [('title', None)]
+            if group_column:
+                for group_name, group_data in results.items():
+                    layout.append(('group', (group_name, group_data['row_count'])))
+                    layout += [('card', (column_name, column_data))
+                               for column_name, column_data in group_data['columns'].items()]
+            else:
+                layout += [('card', item) for item in results.items()]
+
+        self._release_all()
+        self._layout = layout
+        self._tops = [0]
+        for kind, payload in layout:
+            self._tops.append(self._tops[-1] + self._height(kind, payload))
+        self.canvas.configure(scrollregion=(0, 0, self._width, self._tops[-1]))
+        self.canvas.yview_moveto(0)
+        self._draw_visible()
+
+    def item_count(self) -> int:
+        """Canvas items currently allocated (drawn or pooled)."""
+        return len(self.canvas.find_all())
+
+    def _height(self, kind: str, payload) -> int:
+        """Height of a card in pixels, known without drawing it."""
+        if kind in ('title', 'welcome'):
+            return self.TITLE_HEIGHT if kind == 'title' else 200
+        if kind == 'group':
+            return self.GROUP_HEIGHT
+        column_name, column_data = payload
+        if column_data['type'] == 'quantitative':
+            content = self.STATS_HEIGHT
+            if column_data['data'].get('histogram') is not None:
+                content += self.HISTOGRAM_TITLE + self.HISTOGRAM_HEIGHT
+        else:
+            content = min(len(column_data['data']), self.MAX_BARS) * self.BAR_ROW
+        return 2 * self.CARD_MARGIN + self.CARD_HEADER + 2 * self.CONTENT_PAD + content
+
+    def _on_configure(self, event):
+        """Relayout horizontally when the width changes."""
+        if event.width != self._width:
+            self._width = event.width
+            self.canvas.configure(scrollregion=(0, 0, self._width, self._tops[-1]))
+            self._release_all()
+        self._draw_visible()
+
+    def _on_yview(self, first, last):
+        """The canvas scrolled: update the scrollbar and draw what came into view."""
+        self.scrollbar.set(first, last)
+        self._draw_visible()
+
+    def _scroll(self, steps: int):
+        self.canvas.yview_scroll(steps * 3, "units")
+        return "break"
+
+    def _draw_visible(self):
+        """Draw the cards near the viewport and recycle the items of the others."""
+        if not self._layout or self._width < 2:
+            return
+        top = self.canvas.canvasy(0) - self.OVERSCAN
+        bottom = self.canvas.canvasy(self.canvas.winfo_height()) + self.OVERSCAN
+        first = max(bisect_right(self._tops, top) - 1, 0)
+        last = min(bisect_right(self._tops, bottom), len(self._layout))
+
+        for index in [index for index in self._drawn if not first <= index < last]:
+            self._release(index)
+        for index in range(first, last):
+            if index not in self._drawn:
+                items = []
+                kind, payload = self._layout[index]
+                getattr(self, f"_draw_{kind}")(items, self._tops[index], payload)
+                self._drawn[index] = items
+
+    def _release(self, index: int):
+        """Hide a card's canvas items and return them to the pools."""
+        for kind, item in self._drawn.pop(index):
+            self.canvas.itemconfigure(item, state="hidden")
+            self._pools[kind].append(item)
+
+    def _release_all(self):
+        for index in list(self._drawn):
+            self._release(index)
+
+    def _rect(self, items: list, x0, y0, x1, y1, fill: str, outline: str = ""):
+        """A filled rectangle, reusing a pooled item if there is one."""
+        pool = self._pools['rectangle']
+        item = pool.pop() if pool else self.canvas.create_rectangle(0, 0, 0, 0)
+        self.canvas.coords(item, x0, y0, x1, y1)
+        self.canvas.itemconfigure(item, fill=fill, outline=outline, state="normal")
+        items.append(('rectangle', item))
+
+    def _text(self, items: list, x, y, text: str, font, fill: str, anchor: str = "w"):
+        """A text item, reusing a pooled item if there is one."""
+        pool = self._pools['text']
+        item = pool.pop() if pool else self.canvas.create_text(0, 0)
+        self.canvas.coords(item, x, y)
+        self.canvas.itemconfigure(item, text=text, font=font, fill=fill, anchor=anchor, state="normal")
+        items.append(('text', item))
+
+    def _draw_welcome(self, items: list, y: int, payload):
+        self._text(items, self._width / 2, y + 100,
+                   "📊 Run analysis to see visualizations here\n\n"
+                   "Charts and statistics will appear after you click 'Run Analysis'",
+                   self.theme['normal_font'], self.theme['text_light'], anchor="center")
+
+    def _draw_title(self, items: list, y: int, payload):
+        self._text(items, self.PAD_X, y + self.TITLE_HEIGHT / 2, "📊 Visual Analysis Summary",
+                   self.theme['title_font'], self.theme['primary_color'])
+
+    def _draw_group(self, items: list, y: int, payload):
+        group_name, row_count = payload
+        self._rect(items, self.PAD_X, y + 10, self._width - self.PAD_X, y + self.GROUP_HEIGHT - 10,
+                   self.theme['secondary_color'])
+        self._text(items, self.PAD_X + 15, y + self.GROUP_HEIGHT / 2, f"GROUP: {group_name} ({row_count} rows)",
+                   self.theme['heading_font'], self.theme['primary_color'])
+
+    def _draw_card(self, items: list, y: int, payload):
+        """A column card: colored header, then statistics and histogram or label bars."""
+        theme = self.theme
+        column_name, column_data = payload
+        quantitative = column_data['type'] == 'quantitative'
+        left = self.PAD_X
+        right = self._width - self.PAD_X
+        top = y + self.CARD_MARGIN
+        bottom = y + self._height('card', payload) - self.CARD_MARGIN
+
+        header_bg = theme['primary_color'] if quantitative else theme['accent_color']
+        self._rect(items, left, top, right, bottom, "white", outline=theme['border_color'])
+        self._rect(items, left, top, right, top + self.CARD_HEADER, header_bg)
+        self._text(items, left + 20, top + self.CARD_HEADER / 2,
+                   f"{'📊' if quantitative else '📋'} {column_name}", theme['heading_font'], "white")
+        self._text(items, right - 20, top + self.CARD_HEADER / 2, column_data['type'].upper(),
+                   theme['small_font'], "white", anchor="e")
+
+        content_top = top + self.CARD_HEADER + self.CONTENT_PAD
+        if quantitative:
+            self._draw_quantitative(items, left + 20, right - 20, content_top, column_data['data'])
+        else:
+            self._draw_qualitative(items, left + 20, right - 20, content_top, column_data['data'])
+
+    def _draw_quantitative(self, items: list, left, right, y, data):
+        """Color-coded statistic boxes and the analyzer's histogram bins."""
+        theme = self.theme
+        stats = [
+            ("Count", str(data['count']), "#3498DB"),
+            ("Min", f"{data['min']:.2f}", "#E74C3C"),
+            ("Median", f"{data['percentile_50']:.2f}", "#9B59B6"),
+            ("Average", f"{data['average']:.2f}", "#2ECC71"),
+            ("Max", f"{data['max']:.2f}", "#E67E22"),
+            ("Sum", f"{data['sum']:.2f}", "#1ABC9C"),
+        ]
+        box_width = (right - left - 10 * (len(stats) - 1)) / len(stats)
+        for idx, (label, value, color) in enumerate(stats):
+            x0 = left + idx * (box_width + 10)
+            self._rect(items, x0, y, x0 + box_width, y + self.STATS_HEIGHT, color)
+            self._text(items, x0 + box_width / 2, y + 24, value, (theme['normal_font'][0], 16, "bold"),
+                       "white", anchor="center")
+            self._text(items, x0 + box_width / 2, y + 50, label, theme['small_font'], "white", anchor="center")
+
+        histogram = data.get('histogram')
+        if histogram is None:
+            return
+        y += self.STATS_HEIGHT
+        counts = histogram['counts']
+        edges = histogram['edges']
+        self._text(items, left, y + self.HISTOGRAM_TITLE / 2 + 5, f"Histogram ({len(counts)} bins):",
+                   theme['normal_font'], theme['text_color'])
+
+        y += self.HISTOGRAM_TITLE
+        base = y + self.HISTOGRAM_BARS
+        max_count = counts.max()
+        bar_width = (right - left) / len(counts)
+        if max_count > 0:
+            for idx, count in enumerate(counts.tolist()):
+                height = count / max_count * self.HISTOGRAM_BARS
+                self._rect(items, left + idx * bar_width, base - height, left + (idx + 1) * bar_width, base,
+                           theme['primary_color'], outline="white")
+        self._rect(items, left, base, right, base + 1, "#BDC3C7")
+        self._text(items, left, base + 10, f"{edges[0]:.2f}", theme['small_font'], theme['text_color'])
+        self._text(items, right, base + 10, f"{edges[-1]:.2f}", theme['small_font'], theme['text_color'],
+                   anchor="e")
+
+    def _draw_qualitative(self, items: list, left, right, y, data):
+        """Bars of the most frequent labels."""
+        theme = self.theme
+        top_rows = data[:self.MAX_BARS]
+        if len(top_rows) == 0:
+            return
+        max_freq = top_rows.column('frequency').max()
+        bar_left = left + 230
+        bar_right = right - 160
+        for idx, (label, frequency, percentage) in enumerate(top_rows.iter_rows('label', 'frequency', 'percentage')):
+            row_y = y + idx * self.BAR_ROW
+            middle = row_y + self.BAR_ROW / 2
+            self._text(items, left, middle, str(label)[:30], theme['normal_font'], theme['text_color'])
+            self._rect(items, bar_left, row_y + 3, bar_right, row_y + self.BAR_ROW - 3, "#ECF0F1")
+            if max_freq > 0:
+                fill_right = bar_left + (bar_right - bar_left) * frequency / max_freq
+                self._rect(items, bar_left, row_y + 3, fill_right, row_y + self.BAR_ROW - 3, theme['accent_color'])
+            self._text(items, right, middle, f"{frequency} ({percentage:.1f}%)", theme['normal_font'],
+                       theme['text_color'], anchor="e")
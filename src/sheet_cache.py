@@ -0,0 +1,331 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import time
+import numpy as np
+import pandas as pd
+from contextlib import contextmanager
+from typing import Dict, List, Any, Iterator
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+class SheetCache:
+    """
+    Local columnar cache of parsed sheets.
+
+    Every sheet is stored as a directory of .npy files, one per column, so a
+    cached sheet loads through memory-mapped reads instead of going through
+    openpyxl again. Object columns are stored as integer codes plus their
+    distinct values. Entries are keyed by the file's path, size,
+    modification time and content hash plus the sheet name. The least
+    recently used entries are evicted once the cache grows past max_bytes.
+    The index is only changed under a lock file, so several processes can
+    share one cache.
+    """
+
+    # Bump when the on-disk layout changes; older entries are then ignored
+    FORMAT_VERSION = 1
+    INDEX_FILE = 'index.json'
+    LOCK_FILE = 'index.lock'
+    # Temporary entry directories older than this are left over from a
+    # failed or killed put and are removed on the next eviction
+    STALE_TEMP_SECONDS = 3600
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = 2 * 1024 ** 3):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get(self, file_path: str, sheet_name, columns: List[str] = None) -> pd.DataFrame:
+        """
+        Get a cached sheet as a DataFrame, or None if it is not cached.
+        With columns, only those columns' files are read (in sheet order).
+        """
+        try:
+            key = self._entry_key(file_path, sheet_name)
+            entry_dir = os.path.join(self.cache_dir, key)
+            if not os.path.isdir(entry_dir):
+                return None
+            df = _read_entry(entry_dir, columns)
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError):
+            return None
+
+        with self._locked_index() as index:
+            if key in index['entries']:
+                index['entries'][key]['last_used'] = time.time()
+        return df
+
+    def put(self, file_path: str, sheet_name, df: pd.DataFrame):
+        """Store a parsed sheet, evicting old entries if the cache is full."""
+        try:
+            digest = self._content_digest(file_path)
+            key = self._entry_key(file_path, sheet_name, digest)
+            entry_dir = os.path.join(self.cache_dir, key)
+            temp_dir = f"{entry_dir}.tmp{os.getpid()}"
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            try:
+                size = _write_entry(temp_dir, df)
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                os.replace(temp_dir, entry_dir)
+            except BaseException:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+                raise
+        except (OSError, ValueError, pickle.PicklingError):
+            return
+
+        with self._locked_index() as index:
+            index['entries'][key] = {
+                'file': os.path.abspath(file_path),
+                'sheet': str(sheet_name),
+                'digest': digest,
+                'size': size,
+                'last_used': time.time()
+            }
+            self._evict(index)
+
+    def get_columns(self, file_path: str, sheet_name) -> List[str]:
+        """Column names of a cached sheet, or None if it is not cached."""
+        try:
+            key = self._entry_key(file_path, sheet_name)
+            with open(os.path.join(self.cache_dir, key, 'meta.pkl'), 'rb') as f:
+                return list(pickle.load(f)['columns'])
+        except (OSError, ValueError, EOFError, KeyError, pickle.UnpicklingError):
+            return None
+
+    def get_sheet_names(self, file_path: str) -> List[str]:
+        """Sheet names remembered for an unchanged file, or None."""
+        try:
+            digest = self._content_digest(file_path)
+        except OSError:
+            return None
+        return self._load_index()['sheet_names'].get(digest)
+
+    def put_sheet_names(self, file_path: str, sheet_names: List[str]):
+        """Remember the sheet names of a file."""
+        try:
+            digest = self._content_digest(file_path)
+        except OSError:
+            return
+        with self._locked_index() as index:
+            index['sheet_names'][digest] = list(sheet_names)
+
+    def clear(self):
+        """Remove every cached entry."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _entry_key(self, file_path: str, sheet_name, digest: str = None) -> str:
+        """Cache key of one sheet of one version of a file."""
+        stat = os.stat(file_path)
+        parts = [
+            str(self.FORMAT_VERSION),
+            os.path.abspath(file_path),
+            str(stat.st_size),
+            str(stat.st_mtime_ns),
+            digest or self._content_digest(file_path),
+            repr(sheet_name),
+        ]
+        return hashlib.blake2b('\0'.join(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+    def _content_digest(self, file_path: str) -> str:
+        """
+        Hash of the file contents. The digest is remembered per path, size and
+        modification time, so an unchanged file is only hashed once.
+        """
+        stat = os.stat(file_path)
+        stat_key = f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+        digest = self._load_index()['digests'].get(stat_key)
+        if digest is None:
+            hasher = hashlib.blake2b(digest_size=16)
+            with open(file_path, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    hasher.update(block)
+            digest = hasher.hexdigest()
+            with self._locked_index() as index:
+                index['digests'][stat_key] = digest
+        return digest
+
+    def _evict(self, index: Dict[str, Any]):
+        """
+        Drop least recently used entries until the cache fits max_bytes, and
+        remove stale temporary directories. An entry whose directory cannot
+        be removed yet (on Windows, while it is memory-mapped) stays indexed
+        so that it still counts and is retried next time. Digests and sheet
+        names are kept only for file versions that still have an entry.
+        """
+        self._remove_stale_temps()
+        entries = index['entries']
+        total = sum(entry['size'] for entry in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k]['last_used']):
+            if total <= self.max_bytes:
+                break
+            entry_dir = os.path.join(self.cache_dir, key)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            if os.path.isdir(entry_dir):
+                continue
+            total -= entries[key]['size']
+            del entries[key]
+
+        digests = {entry.get('digest') for entry in entries.values()}
+        index['digests'] = {stat_key: digest for stat_key, digest in index['digests'].items()
+                            if digest in digests}
+        index['sheet_names'] = {digest: names for digest, names in index['sheet_names'].items()
+                                if digest in digests}
+
+    def _remove_stale_temps(self):
+        """Remove temporary entry directories left behind by puts that did not finish."""
+        cutoff = time.time() - self.STALE_TEMP_SECONDS
+        try:
+            with os.scandir(self.cache_dir) as scan:
+                stale = [entry.path for entry in scan
+                         if '.tmp' in entry.name and entry.is_dir(follow_symlinks=False)
+                         and entry.stat(follow_symlinks=False).st_mtime < cutoff]
+        except OSError:
+            return
+        for path in stale:
+            shutil.rmtree(path, ignore_errors=True)
+
+    @contextmanager
+    def _locked_index(self) -> Iterator[Dict[str, Any]]:
+        """
+        Read the index under the cache's lock file and write it back once the
+        block is done, so concurrent processes cannot lose each other's
+        changes. Without a lock file (a read-only cache) changes are dropped.
+        """
+        try:
+            lock = open(os.path.join(self.cache_dir, self.LOCK_FILE), 'a+b')
+        except OSError:
+            yield self._load_index()
+            return
+        with lock:
+            _lock_file(lock)
+            try:
+                index = self._load_index()
+                yield index
+                self._save_index(index)
+            finally:
+                _unlock_file(lock)
+
+    def _load_index(self) -> Dict[str, Any]:
+        """Read the cache index (an empty one if missing or unreadable)."""
+        try:
+            with open(os.path.join(self.cache_dir, self.INDEX_FILE), encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        index.setdefault('entries', {})
+        index.setdefault('digests', {})
+        index.setdefault('sheet_names', {})
+        return index
+
+    def _save_index(self, index: Dict[str, Any]):
+        """Write the cache index atomically."""
+        path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        temp_path = f"{path}.tmp{os.getpid()}"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(index, f)
+            os.replace(temp_path, path)
+        except OSError:
+            pass
+
+
+def default_cache_dir() -> str:
+    """Per-user cache location (LOCALAPPDATA on Windows, XDG cache elsewhere)."""
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME')
+    if not base:
+        base = os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'DataLens', 'sheets')
+
+
+def _lock_file(f):
+    """Block until this process holds the lock on an open file."""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        return
+    while True:
+        f.seek(0)
+        try:
+            # Retries for about ten seconds before giving up with OSError
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            continue
+
+
+def _unlock_file(f):
+    """Release the lock taken by _lock_file."""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _write_entry(entry_dir: str, df: pd.DataFrame) -> int:
+    """Write a DataFrame as one file per column; returns the bytes written."""
+    os.makedirs(entry_dir)
+    layout = []
+    for position, column in enumerate(df.columns):
+        series = df.iloc[:, position]
+        name = f"{position}"
+        if isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biufcmM':
+            np.save(os.path.join(entry_dir, f"{name}.npy"), series.to_numpy())
+            layout.append('array')
+        elif series.dtype == object:
+            codes, uniques = pd.factorize(series)
+            np.save(os.path.join(entry_dir, f"{name}.npy"), codes)
+            with open(os.path.join(entry_dir, f"{name}.pkl"), 'wb') as f:
+                pickle.dump(np.asarray(uniques, dtype=object), f, protocol=pickle.HIGHEST_PROTOCOL)
+            layout.append('codes')
+        else:
+            with open(os.path.join(entry_dir, f"{name}.pkl"), 'wb') as f:
+                pickle.dump(series.reset_index(drop=True), f, protocol=pickle.HIGHEST_PROTOCOL)
+            layout.append('series')
+
+    with open(os.path.join(entry_dir, 'meta.pkl'), 'wb') as f:
+        pickle.dump({'columns': list(df.columns), 'layout': layout, 'rows': len(df)}, f)
+
+    return sum(entry.stat().st_size for entry in os.scandir(entry_dir))
+
+
+def _read_entry(entry_dir: str, columns: List[str] = None) -> pd.DataFrame:
+    """Read a cached sheet; plain arrays are memory-mapped, not copied."""
+    with open(os.path.join(entry_dir, 'meta.pkl'), 'rb') as f:
+        meta = pickle.load(f)
+
+    positions = range(len(meta['columns']))
+    if columns is not None:
+        missing = set(columns).difference(meta['columns'])
+        if missing:
+            raise ValueError(f"Columns not cached: {sorted(map(str, missing))}")
+        wanted = set(columns)
+        positions = [position for position in positions if meta['columns'][position] in wanted]
+
+    arrays = {}
+    for position in positions:
+        kind = meta['layout'][position]
+        name = f"{position}"
+        if kind == 'array':
+            arrays[position] = np.load(os.path.join(entry_dir, f"{name}.npy"), mmap_mode='r')
+        elif kind == 'codes':
+            codes = np.load(os.path.join(entry_dir, f"{name}.npy"), mmap_mode='r')
+            with open(os.path.join(entry_dir, f"{name}.pkl"), 'rb') as f:
+                uniques = pickle.load(f)
+            # Code -1 (missing) picks the trailing NaN
+            arrays[position] = np.append(uniques, np.nan).take(codes)
+        else:
+            with open(os.path.join(entry_dir, f"{name}.pkl"), 'rb') as f:
+                # Kept as a Series so extension dtypes (Int64, string, ...) survive
+                arrays[position] = pickle.load(f)
+
+    df = pd.DataFrame(arrays, index=pd.RangeIndex(meta['rows']), copy=False)
+    df.columns = [meta['columns'][position] for position in positions]
+    return df
@@ -0,0 +1,293 @@
+import pandas as pd
+import numpy as np
+from openpyxl import load_workbook
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+from pandas.io.parsers import TextParser
+from typing import Dict, List, Iterator
+from column_stats import summarize_value_counts, summarize_label_counts, DEFAULT_HISTOGRAM_BINS
+from quantile_sketch import KLLSketch
+
+
+def read_excel_header(file_path: str, sheet_name=0) -> List[str]:
+    """Read only the header row of a sheet and return its column names."""
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        ws = _get_worksheet(wb, sheet_name)
+        for row in ws.iter_rows(max_row=1):
+            header = _trim_row([_convert_cell(cell) for cell in row])
+            return list(TextParser([header], header=0, skip_blank_lines=False).read().columns)
+        return []
+    finally:
+        wb.close()
+
+
+def iter_excel_chunks(file_path: str, sheet_name=0, chunk_size: int = 50000) -> Iterator[pd.DataFrame]:
+    """
+    Read a sheet in chunks of rows using openpyxl's read-only mode.
+    Cells are converted and typed the way pd.read_excel does it, so each
+    chunk looks like the matching slice of the fully loaded sheet. Blank
+    rows are skipped since they carry no values.
+    """
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        ws = _get_worksheet(wb, sheet_name)
+        ws.reset_dimensions()
+
+        header = None
+        columns = None
+        rows = []
+        for row in ws.iter_rows():
+            values = _trim_row([_convert_cell(cell) for cell in row])
+            if header is None:
+                header = values
+                continue
+            if not values:
+                continue
+
+            # Align every row to the header width
+            if len(values) < len(header):
+                values += [""] * (len(header) - len(values))
+            rows.append(values[:len(header)])
+
+            if len(rows) >= chunk_size:
+                chunk = _parse_chunk(header, columns, rows)
+                columns = list(chunk.columns)
+                rows = []
+                yield chunk
+
+        if rows or columns is None:
+            yield _parse_chunk(header or [], columns, rows)
+    finally:
+        wb.close()
+
+
+class StreamingAnalysis:
+    """
+    Running analysis over a stream of DataFrame chunks.
+
+    Each chunk updates per-column aggregates - frequency counters, numeric
+    totals and, with a quantile_error, KLL sketches - kept per group when a
+    group column is given, and can be discarded afterwards. Memory depends
+    on the number of distinct values, not on the number of rows.
+    results() returns the same structure as ExcelAnalyzer.analyze_all_columns
+    (no group column) or ExcelAnalyzer.analyze_by_group.
+    """
+
+    def __init__(self, group_column: str = None, quantile_error: float = None,
+                 histogram_bins=DEFAULT_HISTOGRAM_BINS):
+        self.group_column = group_column
+        self.quantile_error = quantile_error
+        self.histogram_bins = histogram_bins
+        self.columns = None
+        self._kinds = {}       # column -> kinds of non-empty chunks seen
+        self._has_float = {}   # column -> any chunk parsed as float
+        self._totals = {}      # column -> running numeric sum
+        self._counters = {}    # column -> one {value: count} dict per group
+        self._sketches = {}    # column -> one KLLSketch per group
+        self._group_index = {}  # group key -> group number
+        self._group_rows = []   # rows per group number
+
+    def update(self, chunk: pd.DataFrame):
+        """Fold one chunk of rows into the running aggregates."""
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+            if self.group_column is not None and self.group_column not in self.columns:
+                raise ValueError(f"Column '{self.group_column}' not found in dataset")
+            for column in self.columns:
+                self._kinds[column] = set()
+                self._has_float[column] = False
+                self._totals[column] = 0
+                self._counters[column] = []
+                self._sketches[column] = []
+
+        if self.group_column is None:
+            group_numbers = np.zeros(len(chunk), dtype=np.int64)
+            self._register_group(None)
+        else:
+            group_series = chunk[self.group_column]
+            self._track_kind(self.group_column, group_series)
+            codes, keys = pd.factorize(group_series)
+            numbers = np.array([self._register_group(key) for key in keys.tolist()], dtype=np.int64)
+            group_numbers = np.where(codes >= 0, numbers[codes] if len(numbers) else -1, -1)
+            rows = np.bincount(group_numbers[group_numbers >= 0], minlength=len(self._group_rows))
+            for number, count in enumerate(rows.tolist()):
+                self._group_rows[number] += count
+
+        for column in self.columns:
+            if column != self.group_column:
+                self._update_column(column, chunk[column], group_numbers)
+
+    def results(self) -> Dict[str, Dict]:
+        """Build the analysis results from everything seen so far."""
+        analyses = {}
+        for column in self.columns or []:
+            if column == self.group_column:
+                continue
+            analyses[column] = self._finish_column(column)
+
+        if self.group_column is None:
+            results = {}
+            for column, (column_type, per_group) in analyses.items():
+                if per_group and per_group[0]:
+                    results[column] = {
+                        'type': column_type,
+                        'data': per_group[0]
+                    }
+            return results
+
+        # Same groups and order as DataFrame.groupby (sorted keys)
+        as_float = self._is_numeric(self.group_column) and self._has_float[self.group_column]
+        results = {}
+        for key in sorted(self._group_index):
+            number = self._group_index[key]
+            group_name = str(float(key)) if as_float else str(key)
+            group_result = {
+                'group_name': group_name,
+                'row_count': self._group_rows[number],
+                'columns': {}
+            }
+            for column, (column_type, per_group) in analyses.items():
+                analysis = per_group[number] if number < len(per_group) else None
+                if analysis:
+                    group_result['columns'][column] = {
+                        'type': column_type,
+                        'data': analysis
+                    }
+            results[group_name] = group_result
+
+        return results
+
+    def _register_group(self, key) -> int:
+        """Get the group number of a key, adding the group if it is new."""
+        number = self._group_index.get(key)
+        if number is None:
+            number = len(self._group_rows)
+            self._group_index[key] = number
+            self._group_rows.append(0)
+        return number
+
+    def _track_kind(self, column: str, series: pd.Series) -> bool:
+        """Record the parsed type of a chunk; returns True if it is numeric."""
+        if series.dtype.kind == 'f':
+            self._has_float[column] = True
+        if not series.notna().any():
+            return False
+        if pd.api.types.is_bool_dtype(series):
+            kind = 'bool'
+        elif pd.api.types.is_numeric_dtype(series):
+            kind = 'number'
+        else:
+            kind = 'other'
+        self._kinds[column].add(kind)
+        return kind != 'other'
+
+    def _is_numeric(self, column: str) -> bool:
+        """Whether the full column would load with a numeric dtype."""
+        kinds = self._kinds[column]
+        return kinds <= {'number'} or kinds == {'bool'}
+
+    def _update_column(self, column: str, series: pd.Series, group_numbers: np.ndarray):
+        """Fold one chunk of a column into its counters, totals and sketches."""
+        is_numeric_chunk = self._track_kind(column, series)
+        if is_numeric_chunk:
+            self._totals[column] = self._totals[column] + series.sum()
+
+        counters = self._counters[column]
+        while len(counters) < len(self._group_rows):
+            counters.append({})
+
+        codes, uniques = pd.factorize(series)
+        valid = (codes >= 0) & (group_numbers >= 0)
+        if not valid.any():
+            return
+
+        # Count (group, value) pairs; visit them in order of first appearance
+        # so the counters keep value_counts' tie order
+        n_values = len(uniques)
+        keys = group_numbers[valid] * n_values + codes[valid]
+        unique_keys, first_rows, counts = np.unique(keys, return_index=True, return_counts=True)
+        order = np.argsort(first_rows, kind='stable')
+        labels = uniques.tolist()
+        for key, count in zip(unique_keys[order].tolist(), counts[order].tolist()):
+            number, code = divmod(key, n_values)
+            counter = counters[number]
+            value = labels[code]
+            counter[value] = counter.get(value, 0) + count
+
+        if self.quantile_error and is_numeric_chunk and self._is_numeric(column):
+            self._update_sketches(column, series.to_numpy(dtype=np.float64, na_value=np.nan), group_numbers)
+
+    def _update_sketches(self, column: str, values: np.ndarray, group_numbers: np.ndarray):
+        """Add a numeric chunk to the per-group quantile sketches."""
+        sketches = self._sketches[column]
+        while len(sketches) < len(self._group_rows):
+            sketches.append(KLLSketch(self.quantile_error))
+
+        valid = (group_numbers >= 0) & ~np.isnan(values)
+        numbers = group_numbers[valid]
+        values = values[valid]
+        order = np.argsort(numbers, kind='stable')
+        bounds = np.searchsorted(numbers[order], np.arange(len(sketches) + 1))
+        for number in np.flatnonzero(np.diff(bounds)):
+            sketches[number].update(values[order[bounds[number]:bounds[number + 1]]])
+
+    def _finish_column(self, column: str):
+        """Turn the running state of a column into one analysis per group."""
+        counters = self._counters[column]
+        if self._is_numeric(column):
+            sketches = self._sketches[column] if self.quantile_error else []
+            dtype = np.float64 if self._has_float[column] else None
+            analyses = []
+            for number, counter in enumerate(counters):
+                if not counter:
+                    analyses.append(None)
+                    continue
+                values = np.array(list(counter), dtype=dtype)
+                counts = np.array(list(counter.values()), dtype=np.int64)
+                order = np.argsort(values, kind='stable')
+                sketch = sketches[number] if number < len(sketches) else None
+                analyses.append(summarize_value_counts(values[order], counts[order],
+                                                       self._totals[column], sketch=sketch,
+                                                       bins=self.histogram_bins))
+            return 'quantitative', analyses
+
+        analyses = [
+            summarize_label_counts(list(counter), np.array(list(counter.values()), dtype=np.int64))
+            for counter in counters
+        ]
+        return 'qualitative', analyses
+
+
+def _get_worksheet(wb, sheet_name):
+    """Look a sheet up by position or by name, like pd.read_excel."""
+    if isinstance(sheet_name, int):
+        return wb.worksheets[sheet_name]
+    return wb[sheet_name]
+
+
+def _convert_cell(cell):
+    """Convert an openpyxl cell the same way pandas' openpyxl reader does."""
+    if cell.value is None:
+        return ""
+    elif cell.data_type == TYPE_ERROR:
+        return np.nan
+    elif cell.data_type == TYPE_NUMERIC:
+        value = int(cell.value)
+        if value == cell.value:
+            return value
+        return float(cell.value)
+    return cell.value
+
+
+def _trim_row(values: list) -> list:
+    """Drop trailing empty cells."""
+    while values and values[-1] == "":
+        values.pop()
+    return values
+
+
+def _parse_chunk(header: list, columns: List[str], rows: list) -> pd.DataFrame:
+    """Type one chunk of raw rows with pandas' own parser."""
+    if columns is None:
+        return TextParser([header] + rows, header=0, skip_blank_lines=False).read()
+    return TextParser(rows, header=None, names=columns, skip_blank_lines=False).read()
@@ -0,0 +1,301 @@
+import importlib
+import io
+import mmap
+import os
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Iterator
+from column_types import select_columns
+from sheet_cache import SheetCache
+
+
+# File extensions read natively instead of through pd.read_excel
+TABLE_FORMATS = {
+    '.csv': 'csv',
+    '.tsv': 'csv',
+    '.txt': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'feather',
+}
+
+# Delimiters recognized in a CSV header line (ties go to the first)
+CSV_DELIMITERS = ',;\t|'
+
+# CSV files are split into byte ranges of about this size, parsed in parallel
+CSV_CHUNK_BYTES = 16 * 1024 * 1024
+
+# Encodings where a newline byte is always a newline, so a file can be split
+# at any b'\n' without cutting a character in two
+SPLITTABLE_ENCODINGS = {'utf-8', 'utf8', 'utf-8-sig', 'ascii', 'latin-1', 'latin1',
+                        'iso-8859-1', 'cp1252'}
+
+
+def table_format(file_path) -> str:
+    """'csv', 'parquet' or 'feather' for a file read natively, otherwise None."""
+    if not isinstance(file_path, (str, os.PathLike)):
+        return None
+    return TABLE_FORMATS.get(os.path.splitext(os.fspath(file_path))[1].lower())
+
+
+def read_table(file_path: str, columns: List[str] = None, workers: int = None) -> pd.DataFrame:
+    """
+    Read a CSV, Parquet or Feather file into a DataFrame.
+    columns: only read these columns (kept in file order); Parquet and
+    Feather then skip the other columns entirely
+    workers: threads used to parse a large CSV file (default: one per CPU)
+    """
+    file_format = table_format(file_path)
+    if file_format == 'csv':
+        return read_csv(file_path, columns, workers)
+    if file_format == 'parquet':
+        parquet = _import_pyarrow('pyarrow.parquet', file_format)
+        if columns is not None:
+            columns = select_columns(columns, read_table_header(file_path))
+        table = parquet.read_table(file_path, columns=columns, memory_map=True)
+    elif file_format == 'feather':
+        feather = _import_pyarrow('pyarrow.feather', file_format)
+        if columns is not None:
+            columns = select_columns(columns, read_table_header(file_path))
+        table = feather.read_table(file_path, columns=columns, memory_map=True)
+    else:
+        raise ValueError(f"Unsupported file type: {file_path}")
+    # Release each Arrow column as soon as it is converted
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def read_table_header(file_path: str) -> List[str]:
+    """Column names of a CSV, Parquet or Feather file, without reading its rows."""
+    file_format = table_format(file_path)
+    if file_format == 'csv':
+        header = _first_line(file_path)
+        return list(pd.read_csv(io.BytesIO(header), sep=_guess_delimiter(file_path, header),
+                                nrows=0).columns)
+    if file_format == 'parquet':
+        parquet = _import_pyarrow('pyarrow.parquet', file_format)
+        return _data_columns(parquet.read_schema(file_path, memory_map=True))
+    if file_format == 'feather':
+        pyarrow = _import_pyarrow('pyarrow', file_format)
+        with pyarrow.memory_map(file_path) as source:
+            return _data_columns(pyarrow.ipc.open_file(source).schema)
+    raise ValueError(f"Unsupported file type: {file_path}")
+
+
+def iter_table_chunks(file_path: str, chunk_size: int = 50000,
+                      columns: List[str] = None) -> Iterator[pd.DataFrame]:
+    """Read a CSV, Parquet or Feather file in chunks of at most chunk_size rows."""
+    file_format = table_format(file_path)
+    if file_format == 'csv':
+        sep = _guess_delimiter(file_path, _first_line(file_path))
+        with pd.read_csv(file_path, sep=sep, usecols=columns, chunksize=chunk_size) as reader:
+            yield from reader
+        return
+
+    pyarrow = _import_pyarrow('pyarrow', file_format)
+    if columns is not None:
+        columns = select_columns(columns, read_table_header(file_path))
+    if file_format == 'parquet':
+        parquet = _import_pyarrow('pyarrow.parquet', file_format)
+        batches = parquet.ParquetFile(file_path, memory_map=True).iter_batches(
+            batch_size=chunk_size, columns=columns)
+        for batch in batches:
+            yield pyarrow.Table.from_batches([batch]).to_pandas()
+    elif file_format == 'feather':
+        with pyarrow.memory_map(file_path) as source:
+            reader = pyarrow.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                if columns is not None:
+                    batch = batch.select(columns)
+                for start in range(0, batch.num_rows, chunk_size):
+                    yield pyarrow.Table.from_batches([batch.slice(start, chunk_size)]).to_pandas()
+    else:
+        raise ValueError(f"Unsupported file type: {file_path}")
+
+
+def read_csv(file_path: str, columns: List[str] = None, workers: int = None,
+             chunk_bytes: int = CSV_CHUNK_BYTES, encoding: str = 'utf-8') -> pd.DataFrame:
+    """
+    Read a CSV file, parsing byte ranges of it on a thread pool.
+
+    The file is memory-mapped and cut at line ends outside quoted fields;
+    each range is parsed by pandas' C parser, which releases the GIL. The
+    parts are typed separately, so a column that is numeric in some parts
+    and text in others is parsed again as text: the result has the same
+    dtypes as a single pd.read_csv of the whole file.
+    """
+    header = _first_line(file_path)
+    sep = _guess_delimiter(file_path, header)
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(file_path)
+    if workers == 1 or size <= chunk_bytes or encoding.lower() not in SPLITTABLE_ENCODINGS:
+        return pd.read_csv(file_path, sep=sep, usecols=columns, encoding=encoding)
+
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        names = list(pd.read_csv(io.BytesIO(header), sep=sep, nrows=0, encoding=encoding).columns)
+        bounds = _chunk_bounds(data, len(header), chunk_bytes)
+        ranges = list(zip(bounds[:-1], bounds[1:]))
+
+        def parse(byte_range, usecols=columns, dtype=None):
+            start, end = byte_range
+            return pd.read_csv(io.BytesIO(data[start:end]), sep=sep, header=None, names=names,
+                               usecols=usecols, dtype=dtype, encoding=encoding)
+
+        with ThreadPoolExecutor(min(workers, len(ranges))) as executor:
+            parts = list(executor.map(parse, ranges))
+            mixed = [column for column in parts[0].columns if len(_value_kinds(parts, column)) > 1]
+            if mixed:
+                text = list(executor.map(lambda byte_range: parse(byte_range, mixed, str), ranges))
+                for part, text_part in zip(parts, text):
+                    for column in mixed:
+                        part[column] = text_part[column].to_numpy()
+        return pd.concat(parts, ignore_index=True)
+
+
+class TableFile:
+    """
+    A CSV, Parquet or Feather file with the interface of an ExcelWorkbook:
+    a single sheet named after the file, read on first use and kept.
+    CSV sheets go through the SheetCache when one is given; Parquet and
+    Feather are columnar already and are read directly.
+    """
+
+    def __init__(self, file_path: str, cache: SheetCache = None):
+        self.file_path = file_path
+        self.cache = cache if table_format(file_path) == 'csv' else None
+        self._sheet_names = [os.path.splitext(os.path.basename(file_path))[0]]
+        self._df = None
+
+    @property
+    def sheet_names(self) -> List[str]:
+        """The single sheet of the file."""
+        return self._sheet_names
+
+    def read_header(self, sheet_name=0) -> List[str]:
+        """Column names of the table, read without parsing its rows."""
+        self._check_sheet(sheet_name)
+        if self._df is not None:
+            return list(self._df.columns)
+        return read_table_header(self.file_path)
+
+    def read_sheet(self, sheet_name=0, columns: List[str] = None) -> pd.DataFrame:
+        """
+        Get the table as a DataFrame, parsing it only once. With columns,
+        only those columns are read (in file order); a table already loaded
+        in full is projected instead.
+        """
+        self._check_sheet(sheet_name)
+        if columns is not None:
+            if self._df is not None:
+                return self._df[select_columns(columns, list(self._df.columns))]
+            df = self.cache.get(self.file_path, self._sheet_names[0], columns) if self.cache else None
+            return df if df is not None else read_table(self.file_path, columns)
+        if self._df is None:
+            df = self.cache.get(self.file_path, self._sheet_names[0]) if self.cache else None
+            if df is None:
+                df = read_table(self.file_path)
+                if self.cache:
+                    self.cache.put(self.file_path, self._sheet_names[0], df)
+            self._df = df
+        return self._df
+
+    def _check_sheet(self, sheet_name):
+        """Accept only the single sheet, by position or name."""
+        if sheet_name not in (0, self._sheet_names[0]):
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+
+    def close(self):
+        """Release the loaded table."""
+        self._df = None
+
+
+def _import_pyarrow(module: str, file_format: str):
+    """Import a pyarrow module, which is only needed for Parquet and Feather files."""
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        raise ImportError(f"Reading {file_format} files requires pyarrow (pip install pyarrow)")
+
+
+def _data_columns(schema) -> List[str]:
+    """Column names of an Arrow schema, without the stored pandas index."""
+    index_columns = set()
+    metadata = schema.pandas_metadata or {}
+    for column in metadata.get('index_columns', []):
+        if isinstance(column, str):
+            index_columns.add(column)
+    return [name for name in schema.names if name not in index_columns]
+
+
+def _first_line(file_path: str) -> bytes:
+    """The header record of a CSV file, including its line end."""
+    with open(file_path, 'rb') as f:
+        data = f.read(1024 * 1024)
+        while data.count(b'"') % 2 or b'\n' not in data:
+            more = f.read(1024 * 1024)
+            if not more:
+                break
+            data += more
+    return data[:_record_end(data, 0)]
+
+
+def _guess_delimiter(file_path: str, header: bytes) -> str:
+    """The delimiter of a CSV file: tab for .tsv, else the most frequent one in the header."""
+    if os.fspath(file_path).lower().endswith('.tsv'):
+        return '\t'
+    counts = [header.count(delimiter.encode()) for delimiter in CSV_DELIMITERS]
+    return CSV_DELIMITERS[counts.index(max(counts))] if max(counts) else ','
+
+
+def _record_end(data, start: int) -> int:
+    """Offset just past the first line end at or after start that is outside quotes."""
+    quotes = 0
+    position = start
+    while True:
+        end = data.find(b'\n', position)
+        if end < 0:
+            return len(data)
+        quotes += data[position:end].count(b'"')
+        position = end + 1
+        if quotes % 2 == 0:
+            return position
+
+
+def _chunk_bounds(data, start: int, chunk_bytes: int) -> List[int]:
+    """Offsets cutting data[start:] into whole records of about chunk_bytes each."""
+    bounds = [start]
+    while bounds[-1] + chunk_bytes < len(data):
+        # Quote parity at the cut point decides whether a line end is inside a field
+        target = data.find(b'\n', bounds[-1] + chunk_bytes)
+        if target < 0:
+            break
+        quotes = data[bounds[-1]:target].count(b'"')
+        end = target + 1
+        while quotes % 2 and end < len(data):
+            next_end = data.find(b'\n', end)
+            next_end = len(data) if next_end < 0 else next_end
+            quotes += data[end:next_end].count(b'"')
+            end = next_end + 1
+        if end >= len(data):
+            break
+        bounds.append(end)
+    bounds.append(len(data))
+    return bounds
+
+
+def _value_kinds(parts: List[pd.DataFrame], column) -> set:
+    """Kinds of values ('number', 'bool', 'text') a column was parsed as across parts."""
+    kinds = set()
+    for part in parts:
+        series = part[column]
+        if series.dtype.kind in 'iuf':
+            # An all-empty part is float NaN and says nothing about the column
+            if series.notna().any():
+                kinds.add('number')
+        elif series.dtype.kind == 'b':
+            kinds.add('bool')
+        elif series.notna().any():
+            inferred = pd.api.types.infer_dtype(series, skipna=True)
+            kinds.add('bool' if inferred == 'boolean' else 'text')
+    return kinds
@@ -1,5 +1,8 @@
 """Test script to verify Excel export functionality."""
 
+import os
+import tempfile
+import pandas as pd
 from analyzer import ExcelAnalyzer
 from excel_exporter import ExcelExporter
 
@@ -31,6 +34,49 @@ exporter_grouped = ExcelExporter(results_grouped, 'Department')
 exporter_grouped.export_grouped('test_output_grouped.xlsx')
 print("[OK] Grouped export complete: test_output_grouped.xlsx")
 
+# Regression: a constant column beyond 2**53 (e.g. 16-digit account
+# numbers) used to give its histogram a zero-width bin and crash
+print("\nAnalyzing constant large-magnitude columns...")
+
+large_dir = tempfile.mkdtemp()
+large_path = os.path.join(large_dir, 'large_values.csv')
+pd.DataFrame({
+    'Group': ['A', 'A', 'B', 'B'],
+    'Account': [9111111111111111] * 4,
+    'Amount': [1e16] * 4,
+}).to_csv(large_path, index=False)
+large_analyzer = ExcelAnalyzer(large_path)
+for column, result in large_analyzer.analyze_all_columns().items():
+    if column != 'Group':
+        histogram = result['data']['histogram']
+        assert histogram['counts'].sum() == 4, (column, histogram)
+for group_name, group_result in large_analyzer.analyze_by_group('Group').items():
+    for column in ('Account', 'Amount'):
+        histogram = group_result['columns'][column]['data']['histogram']
+        assert histogram['counts'].sum() == 2, (group_name, column, histogram)
+os.remove(large_path)
+os.rmdir(large_dir)
+print("[OK] Constant large-magnitude columns analyzed")
+
+# Regression: nullable columns used to reach the worker processes as object
+# arrays copied into shared memory
+print("\nAnalyzing nullable columns in parallel...")
+nullable_analyzer = ExcelAnalyzer('test_employee_data.xlsx')
+nullable_analyzer.df = pd.DataFrame({
+    'Count': pd.array([1, None, 3, 3, 9007199254740993], dtype='Int64'),
+    'Share': pd.array([0.5, 0.25, None, 0.5, 1.0], dtype='Float64'),
+    'Label': ['a', 'b', None, 'a', 'c'],
+})
+serial_results = nullable_analyzer.analyze_all_columns()
+parallel_results = nullable_analyzer.analyze_all_columns(workers=2)
+for column in ('Count', 'Share'):
+    serial, parallel = serial_results[column]['data'], parallel_results[column]['data']
+    for key in ('min', 'max', 'sum', 'count', 'percentile_25', 'percentile_50', 'percentile_75'):
+        assert serial[key] == parallel[key], (column, key, serial[key], parallel[key])
+assert parallel_results['Count']['data']['count'] == 4
+assert parallel_results['Count']['data']['max'] == 9007199254740993
+print("[OK] Nullable columns analyzed in parallel")
+
 print("\n" + "=" * 60)
 print("SUCCESS! Test exports completed.")
 print("=" * 60)